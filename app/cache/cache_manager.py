@@ -1,25 +1,192 @@
 """
 Cache manager module that provides a centralized caching system.
-Replaces the file-based caching with an in-memory TTL cache.
+Replaces the file-based caching with an in-memory TTL cache using
+scan-resistant S3-FIFO eviction.
 """
 import asyncio
 import logging
+import threading
+import time
 from datetime import datetime
+from decimal import Decimal
 from functools import wraps
-from typing import Any, Callable, Dict, Optional, TypeVar, cast
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple, TypeVar
 
-from cachetools import TTLCache
+import orjson
+import zstandard
+
+from app.cache.s3fifo_cache import S3FIFOCache
+from app.core.settings import settings
 
 logger = logging.getLogger(__name__)
 
 # Type variable for function return type
 T = TypeVar('T')
 
-# Global cache instance with TTL (time-to-live) of 12 hours and max size of 1000 items
-_cache = TTLCache(maxsize=1000, ttl=12 * 60 * 60)
+# Number of cache shards; must be a power of two so routing is a bitwise AND
+CACHE_SHARDS = 16
+
+# zstd level used for large cache entries; level 3 is fast to decompress
+COMPRESSION_LEVEL = 3
+
+# zstd (de)compressors are not safe to share between threads
+_zstd = threading.local()
+
+
+class _Compressed:
+    """A zstd-compressed bytes value stored in the cache."""
+    
+    __slots__ = ("data",)
+    
+    def __init__(self, data: bytes):
+        self.data = data
+
+
+def _compress(value: bytes) -> _Compressed:
+    """Compress bytes with this thread's zstd compressor."""
+    compressor = getattr(_zstd, "compressor", None)
+    if compressor is None:
+        compressor = _zstd.compressor = zstandard.ZstdCompressor(level=COMPRESSION_LEVEL)
+    return _Compressed(compressor.compress(value))
 
-# Last cache update time tracking
-_last_cache_update_time: Optional[str] = None
+
+def _decompress(value: _Compressed) -> bytes:
+    """Decompress a value with this thread's zstd decompressor."""
+    decompressor = getattr(_zstd, "decompressor", None)
+    if decompressor is None:
+        decompressor = _zstd.decompressor = zstandard.ZstdDecompressor()
+    return decompressor.decompress(value.data)
+
+
+class ShardedTTLCache:
+    """
+    S3-FIFO TTL cache split into independently locked shards.
+    
+    Keys are routed to a shard by hash, so concurrent readers and writers of
+    different keys only contend on their own shard's lock.
+    
+    Bytes values larger than the compression threshold are stored
+    zstd-compressed and transparently decompressed on read.
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        ttl: float,
+        shards: int = CACHE_SHARDS,
+        compression_threshold: Optional[int] = None
+    ):
+        """
+        Initialize the sharded cache.
+        
+        Args:
+            maxsize: Total maximum number of items across all shards
+            ttl: Time-to-live in seconds for each item
+            shards: Number of shards, must be a power of two
+            compression_threshold: Size in bytes above which bytes values are
+                compressed, or None to disable compression
+        """
+        if shards <= 0 or shards & (shards - 1):
+            raise ValueError("shards must be a power of two")
+        self._compression_threshold = compression_threshold
+        self._mask = shards - 1
+        self._shards = [S3FIFOCache(maxsize=max(1, maxsize // shards), ttl=ttl) for _ in range(shards)]
+        self._locks = [threading.RLock() for _ in range(shards)]
+
+    def _shard_of(self, key: Any) -> int:
+        """Get the shard index for a key."""
+        return hash(key) & self._mask
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        """Get an item, returning default if missing or expired."""
+        index = self._shard_of(key)
+        with self._locks[index]:
+            value = self._shards[index].get(key, default)
+        if type(value) is _Compressed:
+            return _decompress(value)
+        return value
+
+    def set(self, key: Any, value: Any, ttl: Optional[float] = None, compress: bool = True) -> None:
+        """Set an item, optionally overriding the default TTL or skipping compression."""
+        threshold = self._compression_threshold
+        if compress and threshold is not None and type(value) is bytes and len(value) > threshold:
+            value = _compress(value)
+        index = self._shard_of(key)
+        with self._locks[index]:
+            self._shards[index].set(key, value, ttl)
+
+    def delete(self, key: Any) -> bool:
+        """
+        Delete an item.
+        
+        Returns:
+            bool: True if the item was present, False otherwise
+        """
+        index = self._shard_of(key)
+        with self._locks[index]:
+            return self._shards[index].pop(key, _MISSING) is not _MISSING
+
+    def clear(self) -> None:
+        """Remove all items from every shard."""
+        for shard, lock in zip(self._shards, self._locks):
+            with lock:
+                shard.clear()
+
+    def to_dict(self) -> Dict[Any, Any]:
+        """Get a merged snapshot of all shards."""
+        merged: Dict[Any, Any] = {}
+        for shard, lock in zip(self._shards, self._locks):
+            with lock:
+                merged.update(shard.items())
+        for key, value in merged.items():
+            if type(value) is _Compressed:
+                merged[key] = _decompress(value)
+        return merged
+
+    def stats(self) -> Dict[str, int]:
+        """Get hit, miss and eviction counters summed over all shards."""
+        totals = {"hits": 0, "misses": 0, "evictions": 0, "size": 0}
+        for shard, lock in zip(self._shards, self._locks):
+            with lock:
+                totals["hits"] += shard.hits
+                totals["misses"] += shard.misses
+                totals["evictions"] += shard.evictions
+                totals["size"] += len(shard)
+        return totals
+
+
+# Sentinel for missing cache entries
+_MISSING = object()
+
+# Global cache instance (12 hour TTL and 1000 items by default)
+_cache = ShardedTTLCache(
+    maxsize=settings.cache.max_size,
+    ttl=settings.cache.ttl_seconds,
+    compression_threshold=settings.cache.compression_threshold if settings.cache.enable_compression else None
+)
+
+# Repository query results, kept apart from the response cache so that many
+# small row entries cannot evict the API payloads
+_query_cache = ShardedTTLCache(
+    maxsize=settings.cache.query_max_size,
+    ttl=settings.cache.query_ttl_seconds
+)
+
+# Per-table generation numbers, part of every query cache key; bumping one
+# orphans all cached results for the table, which then age out
+_table_generations: Dict[str, int] = {}
+_generations_lock = threading.Lock()
+
+# Last cache update time tracking, as a Unix timestamp (0.0 if never updated)
+_last_cache_update_ts: float = 0.0
+
+# Per-key locks used by the `cached` decorator so that only one caller computes
+# a missing value while concurrent callers for the same key wait for it.
+# Each entry maps a key to [lock, waiter count]; entries are dropped once no
+# caller holds or waits on them.
+_key_locks: Dict[Hashable, list] = {}
+_key_alocks: Dict[Hashable, list] = {}
+_locks_mutex = threading.Lock()
 
 
 def get_cache() -> Dict[str, Any]:
@@ -29,23 +196,75 @@ def get_cache() -> Dict[str, Any]:
     Returns:
         Dict[str, Any]: The current cache contents
     """
-    return dict(_cache)
+    return _cache.to_dict()
 
 
-def set_cache_item(key: str, value: Any, ttl: Optional[int] = None) -> None:
+def set_cache_item(key: str, value: Any, ttl: Optional[int] = None, compress: bool = True) -> None:
     """
     Set a cache item with an optional custom TTL.
     
+    Bytes values above the configured compression threshold are stored
+    zstd-compressed unless compress is False.
+    
     Args:
         key: The cache key
         value: The value to cache
         ttl: Optional TTL in seconds, defaults to the cache's default TTL
+        compress: Whether a large bytes value may be compressed
+    """
+    global _last_cache_update_ts
+    
+    _cache.set(key, value, ttl, compress)
+    _last_cache_update_ts = time.time()
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Cache item set: %s", key)
+
+
+def _json_default(value: Any) -> Any:
+    """Encode values orjson does not handle natively."""
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def encode_json(value: Any) -> bytes:
     """
-    global _last_cache_update_time
+    Encode a value as JSON bytes with orjson.
     
-    _cache[key] = value
-    _last_cache_update_time = datetime.now().isoformat()
-    logger.debug(f"Cache item set: {key}")
+    Numpy scalars/arrays, datetimes and non-string dict keys are supported,
+    and Decimals are encoded as floats like FastAPI's default encoder does.
+    
+    Args:
+        value: The value to encode
+        
+    Returns:
+        bytes: The JSON encoded value
+    """
+    return orjson.dumps(
+        value,
+        default=_json_default,
+        option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+    )
+
+
+def set_cache_json(key: str, value: Any, ttl: Optional[int] = None) -> bytes:
+    """
+    Encode a value as JSON once and cache the encoded bytes.
+    
+    Cache hits can then be sent as-is instead of being re-encoded on every
+    response.
+    
+    Args:
+        key: The cache key
+        value: The JSON-serializable value to cache
+        ttl: Optional TTL in seconds, defaults to the cache's default TTL
+        
+    Returns:
+        bytes: The encoded value that was cached
+    """
+    encoded = encode_json(value)
+    set_cache_item(key, encoded, ttl)
+    return encoded
 
 
 def get_cache_item(key: str, default: Any = None) -> Any:
@@ -69,20 +288,29 @@ def delete_cache_item(key: str) -> None:
     Args:
         key: The cache key to delete
     """
-    if key in _cache:
-        del _cache[key]
-        logger.debug(f"Cache item deleted: {key}")
+    if _cache.delete(key):
+        logger.debug("Cache item deleted: %s", key)
 
 
 def clear_cache() -> None:
     """Clear the entire cache."""
-    global _last_cache_update_time
+    global _last_cache_update_ts
     
     _cache.clear()
-    _last_cache_update_time = datetime.now().isoformat()
+    _last_cache_update_ts = time.time()
     logger.info("Cache cleared")
 
 
+def get_cache_stats() -> Dict[str, int]:
+    """
+    Get cache hit/miss statistics.
+    
+    Returns:
+        Dict[str, int]: Hit, miss and eviction counts and the current size
+    """
+    return _cache.stats()
+
+
 def get_last_cache_update_time() -> Optional[str]:
     """
     Get the timestamp of the last cache update.
@@ -90,60 +318,234 @@ def get_last_cache_update_time() -> Optional[str]:
     Returns:
         Optional[str]: ISO format timestamp of the last update or None if never updated
     """
-    return _last_cache_update_time
+    if not _last_cache_update_ts:
+        return None
+    return datetime.fromtimestamp(_last_cache_update_ts).isoformat()
+
+
+def query_cache_key(table: str, key: Hashable) -> Hashable:
+    """
+    Build the query cache key for a query on a table.
+    
+    The key includes the table's current generation, so build it before
+    running the query: a result computed while the table is invalidated is
+    then stored under the old generation and never read.
+    
+    Args:
+        table: The table the query reads
+        key: Key identifying the query and its parameters
+        
+    Returns:
+        Hashable: The query cache key
+    """
+    return (table, _table_generations.get(table, 0), key)
+
+
+def get_query_result(key: Hashable, default: Any = None) -> Any:
+    """
+    Get a cached query result.
+    
+    Args:
+        key: The key from `query_cache_key`
+        default: Default value if the result is not cached
+        
+    Returns:
+        The cached result or default if not found
+    """
+    return _query_cache.get(key, default)
+
+
+def set_query_result(key: Hashable, value: Any) -> None:
+    """
+    Cache a query result for the query cache TTL.
+    
+    Args:
+        key: The key from `query_cache_key`
+        value: The query result
+    """
+    _query_cache.set(key, value, compress=False)
+
+
+def invalidate_table(table: str) -> None:
+    """
+    Drop all cached query results for a table.
+    
+    Args:
+        table: The table that was written to
+    """
+    with _generations_lock:
+        _table_generations[table] = _table_generations.get(table, 0) + 1
+
+
+def make_cache_key(key: str, args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> Hashable:
+    """
+    Build the cache key for a call of a function decorated with `cached`.
+    
+    Calls without arguments use the plain key so that entries set directly
+    with `set_cache_item` are shared with the decorator.
+    
+    Args:
+        key: The base cache key
+        args: Positional call arguments
+        kwargs: Keyword call arguments
+        
+    Returns:
+        Hashable: The cache key for this call
+    """
+    if not args and not kwargs:
+        return key
+    cache_key = (key, args, tuple(sorted(kwargs.items())))
+    try:
+        hash(cache_key)
+    except TypeError:
+        # Unhashable arguments (lists, dicts, ...) fall back to their repr
+        cache_key = (key, repr(args), repr(sorted(kwargs.items())))
+    return cache_key
+
+
+def _checkout_lock(locks: Dict[Hashable, list], key: Hashable, factory: Callable[[], Any]) -> Any:
+    """
+    Get (or create) the lock for a key and register the caller as a user of it.
+    
+    Args:
+        locks: The lock registry to use
+        key: The cache key
+        factory: Callable creating a new lock
+        
+    Returns:
+        The lock for the key
+    """
+    with _locks_mutex:
+        entry = locks.get(key)
+        if entry is None:
+            entry = locks[key] = [factory(), 0]
+        entry[1] += 1
+        return entry[0]
+
+
+def _release_lock(locks: Dict[Hashable, list], key: Hashable) -> None:
+    """
+    Unregister a caller from a key's lock and drop the lock once it is unused.
+    
+    Args:
+        locks: The lock registry to use
+        key: The cache key
+    """
+    with _locks_mutex:
+        entry = locks.get(key)
+        if entry is not None:
+            entry[1] -= 1
+            if entry[1] <= 0:
+                del locks[key]
 
 
 def cached(key: str, ttl: Optional[int] = None) -> Callable[[Callable[..., T]], Callable[..., T]]:
     """
     Decorator for caching function results.
     
+    Results are cached per distinct call arguments (see `make_cache_key`).
+    Concurrent callers missing the same key are serialized on a per-key lock,
+    so the wrapped function runs once and the others reuse its result.
+    `None` results are cached like any other value.
+    
     Args:
-        key: The cache key to use
+        key: The base cache key to use
         ttl: Optional TTL in seconds, defaults to the cache's default TTL
         
     Returns:
         Decorator function
     """
     def decorator(func: Callable[..., T]) -> Callable[..., T]:
-        @wraps(func)
-        async def async_wrapper(*args: Any, **kwargs: Any) -> T:
-            # Check if result is in cache
-            cached_result = get_cache_item(key)
-            if cached_result is not None:
-                logger.debug(f"Cache hit for key: {key}")
-                return cached_result
-            
-            # If not in cache, call the function
-            logger.debug(f"Cache miss for key: {key}")
-            result = await func(*args, **kwargs)
+        # Bind everything the hit path needs into closure locals once
+        _get = _cache.get
+        _missing = _MISSING
+        _make_key = make_cache_key
+        
+        if asyncio.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> T:
+                cache_key = _make_key(key, args, kwargs) if args or kwargs else key
+                cached_result = _get(cache_key, _missing)
+                if cached_result is not _missing:
+                    return cached_result
+                
+                lock = _checkout_lock(_key_alocks, cache_key, asyncio.Lock)
+                try:
+                    async with lock:
+                        # Another caller may have filled the cache while we waited
+                        cached_result = _get(cache_key, _missing)
+                        if cached_result is not _missing:
+                            return cached_result
+                        
+                        if logger.isEnabledFor(logging.DEBUG):
+                            logger.debug("Cache miss for key: %s", cache_key)
+                        result = await func(*args, **kwargs)
+                        set_cache_item(cache_key, result, ttl)
+                        return result
+                finally:
+                    _release_lock(_key_alocks, cache_key)
             
-            # Cache the result
-            set_cache_item(key, result, ttl)
-            return result
+            return async_wrapper
         
         @wraps(func)
         def sync_wrapper(*args: Any, **kwargs: Any) -> T:
-            # Check if result is in cache
-            cached_result = get_cache_item(key)
-            if cached_result is not None:
-                logger.debug(f"Cache hit for key: {key}")
+            cache_key = _make_key(key, args, kwargs) if args or kwargs else key
+            cached_result = _get(cache_key, _missing)
+            if cached_result is not _missing:
                 return cached_result
             
-            # If not in cache, call the function
-            logger.debug(f"Cache miss for key: {key}")
-            result = func(*args, **kwargs)
-            
-            # Cache the result
-            set_cache_item(key, result, ttl)
-            return result
+            lock = _checkout_lock(_key_locks, cache_key, threading.Lock)
+            try:
+                with lock:
+                    # Another caller may have filled the cache while we waited
+                    cached_result = _get(cache_key, _missing)
+                    if cached_result is not _missing:
+                        return cached_result
+                    
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug("Cache miss for key: %s", cache_key)
+                    result = func(*args, **kwargs)
+                    set_cache_item(cache_key, result, ttl)
+                    return result
+            finally:
+                _release_lock(_key_locks, cache_key)
         
-        # Return the appropriate wrapper based on whether the function is async or not
+        return sync_wrapper
+    
+    return decorator
+
+
+def cached_bytes(key: str, ttl: Optional[int] = None) -> Callable[[Callable[..., Any]], Callable[..., bytes]]:
+    """
+    Decorator for caching function results as encoded JSON bytes.
+    
+    Like `cached`, but the result is encoded with `encode_json` before it is
+    stored, so the decorated function returns the encoded bytes on both hits
+    and misses.
+    
+    Args:
+        key: The base cache key to use
+        ttl: Optional TTL in seconds, defaults to the cache's default TTL
+        
+    Returns:
+        Decorator function
+    """
+    def decorator(func: Callable[..., Any]) -> Callable[..., bytes]:
         if asyncio.iscoroutinefunction(func):
-            return cast(Callable[..., T], async_wrapper)
-        return cast(Callable[..., T], sync_wrapper)
+            @wraps(func)
+            async def encoded_async(*args: Any, **kwargs: Any) -> bytes:
+                return encode_json(await func(*args, **kwargs))
+            
+            return cached(key, ttl)(encoded_async)
+        
+        @wraps(func)
+        def encoded(*args: Any, **kwargs: Any) -> bytes:
+            return encode_json(func(*args, **kwargs))
+        
+        return cached(key, ttl)(encoded)
     
     return decorator
 
 
 # Initialize the cache with the current time
-_last_cache_update_time = datetime.now().isoformat()
\ No newline at end of file
+_last_cache_update_ts = time.time()
\ No newline at end of file
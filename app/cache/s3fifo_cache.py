@@ -0,0 +1,218 @@
+"""
+Scan-resistant in-memory cache using the S3-FIFO eviction policy.
+
+New keys enter a small probationary FIFO queue; only keys that are read again
+while there are promoted to the main FIFO queue. Keys evicted from the small
+queue are remembered in a ghost queue so that they go straight to the main
+queue if they come back. A burst of one-off keys therefore only churns the
+small queue and cannot flush frequently read entries out of the cache.
+
+Entries also carry an expiry time which is checked lazily on access.
+"""
+import time
+from collections import OrderedDict, deque
+from typing import Any, Deque, Dict, Iterator, Optional, Tuple
+
+# Maximum access frequency tracked per entry
+_MAX_FREQ = 3
+
+
+class _Entry:
+    """A cached value with its expiry time and access frequency."""
+    
+    __slots__ = ("key", "value", "expires_at", "freq", "in_main")
+    
+    def __init__(self, key: Any, value: Any, expires_at: float, in_main: bool):
+        self.key = key
+        self.value = value
+        self.expires_at = expires_at
+        self.freq = 0
+        self.in_main = in_main
+
+
+class S3FIFOCache:
+    """
+    Bounded cache with S3-FIFO eviction and per-entry TTL.
+    
+    This class is not thread-safe; callers must provide their own locking.
+    """
+    
+    def __init__(self, maxsize: int, ttl: float, small_ratio: float = 0.1):
+        """
+        Initialize the cache.
+        
+        Args:
+            maxsize: Maximum number of items
+            ttl: Default time-to-live in seconds
+            small_ratio: Fraction of capacity reserved for the small queue
+        """
+        if maxsize <= 0:
+            raise ValueError("maxsize must be positive")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._small_capacity = max(1, int(maxsize * small_ratio))
+        self._ghost_capacity = max(1, maxsize - self._small_capacity)
+        self._data: Dict[Any, _Entry] = {}
+        self._small: Deque[_Entry] = deque()
+        self._main: Deque[_Entry] = deque()
+        self._ghost: "OrderedDict[Any, None]" = OrderedDict()
+        self._small_size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def __len__(self) -> int:
+        return len(self._data)
+    
+    def __contains__(self, key: Any) -> bool:
+        entry = self._data.get(key)
+        return entry is not None and entry.expires_at > time.monotonic()
+    
+    def get(self, key: Any, default: Any = None) -> Any:
+        """
+        Get an item, returning default if missing or expired.
+        
+        Args:
+            key: The cache key
+            default: Default value if key not found
+        
+        Returns:
+            The cached value or default
+        """
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+        if entry.expires_at <= time.monotonic():
+            self._remove(entry)
+            self.misses += 1
+            return default
+        if entry.freq < _MAX_FREQ:
+            entry.freq += 1
+        self.hits += 1
+        return entry.value
+    
+    def set(self, key: Any, value: Any, ttl: Optional[float] = None) -> None:
+        """
+        Set an item.
+        
+        Args:
+            key: The cache key
+            value: The value to cache
+            ttl: Optional TTL in seconds, defaults to the cache's default TTL
+        """
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        entry = self._data.get(key)
+        if entry is not None:
+            entry.value = value
+            entry.expires_at = expires_at
+            return
+        
+        while len(self._data) >= self.maxsize:
+            self._evict()
+        
+        if len(self._small) + len(self._main) > 2 * self.maxsize:
+            self._compact()
+        
+        in_main = self._ghost.pop(key, _MISSING) is not _MISSING
+        entry = _Entry(key, value, expires_at, in_main)
+        self._data[key] = entry
+        if in_main:
+            self._main.append(entry)
+        else:
+            self._small.append(entry)
+            self._small_size += 1
+    
+    def pop(self, key: Any, default: Any = None) -> Any:
+        """
+        Remove an item and return its value.
+        
+        Args:
+            key: The cache key
+            default: Value to return if key not found
+        
+        Returns:
+            The removed value or default
+        """
+        entry = self._data.get(key)
+        if entry is None:
+            return default
+        self._remove(entry)
+        if entry.expires_at <= time.monotonic():
+            return default
+        return entry.value
+    
+    def clear(self) -> None:
+        """Remove all items."""
+        self._data.clear()
+        self._small.clear()
+        self._main.clear()
+        self._ghost.clear()
+        self._small_size = 0
+    
+    def items(self) -> Iterator[Tuple[Any, Any]]:
+        """Iterate over unexpired items."""
+        now = time.monotonic()
+        return iter([(k, e.value) for k, e in self._data.items() if e.expires_at > now])
+    
+    def _remove(self, entry: _Entry) -> None:
+        """Drop an entry; its stale queue slot is skipped on eviction."""
+        del self._data[entry.key]
+        if not entry.in_main:
+            self._small_size -= 1
+    
+    def _compact(self) -> None:
+        """Drop queue slots left behind by deleted or expired entries."""
+        self._small = deque(e for e in self._small if self._is_live(e) and not e.in_main)
+        self._main = deque(e for e in self._main if self._is_live(e))
+    
+    def _is_live(self, entry: _Entry) -> bool:
+        return self._data.get(entry.key) is entry
+    
+    def _evict(self) -> None:
+        """Evict one entry, preferring the small queue once it is full."""
+        if self._small_size >= self._small_capacity or not self._main:
+            self._evict_small()
+        else:
+            self._evict_main()
+    
+    def _evict_small(self) -> None:
+        now = time.monotonic()
+        while self._small:
+            entry = self._small.popleft()
+            if not self._is_live(entry) or entry.in_main:
+                continue
+            self._small_size -= 1
+            if entry.freq > 1 and entry.expires_at > now:
+                # Re-read while on probation: promote to the main queue
+                entry.in_main = True
+                entry.freq = 0
+                self._main.append(entry)
+                continue
+            del self._data[entry.key]
+            self._ghost[entry.key] = None
+            if len(self._ghost) > self._ghost_capacity:
+                self._ghost.popitem(last=False)
+            self.evictions += 1
+            return
+        self._evict_main()
+    
+    def _evict_main(self) -> None:
+        now = time.monotonic()
+        while self._main:
+            entry = self._main.popleft()
+            if not self._is_live(entry):
+                continue
+            if entry.freq > 0 and entry.expires_at > now:
+                entry.freq -= 1
+                self._main.append(entry)
+                continue
+            del self._data[entry.key]
+            self.evictions += 1
+            return
+        if self._small_size:
+            self._evict_small()
+
+
+# Sentinel for missing entries
+_MISSING = object()
@@ -1,210 +1,206 @@
 """
-Application settings module using direct environment variable access.
+Application settings module using pydantic-settings.
+
+All settings are read from the environment (and the project's .env file) and
+validated once, when `get_settings()` is first called.
 """
+import re
 import os
+from functools import lru_cache
 from pathlib import Path
-from typing import List
+from typing import Annotated, List, Literal, Optional
 
-# Load environment variables from .env file
-from dotenv import load_dotenv
-load_dotenv()
+from pydantic import BaseModel, Field, field_validator, model_validator
+from pydantic_settings import BaseSettings, NoDecode, SettingsConfigDict
 
 # Project root directory
 PROJECT_ROOT = Path(__file__).parent.parent.parent.absolute()
 
+DEFAULT_CORS_ORIGINS = [
+    "http://localhost:3000",
+    "http://localhost:3001",
+    "http://localhost:3002",
+    "https://*.vercel.app",
+    "https://morpheus-stats-frontend.vercel.app",
+    "https://mor-stats-backend-cfcfatfxejhphfg9.centralus-01.azurewebsites.net"
+]
 
-class DatabaseSettings:
-    """Database connection settings."""
-    
-    @property
-    def host(self) -> str:
-        return os.getenv("DB_HOST", "localhost")
-    
-    @property
-    def port(self) -> int:
-        return int(os.getenv("DB_PORT", "5432"))
-    
-    @property
-    def database(self) -> str:
-        return os.getenv("DB_NAME", "postgres")
-    
-    @property
-    def user(self) -> str:
-        return os.getenv("DB_USER", "postgres")
-    
-    @property
-    def password(self) -> str:
-        return os.getenv("DB_PASSWORD", "postgres")
-    
-    @property
-    def minconn(self) -> int:
-        return int(os.getenv("DB_MIN_CONN", "1"))
+
+def origins_to_regex(origins: List[str]) -> str:
+    """
+    Compile a list of CORS origins into a single anchored regex.
     
-    @property
-    def maxconn(self) -> int:
-        return int(os.getenv("DB_MAX_CONN", "10"))
+    A `*` in an origin matches a single host label, e.g.
+    `https://*.vercel.app` matches `https://my-app.vercel.app` but not
+    `https://a.b.vercel.app`.
     
-    @property
-    def autocommit(self) -> bool:
-        return os.getenv("DB_AUTOCOMMIT", "False").lower() in ("true", "1", "yes")
+    Args:
+        origins: The allowed origins
+        
+    Returns:
+        str: A regex matching exactly the allowed origins
+    """
+    patterns = [re.escape(origin).replace(r"\*", r"[A-Za-z0-9-]+") for origin in origins]
+    return "^(" + "|".join(patterns) + ")$"
 
 
-class Web3Settings:
-    """Web3 connection settings."""
+class EnvSettings(BaseSettings):
+    """Base class for settings groups read from the environment."""
     
-    @property
-    def eth_rpc_url(self) -> str:
-        return os.getenv("RPC_URL", "")
-    
-    @property
-    def arb_rpc_url(self) -> str:
-        return os.getenv("ARB_RPC_URL", "")
-    
-    @property
-    def base_rpc_url(self) -> str:
-        return os.getenv("BASE_RPC_URL", "")
-    
-    @property
-    def etherscan_api_key(self) -> str:
-        return os.getenv("ETHERSCAN_API_KEY", "")
+    model_config = SettingsConfigDict(env_file=PROJECT_ROOT / ".env", extra="ignore")
+
+
+class DatabaseSettings(EnvSettings):
+    """Database connection settings."""
     
-    @property
-    def arbiscan_api_key(self) -> str:
-        return os.getenv("ARBISCAN_API_KEY", "")
+    host: str = Field("localhost", validation_alias="DB_HOST")
+    port: int = Field(5432, validation_alias="DB_PORT")
+    database: str = Field("postgres", validation_alias="DB_NAME")
+    user: str = Field("postgres", validation_alias="DB_USER")
+    password: str = Field("postgres", validation_alias="DB_PASSWORD")
+    minconn: int = Field(2, validation_alias="DB_MIN_CONN")
+    # Per pool and worker process; behind PgBouncer a few client connections per
+    # CPU suffice. Each worker has a sync and an async pool, so it may open up
+    # to 2 * maxconn connections; at idle it holds maxconn + minconn with
+    # warm_pool (only the sync pool is warmed) and 2 * minconn without
+    maxconn: int = Field(
+        default_factory=lambda: max(4, (os.cpu_count() or 2) * 2), validation_alias="DB_MAX_CONN"
+    )
+    autocommit: bool = Field(False, validation_alias="DB_AUTOCOMMIT")
+    warm_pool: bool = Field(True, validation_alias="DB_WARM_POOL")
+    statement_cache_size: int = Field(1024, validation_alias="DB_STATEMENT_CACHE_SIZE")
+    prepare_threshold: int = Field(5, validation_alias="DB_PREPARE_THRESHOLD")
+    plan_cache_mode: Literal["auto", "force_custom_plan", "force_generic_plan"] = Field(
+        "auto", validation_alias="DB_PLAN_CACHE_MODE"
+    )
+    pre_ping_idle_seconds: float = Field(30.0, validation_alias="DB_PRE_PING_IDLE_SECONDS")
+    max_idle_seconds: float = Field(300.0, validation_alias="DB_MAX_IDLE_SECONDS")
+
+
+class Web3Settings(EnvSettings):
+    """Web3 connection settings."""
     
-    @property
-    def basescan_api_key(self) -> str:
-        return os.getenv("BASESCAN_API_KEY", "")
+    eth_rpc_url: str = Field("", validation_alias="RPC_URL")
+    arb_rpc_url: str = Field("", validation_alias="ARB_RPC_URL")
+    base_rpc_url: str = Field("", validation_alias="BASE_RPC_URL")
+    etherscan_api_key: str = Field("", validation_alias="ETHERSCAN_API_KEY")
+    arbiscan_api_key: str = Field("", validation_alias="ARBISCAN_API_KEY")
+    basescan_api_key: str = Field("", validation_alias="BASESCAN_API_KEY")
 
 
-class APISettings:
+class APISettings(EnvSettings):
     """API settings."""
     
-    @property
-    def cors_origins(self) -> List[str]:
-        default_origins = [
-            "http://localhost:3000",
-            "http://localhost:3001",
-            "http://localhost:3002",
-            "https://*.vercel.app",
-            "https://morpheus-stats-frontend.vercel.app",
-            "https://mor-stats-backend-cfcfatfxejhphfg9.centralus-01.azurewebsites.net"
-        ]
-        
-        origins = os.getenv("CORS_ORIGINS", ",".join(default_origins))
-        if isinstance(origins, str):
-            return [origin.strip() for origin in origins.split(",")]
-        return default_origins
-
-
-class CacheSettings:
+    cors_origins: Annotated[List[str], NoDecode] = Field(
+        default_factory=lambda: list(DEFAULT_CORS_ORIGINS), validation_alias="CORS_ORIGINS"
+    )
+    # Defaults to a regex built from cors_origins when either is set; when
+    # neither is configured every origin is allowed
+    cors_origin_regex: Optional[str] = Field(None, validation_alias="CORS_ORIGIN_REGEX")
+    
+    @field_validator("cors_origins", mode="before")
+    @classmethod
+    def split_cors_origins(cls, value):
+        """Accept a comma-separated string of origins."""
+        if isinstance(value, str):
+            return [origin.strip() for origin in value.split(",")]
+        return value
+    
+    @model_validator(mode="after")
+    def build_cors_origin_regex(self):
+        """Compile configured cors_origins into cors_origin_regex unless it is set explicitly."""
+        if self.cors_origin_regex is None and "cors_origins" in self.model_fields_set:
+            self.cors_origin_regex = origins_to_regex(self.cors_origins)
+        return self
+
+
+class CacheSettings(EnvSettings):
     """Cache settings."""
     
-    @property
-    def ttl_seconds(self) -> int:
-        return int(os.getenv("CACHE_TTL_SECONDS", str(12 * 60 * 60)))  # 12 hours default
-    
-    @property
-    def max_size(self) -> int:
-        return int(os.getenv("CACHE_MAX_SIZE", "1000"))
+    ttl_seconds: int = Field(12 * 60 * 60, validation_alias="CACHE_TTL_SECONDS")  # 12 hours default
+    max_size: int = Field(1000, validation_alias="CACHE_MAX_SIZE")
+    enable_compression: bool = Field(True, validation_alias="CACHE_ENABLE_COMPRESSION")
+    compression_threshold: int = Field(64 * 1024, validation_alias="CACHE_COMPRESSION_THRESHOLD")  # bytes
+    # Repository query results; writes through the repositories invalidate them sooner
+    query_ttl_seconds: int = Field(30, validation_alias="CACHE_QUERY_TTL_SECONDS")
+    query_max_size: int = Field(4096, validation_alias="CACHE_QUERY_MAX_SIZE")
 
 
-class ContractAddresses:
+class ContractAddresses(EnvSettings):
     """Contract addresses."""
     
-    @property
-    def burn_from_address(self) -> str:
-        return os.getenv("BURN_FROM_ADDRESS", "0x151c2b49CdEC10B150B2763dF3d1C00D70C90956")
-    
-    @property
-    def burn_to_address(self) -> str:
-        return os.getenv("BURN_TO_ADDRESS", "0x000000000000000000000000000000000000dead")
-    
-    @property
-    def safe_address(self) -> str:
-        return os.getenv("SAFE_ADDRESS", "0xb1972e86B3380fd69DCb395F98D39fbF1A5f305A")
-    
-    @property
-    def supply_proxy_address(self) -> str:
-        return os.getenv("SUPPLY_PROXY_ADDRESS", "0x6CFe1dDfd88890E08276c7FA9D6DCa1cA4A224a9")
-    
-    @property
-    def distribution_proxy_address(self) -> str:
-        return os.getenv("DISTRIBUTION_PROXY_ADDRESS", "0x47176B2Af9885dC6C4575d4eFd63895f7Aaa4790")
-    
-    @property
-    def mor_mainnet_address(self) -> str:
-        return os.getenv("MOR_MAINNET_ADDRESS", "0xcbb8f1bda10b9696c57e13bc128fe674769dcec0")
-    
-    @property
-    def mor_arbitrum_address(self) -> str:
-        return os.getenv("MOR_ARBITRUM_ADDRESS", "0x092bAaDB7DEf4C3981454dD9c0A0D7FF07bCFc86")
-    
-    @property
-    def mor_base_address(self) -> str:
-        return os.getenv("MOR_BASE_ADDRESS", "0x7431aDa8a591C955a994a21710752EF9b882b8e3")
-    
-    @property
-    def steth_token_address(self) -> str:
-        return os.getenv("STETH_TOKEN_ADDRESS", "0x5300000000000000000000000000000000000004")
-
-
-class BlockchainSettings:
+    burn_from_address: str = Field(
+        "0x151c2b49CdEC10B150B2763dF3d1C00D70C90956", validation_alias="BURN_FROM_ADDRESS"
+    )
+    burn_to_address: str = Field(
+        "0x000000000000000000000000000000000000dead", validation_alias="BURN_TO_ADDRESS"
+    )
+    safe_address: str = Field(
+        "0xb1972e86B3380fd69DCb395F98D39fbF1A5f305A", validation_alias="SAFE_ADDRESS"
+    )
+    supply_proxy_address: str = Field(
+        "0x6CFe1dDfd88890E08276c7FA9D6DCa1cA4A224a9", validation_alias="SUPPLY_PROXY_ADDRESS"
+    )
+    distribution_proxy_address: str = Field(
+        "0x47176B2Af9885dC6C4575d4eFd63895f7Aaa4790", validation_alias="DISTRIBUTION_PROXY_ADDRESS"
+    )
+    mor_mainnet_address: str = Field(
+        "0xcbb8f1bda10b9696c57e13bc128fe674769dcec0", validation_alias="MOR_MAINNET_ADDRESS"
+    )
+    mor_arbitrum_address: str = Field(
+        "0x092bAaDB7DEf4C3981454dD9c0A0D7FF07bCFc86", validation_alias="MOR_ARBITRUM_ADDRESS"
+    )
+    mor_base_address: str = Field(
+        "0x7431aDa8a591C955a994a21710752EF9b882b8e3", validation_alias="MOR_BASE_ADDRESS"
+    )
+    steth_token_address: str = Field(
+        "0x5300000000000000000000000000000000000004", validation_alias="STETH_TOKEN_ADDRESS"
+    )
+
+
+class BlockchainSettings(EnvSettings):
     """Blockchain-related settings."""
     
-    @property
-    def burn_start_block(self) -> int:
-        return int(os.getenv("BURN_START_BLOCK", "0"))
-    
-    @property
-    def mainnet_block_1st_jan_2024(self) -> int:
-        return int(os.getenv("MAINNET_BLOCK_1ST_JAN_2024", "18913400"))  # 1st January 2024
-    
-    @property
-    def average_block_time(self) -> int:
-        return int(os.getenv("AVERAGE_BLOCK_TIME", "15"))
-    
-    @property
-    def total_supply_historical_days(self) -> int:
-        return int(os.getenv("TOTAL_SUPPLY_HISTORICAL_DAYS", "30"))
-    
-    @property
-    def total_supply_historical_start_block(self) -> int:
-        return int(os.getenv("TOTAL_SUPPLY_HISTORICAL_START_BLOCK", "20432592"))  # 1st August 2024
-    
-    @property
-    def prices_and_volume_data_days(self) -> int:
-        return int(os.getenv("PRICES_AND_VOLUME_DATA_DAYS", "300"))
+    burn_start_block: int = Field(0, validation_alias="BURN_START_BLOCK")
+    mainnet_block_1st_jan_2024: int = Field(18913400, validation_alias="MAINNET_BLOCK_1ST_JAN_2024")  # 1st January 2024
+    average_block_time: int = Field(15, validation_alias="AVERAGE_BLOCK_TIME")
+    total_supply_historical_days: int = Field(30, validation_alias="TOTAL_SUPPLY_HISTORICAL_DAYS")
+    total_supply_historical_start_block: int = Field(
+        20432592, validation_alias="TOTAL_SUPPLY_HISTORICAL_START_BLOCK"
+    )  # 1st August 2024
+    prices_and_volume_data_days: int = Field(300, validation_alias="PRICES_AND_VOLUME_DATA_DAYS")
 
 
-class ExternalAPISettings:
+class ExternalAPISettings(EnvSettings):
     """External API settings."""
     
-    @property
-    def dune_api_key(self) -> str:
-        return os.getenv("DUNE_API_KEY", "")
-    
-    @property
-    def dune_query_id(self) -> str:
-        return os.getenv("DUNE_QUERY_ID", "")
+    dune_api_key: str = Field("", validation_alias="DUNE_API_KEY")
+    dune_query_id: str = Field("", validation_alias="DUNE_QUERY_ID")
+    github_api_key: str = Field("", validation_alias="GITHUB_API_KEY")
+
+
+class Settings(BaseModel):
+    """Main application settings, grouping the environment-backed settings."""
     
-    @property
-    def github_api_key(self) -> str:
-        return os.getenv("GITHUB_API_KEY", "")
+    database: DatabaseSettings = Field(default_factory=DatabaseSettings)
+    web3: Web3Settings = Field(default_factory=Web3Settings)
+    api: APISettings = Field(default_factory=APISettings)
+    cache: CacheSettings = Field(default_factory=CacheSettings)
+    contracts: ContractAddresses = Field(default_factory=ContractAddresses)
+    blockchain: BlockchainSettings = Field(default_factory=BlockchainSettings)
+    external_apis: ExternalAPISettings = Field(default_factory=ExternalAPISettings)
 
 
-class Settings:
-    """Main application settings."""
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """
+    Get the application settings, parsing the environment on the first call.
     
-    def __init__(self):
-        self.database = DatabaseSettings()
-        self.web3 = Web3Settings()
-        self.api = APISettings()
-        self.cache = CacheSettings()
-        self.contracts = ContractAddresses()
-        self.blockchain = BlockchainSettings()
-        self.external_apis = ExternalAPISettings()
-
-
-# Create a global settings instance
-settings = Settings()
\ No newline at end of file
+    Returns:
+        Settings: The application settings
+    """
+    return Settings()
+
+
+# Global settings instance
+settings = get_settings()
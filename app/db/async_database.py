@@ -0,0 +1,366 @@
+"""
+Async PostgreSQL database wrapper on top of psycopg 3 and psycopg_pool.
+
+This is the native-async counterpart of `app.db.database.Database`: queries are
+awaited on the event loop instead of blocking a threadpool worker. The sync
+`Database` stays available for code that has not been ported yet.
+"""
+import asyncio
+import itertools
+import logging
+import random
+from contextlib import asynccontextmanager
+from functools import wraps
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple, TypeVar, Union
+
+import psycopg
+from psycopg.adapt import Loader
+from psycopg.rows import dict_row, tuple_row
+from psycopg.types.numeric import NumericBinaryLoader as DecimalBinaryLoader
+from psycopg_pool import AsyncConnectionPool, PoolTimeout
+
+from app.core.exceptions import DatabaseError
+from app.db.database import DBConfig, parse_numeric
+
+logger = logging.getLogger(__name__)
+
+# Type variable for function return type
+T = TypeVar('T')
+
+# Bound once so the retry loop avoids the module attribute lookup
+_jitter = random.uniform
+
+# Source of unique names for server-side cursors
+_cursor_ids = itertools.count()
+
+
+def with_async_retry(
+    max_retries: int = 3,
+    initial_backoff: float = 0.5,
+    max_backoff: float = 10.0,
+    backoff_factor: float = 2.0,
+    retryable_exceptions: tuple = (psycopg.OperationalError, psycopg.InterfaceError, PoolTimeout)
+) -> Callable[[Callable[..., Awaitable[T]]], Callable[..., Awaitable[T]]]:
+    """
+    Decorator for retrying async database operations with exponential backoff.
+    
+    Args:
+        max_retries: Maximum number of retry attempts
+        initial_backoff: Initial backoff time in seconds
+        max_backoff: Maximum backoff time in seconds
+        backoff_factor: Factor to multiply backoff time by after each retry
+        retryable_exceptions: Tuple of exceptions that should trigger a retry
+    
+    Returns:
+        Decorator function
+    """
+    def decorator(func: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+        @wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> T:
+            retries = 0
+            backoff = initial_backoff
+            
+            while True:
+                try:
+                    return await func(*args, **kwargs)
+                except retryable_exceptions as e:
+                    retries += 1
+                    if retries > max_retries:
+                        logger.error(
+                            f"Max retries ({max_retries}) exceeded for {func.__name__}: {str(e)}"
+                        )
+                        raise DatabaseError(
+                            message=f"Database operation failed after {max_retries} retries",
+                            details={"error": str(e), "function": func.__name__}
+                        )
+                    
+                    # Calculate backoff time with jitter
+                    sleep_time = min(backoff * _jitter(0.8, 1.2), max_backoff)
+                    
+                    logger.warning(
+                        f"Retry {retries}/{max_retries} for {func.__name__} after {sleep_time:.2f}s: {str(e)}"
+                    )
+                    await asyncio.sleep(sleep_time)
+                    
+                    # Increase backoff for next retry
+                    backoff = min(backoff * backoff_factor, max_backoff)
+        
+        return wrapper
+    
+    return decorator
+
+
+class NumericLoader(Loader):
+    """Load NUMERIC values as int/float, like the sync driver's typecaster."""
+    
+    def load(self, data) -> Union[int, float]:
+        return parse_numeric(bytes(data).decode())
+
+
+class NumericBinaryLoader(DecimalBinaryLoader):
+    """Load binary NUMERIC values as int/float, like `NumericLoader`."""
+    
+    def load(self, data) -> Union[int, float]:
+        value = super().load(data)
+        if value.is_finite() and value == value.to_integral_value():
+            return int(value)
+        return float(value)
+
+
+class AsyncDatabase:
+    """Async PostgreSQL database wrapper with connection pooling and retry logic."""
+    
+    def __init__(self, cfg: DBConfig) -> None:
+        """
+        Initialize the database wrapper. The pool is opened by `open()`.
+        
+        Args:
+            cfg: Database configuration
+        """
+        self._cfg = cfg
+        self._pool = AsyncConnectionPool(
+            # Never warmed: warm_pool already holds maxconn sync connections per
+            # worker, so this pool keeps minconn and grows only for async load
+            min_size=cfg.minconn,
+            max_size=cfg.maxconn,
+            # Test connections as they are handed out and retire idle or old
+            # ones, so a connection dropped by the server is never used
+            check=AsyncConnectionPool.check_connection,
+            max_idle=cfg.max_idle_seconds,
+            max_lifetime=cfg.max_lifetime_seconds,
+            open=False,
+            kwargs={
+                **cfg.connect_kwargs(),
+                "autocommit": cfg.autocommit,
+                # None turns automatic statement preparation off
+                "prepare_threshold": cfg.prepare_threshold if cfg.statement_cache_size else None,
+            },
+            configure=self._configure,
+        )
+    
+    async def _configure(self, conn: psycopg.AsyncConnection) -> None:
+        """
+        Configure a new pooled connection.
+        
+        Args:
+            conn: The new connection
+        """
+        conn.adapters.register_loader("numeric", NumericLoader)
+        conn.adapters.register_loader("numeric", NumericBinaryLoader)
+        if self._cfg.statement_cache_size:
+            conn.prepared_max = self._cfg.statement_cache_size
+    
+    async def open(self) -> None:
+        """
+        Open the connection pool and wait for the initial connections.
+        
+        Raises:
+            DatabaseError: If the connection pool cannot be opened
+        """
+        try:
+            await self._pool.open(wait=True)
+        except (psycopg.Error, PoolTimeout) as e:
+            logger.error(f"Failed to open async connection pool: {str(e)}")
+            # Stop the pool's background workers from retrying the connections
+            await self._pool.close()
+            raise DatabaseError(
+                message="Failed to create database connection pool",
+                details={"error": str(e)}
+            )
+    
+    async def close(self) -> None:
+        """Close all connections in the pool."""
+        await self._pool.close()
+    
+    @asynccontextmanager
+    async def cursor(self, *, dict_cursor: bool = False):
+        """
+        Context manager for database cursors.
+        
+        The pooled connection commits when the block exits normally and rolls
+        back if it raises. Results use the binary protocol, so values such as
+        timestamps and integers are decoded without parsing their text form.
+        
+        Args:
+            dict_cursor: Whether to return rows as dictionaries instead of tuples
+        
+        Yields:
+            AsyncCursor: A database cursor
+        """
+        async with self._pool.connection() as conn:
+            async with conn.cursor(binary=True, row_factory=dict_row if dict_cursor else tuple_row) as cur:
+                yield cur
+    
+    @asynccontextmanager
+    async def transaction(self):
+        """
+        Context manager for transactions.
+        
+        Yields:
+            AsyncCursor: A database cursor
+        """
+        async with self._pool.connection() as conn:
+            async with conn.transaction():
+                async with conn.cursor() as cur:
+                    yield cur
+    
+    @with_async_retry()
+    async def execute(self, sql: str, params: Optional[Sequence[Any]] = None) -> None:
+        """
+        Execute a SQL statement.
+        
+        Args:
+            sql: The SQL statement
+            params: The parameters for the SQL statement
+        """
+        async with self.cursor() as cur:
+            await cur.execute(sql, params)
+    
+    @with_async_retry()
+    async def fetchone(
+        self,
+        sql: str,
+        params: Optional[Sequence[Any]] = None,
+        *,
+        dict_cursor: bool = False,
+        prepare: bool = False,
+    ) -> Optional[Union[Tuple[Any], Dict[str, Any]]]:
+        """
+        Fetch a single row from the database.
+        
+        Args:
+            sql: The SQL statement
+            params: The parameters for the SQL statement
+            dict_cursor: Whether to return the row as a dictionary
+            prepare: Whether to prepare the statement on its first run instead
+                of after prepare_threshold runs; ignored when preparing is
+                disabled by statement_cache_size
+        
+        Returns:
+            Optional[Union[Tuple[Any], Dict[str, Any]]]: The row, or None if no row was found
+        """
+        # None leaves the choice to prepare_threshold
+        prepare_now = True if prepare and self._cfg.statement_cache_size else None
+        async with self.cursor(dict_cursor=dict_cursor) as cur:
+            await cur.execute(sql, params, prepare=prepare_now)
+            return await cur.fetchone()
+    
+    @with_async_retry()
+    async def fetchall(
+        self, sql: str, params: Optional[Sequence[Any]] = None, *, dict_cursor: bool = False
+    ) -> List[Union[Tuple[Any], Dict[str, Any]]]:
+        """
+        Fetch all rows from the database.
+        
+        Args:
+            sql: The SQL statement
+            params: The parameters for the SQL statement
+            dict_cursor: Whether to return the rows as dictionaries
+        
+        Returns:
+            List[Union[Tuple[Any], Dict[str, Any]]]: The rows as tuples, or as
+            dictionaries if dict_cursor is set
+        """
+        async with self.cursor(dict_cursor=dict_cursor) as cur:
+            await cur.execute(sql, params)
+            return await cur.fetchall()
+    
+    async def stream(
+        self,
+        sql: str,
+        params: Optional[Sequence[Any]] = None,
+        *,
+        prefetch: int = 10000,
+        dict_cursor: bool = False,
+    ) -> AsyncIterator[Union[Tuple[Any], Dict[str, Any]]]:
+        """
+        Iterate over the rows of a query through a server-side cursor.
+        
+        Rows are pulled prefetch at a time, so memory use does not grow with
+        the size of the result as it does with `fetchall`. The connection is
+        held until the iterator is exhausted or closed.
+        
+        Args:
+            sql: The SQL statement
+            params: The parameters for the SQL statement
+            prefetch: Number of rows fetched per network roundtrip
+            dict_cursor: Whether to return the rows as dictionaries
+        
+        Yields:
+            Union[Tuple[Any], Dict[str, Any]]: The rows
+        """
+        async with self._pool.connection() as conn:
+            async with conn.transaction():
+                async with conn.cursor(
+                    name=f"stream_{next(_cursor_ids)}",
+                    binary=True,
+                    row_factory=dict_row if dict_cursor else tuple_row,
+                ) as cur:
+                    cur.itersize = prefetch
+                    await cur.execute(sql, params)
+                    async for row in cur:
+                        yield row
+    
+    async def health_check(self) -> bool:
+        """
+        Check if the database is healthy.
+        
+        Returns:
+            bool: True if the database is healthy, False otherwise
+        """
+        try:
+            result = await self.fetchone("SELECT 1")
+            return result is not None and result[0] == 1
+        except Exception as e:
+            logger.error(f"Async database health check failed: {str(e)}")
+            return False
+
+
+# Global async database instance
+_async_db: Optional[AsyncDatabase] = None
+
+
+async def init_async_db(cfg: DBConfig) -> AsyncDatabase:
+    """
+    Initialize and open the global async database instance.
+    
+    Args:
+        cfg: Database configuration
+    
+    Returns:
+        AsyncDatabase: The database instance
+    
+    Raises:
+        RuntimeError: If the database is already initialized
+    """
+    global _async_db
+    if _async_db is not None:
+        raise RuntimeError("Async database already initialized")
+    
+    db = AsyncDatabase(cfg)
+    await db.open()
+    _async_db = db
+    return _async_db
+
+
+async def close_async_db() -> None:
+    """Close the global async database instance, if any."""
+    global _async_db
+    if _async_db is not None:
+        await _async_db.close()
+        _async_db = None
+
+
+def get_async_db() -> AsyncDatabase:
+    """
+    Get the global async database instance.
+    
+    Returns:
+        AsyncDatabase: The database instance
+    
+    Raises:
+        RuntimeError: If the database is not initialized
+    """
+    if _async_db is None:
+        raise RuntimeError("Async database not initialized – call init_async_db() first")
+    return _async_db
@@ -1,15 +1,27 @@
 """
 Enhanced PostgreSQL database wrapper with connection pooling and retry logic.
 """
+import csv
+import io
+import itertools
 import logging
+import random
+import re
+import threading
 import time
+from collections import deque
 from contextlib import contextmanager
 from dataclasses import dataclass
 from functools import wraps
-from typing import Any, Callable, Dict, List, Optional, Sequence, TypeVar, Tuple
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, TypeVar, Tuple, Union
 
+import numpy as np
+import pandas as pd
 import psycopg2
-from psycopg2.pool import ThreadedConnectionPool
+import psycopg2.extensions
+from psycopg2.errors import DuplicatePreparedStatement, FeatureNotSupported, InvalidSqlStatementName
+from psycopg2.extras import RealDictCursor
+from psycopg2.pool import PoolError, ThreadedConnectionPool
 
 from app.core.exceptions import DatabaseError
 
@@ -18,18 +30,334 @@ logger = logging.getLogger(__name__)
 # Type variable for function return type
 T = TypeVar('T')
 
+# Bound once so the retry loop avoids the module attribute lookup
+_jitter = random.uniform
 
-@dataclass(slots=True)
+# Source of unique names for server-side cursors
+_cursor_ids = itertools.count()
+
+# Parameter placeholders and escaped percent signs in SQL for cursor.execute
+_PLACEHOLDER = re.compile(r"%[s%]")
+
+# Marker for NULL values in COPY data (an unquoted empty field is an empty string)
+_COPY_NULL = "\\N"
+
+# Names of the statements PREPAREd on each pooled connection. Kept at module
+# level because Database instances with the same configuration share a pool.
+_prepared_statements: Dict[Any, set] = {}
+_prepared_lock = threading.Lock()
+
+def parse_numeric(value: str) -> Union[int, float]:
+    """
+    Parse a NUMERIC value from its text representation without Decimal.
+    
+    Integral values (token amounts in wei, scaled multipliers) become exact
+    Python ints; anything with a fractional part becomes a float.
+    
+    Args:
+        value: The NUMERIC value as text
+        
+    Returns:
+        Union[int, float]: The parsed value
+    """
+    whole, _, fraction = value.partition(".")
+    # NaN/Infinity have no digits to parse as an int
+    if not fraction.strip("0") and whole[-1:].isdigit():
+        return int(whole)
+    return float(value)
+
+
+def _cast_numeric(value: Optional[str], cur: Any) -> Optional[Union[int, float]]:
+    """psycopg2 typecaster for NUMERIC columns, see `parse_numeric`."""
+    return None if value is None else parse_numeric(value)
+
+
+# Reads NUMERIC as int/float instead of Decimal, whose arithmetic is far slower.
+# Registered on pooled connections only, so other psycopg2 users in the process
+# keep getting Decimal; queries needing one fixed type cast to float8 or
+# numeric(78,0)
+NUMERIC_AS_NUMBER = psycopg2.extensions.new_type(
+    psycopg2.extensions.DECIMAL.values, "NUMERIC_AS_NUMBER", _cast_numeric
+)
+
+# Number of recent pool checkout times kept for latency percentiles
+CHECKOUT_SAMPLES = 1024
+
+# Recompute the checkout p95 every this many checkouts
+CHECKOUT_CHECK_INTERVAL = 256
+
+
+@dataclass(slots=True, frozen=True)
 class DBConfig:
-    """Database configuration."""
+    """Database configuration. Frozen so it can key the shared pool cache."""
     host: str = "localhost"
     port: int = 5432
     database: str = "postgres"
     user: str = "postgres"
     password: str = "postgres"
-    minconn: int = 1
+    minconn: int = 2
     maxconn: int = 10
     autocommit: bool = False
+    # Open all maxconn connections of the sync pool up front and keep them open
+    # when idle; the async pool always starts at minconn
+    warm_pool: bool = True
+    keepalives_idle: int = 30
+    keepalives_interval: int = 10
+    application_name: str = "mor-stats"
+    # Backend options sent at connect time; JIT only slows down short queries
+    options: str = "-c jit=off"
+    # Warn when the p95 pool checkout time exceeds this, a sign maxconn is too low
+    checkout_warn_ms: float = 1.0
+    # Server-side prepared statements kept per async connection; 0 disables
+    # preparing, sync and async (required behind PgBouncer in transaction
+    # pooling mode)
+    statement_cache_size: int = 1024
+    # Executions of the same query before the async driver prepares it; 0
+    # prepares every statement on its first run
+    prepare_threshold: int = 5
+    # Planning of prepared statements: "auto" lets the server switch to a
+    # generic plan after five runs, "force_custom_plan" replans with the actual
+    # parameters every time (safer for skewed range scans over event tables)
+    plan_cache_mode: str = "auto"
+    # Ping pooled connections idle longer than this before handing them out,
+    # so one the server or a proxy has dropped is replaced instead of failing
+    # the query; 0 pings on every checkout
+    pre_ping_idle_seconds: float = 30.0
+    # Close pooled connections beyond minconn once idle longer than this
+    max_idle_seconds: float = 300.0
+    # Replace pooled async connections older than this
+    max_lifetime_seconds: float = 3600.0
+    
+    def connect_kwargs(self) -> Dict[str, Any]:
+        """
+        Get the libpq connection parameters for this configuration.
+        
+        Returns:
+            Dict[str, Any]: Keyword arguments for psycopg2.connect
+        """
+        return {
+            "host": self.host,
+            "port": self.port,
+            "dbname": self.database,
+            "user": self.user,
+            "password": self.password,
+            "keepalives": 1,
+            "keepalives_idle": self.keepalives_idle,
+            "keepalives_interval": self.keepalives_interval,
+            "application_name": self.application_name,
+            "options": self.backend_options(),
+        }
+    
+    def backend_options(self) -> str:
+        """
+        Get the backend options sent at connect time.
+        
+        Returns:
+            str: The options string, including plan_cache_mode when it is not "auto"
+        """
+        if self.plan_cache_mode == "auto":
+            return self.options
+        return f"{self.options} -c plan_cache_mode={self.plan_cache_mode}".strip()
+
+
+class CachingConnectionPool(ThreadedConnectionPool):
+    """
+    Threaded pool that keeps returned connections open until they go idle.
+    
+    ThreadedConnectionPool closes any connection returned while minconn are
+    already idle, so every burst above minconn pays for new connections. This
+    pool keeps up to maxconn connections and only closes those beyond minconn
+    that have been idle for max_idle seconds. Connections are reused most
+    recently returned first, so the least used ones are the ones that age out.
+    """
+    
+    def __init__(self, minconn: int, maxconn: int, *args: Any, max_idle: float = 300.0, **kwargs: Any):
+        self._max_idle = max_idle
+        # Set once the pool has been replaced, see retire()
+        self._retired = False
+        # When each open connection was last returned; kept while it is in use
+        # so idle_seconds() can tell how long it sat in the pool
+        self._idle_since: Dict[Any, float] = {}
+        super().__init__(minconn, maxconn, *args, **kwargs)
+    
+    def _connect(self, key=None):
+        """Open a connection that reads NUMERIC through `parse_numeric`."""
+        conn = super()._connect(key)
+        psycopg2.extensions.register_type(NUMERIC_AS_NUMBER, conn)
+        return conn
+    
+    def idle_seconds(self, conn) -> float:
+        """
+        Get how long a connection sat idle before its last checkout.
+        
+        Args:
+            conn: A connection from this pool
+            
+        Returns:
+            float: Seconds since it was last returned, or inf if it never was
+        """
+        return time.monotonic() - self._idle_since.get(conn, float("-inf"))
+    
+    def owns(self, conn) -> bool:
+        """Check whether a connection is checked out from this pool."""
+        return id(conn) in self._rused
+    
+    def _forget(self, conn) -> None:
+        """Drop everything recorded about a connection the pool has closed."""
+        self._idle_since.pop(conn, None)
+        _forget_prepared(conn)
+    
+    def retire(self) -> None:
+        """
+        Stop handing out connections, e.g. after the pool was replaced.
+        
+        Idle connections are closed now. Checked-out ones are left running
+        and closed by their holder, see Database._release().
+        """
+        with self._lock:
+            self._retired = True
+            idle, self._pool = self._pool, []
+            for conn in idle:
+                conn.close()
+                self._forget(conn)
+    
+    def _getconn(self, key=None):
+        """Close connections idle for too long, then take the most recent one."""
+        if self._retired:
+            raise PoolError("connection pool was replaced")
+        now = time.monotonic()
+        while len(self._pool) > self.minconn:
+            oldest = self._pool[0]
+            if now - self._idle_since.get(oldest, now) <= self._max_idle:
+                break
+            self._pool.pop(0)
+            oldest.close()
+            self._forget(oldest)
+        return super()._getconn(key)
+    
+    def _putconn(self, conn, key=None, close=False):
+        """Keep the returned connection unless the pool already holds maxconn."""
+        # The base class keeps a connection only while fewer than minconn idle
+        minconn, self.minconn = self.minconn, self.maxconn
+        try:
+            super()._putconn(conn, key, close)
+        finally:
+            self.minconn = minconn
+        if conn.closed:
+            self._forget(conn)
+        else:
+            self._idle_since[conn] = time.monotonic()
+    
+    def _closeall(self):
+        """Close all connections and drop what was recorded about them."""
+        conns = self._pool + list(self._used.values())
+        super()._closeall()
+        for conn in conns:
+            self._forget(conn)
+
+
+# Pools shared by Database instances built from identical configurations, and
+# how many open instances use each one
+_pools: Dict[DBConfig, CachingConnectionPool] = {}
+_pool_users: Dict[DBConfig, int] = {}
+_pools_lock = threading.Lock()
+
+
+def _create_pool(cfg: DBConfig) -> CachingConnectionPool:
+    """
+    Create a connection pool for a configuration.
+    
+    Args:
+        cfg: Database configuration
+        
+    Returns:
+        CachingConnectionPool: The connection pool
+        
+    Raises:
+        DatabaseError: If the connection pool cannot be created
+    """
+    # minconn connections are opened at construction and never aged out, so a
+    # warm pool uses maxconn for both
+    minconn = cfg.maxconn if cfg.warm_pool else cfg.minconn
+    try:
+        return CachingConnectionPool(
+            minconn, cfg.maxconn, max_idle=cfg.max_idle_seconds, **cfg.connect_kwargs()
+        )
+    except psycopg2.Error as e:
+        logger.error(f"Failed to create connection pool: {str(e)}")
+        raise DatabaseError(
+            message="Failed to create database connection pool",
+            details={"error": str(e)}
+        )
+
+
+def _attach_pool(cfg: DBConfig) -> CachingConnectionPool:
+    """
+    Get the shared pool for a configuration and count one more user of it.
+    
+    Every Database built from an identical configuration shares one pool
+    instead of each opening its own connections.
+    
+    Args:
+        cfg: Database configuration
+        
+    Returns:
+        CachingConnectionPool: The shared connection pool
+        
+    Raises:
+        DatabaseError: If the connection pool cannot be created
+    """
+    with _pools_lock:
+        pool = _pools.get(cfg)
+        if pool is None:
+            pool = _pools[cfg] = _create_pool(cfg)
+        _pool_users[cfg] = _pool_users.get(cfg, 0) + 1
+        return pool
+
+
+def _detach_pool(cfg: DBConfig) -> None:
+    """
+    Count one user less of a configuration's pool, closing it after the last.
+    
+    Args:
+        cfg: Database configuration
+    """
+    with _pools_lock:
+        _pool_users[cfg] -= 1
+        if _pool_users[cfg]:
+            return
+        del _pool_users[cfg]
+        pool = _pools.pop(cfg, None)
+    if pool is not None and not pool.closed:
+        pool.closeall()
+
+
+def _replace_pool(cfg: DBConfig, broken: CachingConnectionPool) -> CachingConnectionPool:
+    """
+    Replace a configuration's shared pool after it failed.
+    
+    Only the first caller for a given broken pool builds a new one; later
+    callers get the replacement. The broken pool is retired, so it closes its
+    connections instead of leaking them.
+    
+    Args:
+        cfg: Database configuration
+        broken: The pool the caller failed to get a connection from
+        
+    Returns:
+        CachingConnectionPool: The current shared pool
+        
+    Raises:
+        DatabaseError: If the connection pool cannot be created
+    """
+    with _pools_lock:
+        pool = _pools.get(cfg)
+        if pool is not None and pool is not broken:
+            return pool
+        pool = _pools[cfg] = _create_pool(cfg)
+    if not broken.closed:
+        broken.retire()
+    return pool
 
 
 def with_retry(
@@ -73,8 +401,7 @@ def with_retry(
                         )
                     
                     # Calculate backoff time with jitter
-                    import random
-                    jitter = random.uniform(0.8, 1.2)
+                    jitter = _jitter(0.8, 1.2)
                     sleep_time = min(backoff * jitter, max_backoff)
                     
                     logger.warning(
@@ -101,34 +428,21 @@ class Database:
             cfg: Database configuration
         """
         self._cfg = cfg
-        self._pool = self._create_pool()
-    
-    def _create_pool(self) -> ThreadedConnectionPool:
-        """
-        Create a new connection pool.
-        
-        Returns:
-            ThreadedConnectionPool: The connection pool
-            
-        Raises:
-            DatabaseError: If the connection pool cannot be created
-        """
-        try:
-            return ThreadedConnectionPool(
-                self._cfg.minconn,
-                self._cfg.maxconn,
-                host=self._cfg.host,
-                port=self._cfg.port,
-                dbname=self._cfg.database,
-                user=self._cfg.user,
-                password=self._cfg.password,
-            )
-        except psycopg2.Error as e:
-            logger.error(f"Failed to create connection pool: {str(e)}")
-            raise DatabaseError(
-                message="Failed to create database connection pool",
-                details={"error": str(e)}
-            )
+        self._health_stmt = "SELECT 1"
+        # Dedicated autocommit connection and cursor reused by every health
+        # check; opened lazily and kept outside the pool
+        self._health_conn = None
+        self._health_cur = None
+        self._health_lock = threading.Lock()
+        # Pool checkout metrics, see pool_stats()
+        self._checkout_times: deque = deque(maxlen=CHECKOUT_SAMPLES)
+        self._checkouts = 0
+        self._in_use = 0
+        self._stats_lock = threading.Lock()
+        # Connection and cursor pinned by session() for the current thread
+        self._session = threading.local()
+        self._pool = _attach_pool(cfg)
+        self._closed = False
     
     @with_retry()
     def _acquire(self):
@@ -142,17 +456,15 @@ class Database:
             DatabaseError: If a connection cannot be acquired
         """
         try:
-            conn = self._pool.getconn()
-            conn.autocommit = self._cfg.autocommit
-            return conn
+            return self._checkout()
         except psycopg2.Error as e:
             logger.error(f"Failed to acquire connection from pool: {str(e)}")
+            if self._closed:
+                raise DatabaseError(message="Database is closed", details={"error": str(e)})
             # Try to recreate the pool if it's exhausted or broken
             try:
-                self._pool = self._create_pool()
-                conn = self._pool.getconn()
-                conn.autocommit = self._cfg.autocommit
-                return conn
+                self._pool = _replace_pool(self._cfg, self._pool)
+                return self._checkout()
             except psycopg2.Error as e2:
                 logger.error(f"Failed to recreate connection pool: {str(e2)}")
                 raise DatabaseError(
@@ -160,6 +472,29 @@ class Database:
                     details={"error": str(e2)}
                 )
     
+    def _checkout(self):
+        """
+        Take a live connection from the pool.
+        
+        A connection that has been idle longer than pre_ping_idle_seconds is
+        pinged first; a closed or unresponsive one is discarded and replaced
+        by a fresh connection.
+        
+        Returns:
+            Connection: A database connection
+        """
+        start = time.perf_counter()
+        conn = self._pool.getconn()
+        # New connections have never been idle and count as infinitely old
+        idle = self._pool.idle_seconds(conn)
+        if conn.closed or (idle >= self._cfg.pre_ping_idle_seconds and not _ping(conn)):
+            logger.warning("Discarding dead pooled connection")
+            self._pool.putconn(conn, close=True)
+            conn = self._pool.getconn()
+        self._record_checkout(time.perf_counter() - start)
+        conn.autocommit = self._cfg.autocommit
+        return conn
+    
     def _release(self, conn):
         """
         Release a connection back to the pool.
@@ -167,26 +502,120 @@ class Database:
         Args:
             conn: The connection to release
         """
+        with self._stats_lock:
+            self._in_use -= 1
+        if not self._pool.owns(conn):
+            # Checked out before the pool was replaced; the retired pool is
+            # no longer referenced, so the connection is closed here
+            conn.close()
+            _forget_prepared(conn)
+            return
         try:
             self._pool.putconn(conn)
         except psycopg2.Error as e:
             logger.warning(f"Failed to release connection to pool: {str(e)}")
             # Just log the error, don't raise an exception
     
+    def _record_checkout(self, elapsed: float) -> None:
+        """
+        Record a pool checkout and warn if checkouts have become slow.
+        
+        Args:
+            elapsed: Time spent in getconn, in seconds
+        """
+        self._checkout_times.append(elapsed)
+        with self._stats_lock:
+            self._in_use += 1
+            self._checkouts += 1
+            check = self._checkouts % CHECKOUT_CHECK_INTERVAL == 0
+        if check:
+            p95_ms = _percentile(self._checkout_times, 0.95) * 1000
+            if p95_ms > self._cfg.checkout_warn_ms:
+                logger.warning(
+                    "Slow connection pool checkouts: p95 %.2fms over the last %d (maxconn=%d)",
+                    p95_ms, len(self._checkout_times), self._cfg.maxconn
+                )
+    
+    def pool_stats(self) -> Dict[str, Any]:
+        """
+        Get connection pool usage and checkout latency statistics.
+        
+        Returns:
+            Dict[str, Any]: Connections in use, pool size, total checkouts and
+            checkout latency percentiles (ms) over the recent checkouts
+        """
+        samples = list(self._checkout_times)
+        return {
+            "in_use": self._in_use,
+            "maxconn": self._cfg.maxconn,
+            "checkouts": self._checkouts,
+            "checkout_p50_ms": _percentile(samples, 0.5) * 1000,
+            "checkout_p95_ms": _percentile(samples, 0.95) * 1000,
+            "checkout_max_ms": max(samples, default=0.0) * 1000,
+        }
+    
     @contextmanager
-    def cursor(self, *, dict_cursor: bool = True):
+    def session(self):
+        """
+        Context manager that runs several queries on one connection and cursor.
+        
+        While the block runs, `cursor()`, `transaction()` and the query helpers
+        called from this thread reuse a single pooled connection and cursor
+        instead of checking out a connection and opening a cursor per call.
+        Everything is committed once when the block exits normally and rolled
+        back if it raises. Nested sessions join the outer one.
+        
+        Yields:
+            Database: This database
+        """
+        if getattr(self._session, "cur", None) is not None:
+            yield self
+            return
+        
+        conn = self._acquire()
+        try:
+            with conn.cursor() as cur:
+                self._session.conn, self._session.cur = conn, cur
+                try:
+                    yield self
+                finally:
+                    self._session.conn = self._session.cur = None
+            if not conn.autocommit:
+                conn.commit()
+        except Exception:
+            if not conn.autocommit:
+                conn.rollback()
+            raise
+        finally:
+            self._release(conn)
+    
+    @contextmanager
+    def cursor(self, *, dict_cursor: bool = False):
         """
         Context manager for database cursors.
         
+        Inside a `session()` the session's cursor is reused, and the session
+        commits at its end.
+        
         Args:
-            dict_cursor: Whether to use a dictionary cursor
+            dict_cursor: Whether to use a dictionary cursor (rows as dicts
+                instead of tuples; allocates a dict per row)
             
         Yields:
             Cursor: A database cursor
         """
+        session_cur = getattr(self._session, "cur", None)
+        if session_cur is not None:
+            if dict_cursor:
+                with self._session.conn.cursor(cursor_factory=RealDictCursor) as cur:
+                    yield cur
+            else:
+                yield session_cur
+            return
+        
         conn = self._acquire()
         try:
-            with conn.cursor() as cur:
+            with conn.cursor(cursor_factory=RealDictCursor if dict_cursor else None) as cur:
                 yield cur
                 if not conn.autocommit:
                     conn.commit()
@@ -211,48 +640,321 @@ class Database:
     
     @with_retry()
     def fetchone(
-        self, sql: str, params: Optional[Sequence[Any]] = None
-    ) -> Optional[Tuple[Any]]:
+        self, sql: str, params: Optional[Sequence[Any]] = None, *, dict_cursor: bool = False
+    ) -> Optional[Union[Tuple[Any], Dict[str, Any]]]:
         """
         Fetch a single row from the database.
         
         Args:
             sql: The SQL statement
             params: The parameters for the SQL statement
+            dict_cursor: Whether to return the row as a dictionary
             
         Returns:
-            Optional[Dict[str, Any]]: The row as a dictionary, or None if no row was found
+            Optional[Union[Tuple[Any], Dict[str, Any]]]: The row, or None if no row was found
         """
-        with self.cursor() as cur:
+        with self.cursor(dict_cursor=dict_cursor) as cur:
             cur.execute(sql, params)
             return cur.fetchone()
     
     @with_retry()
     def fetchall(
-        self, sql: str, params: Optional[Sequence[Any]] = None
-    ) -> List[Tuple[Any]]:
+        self, sql: str, params: Optional[Sequence[Any]] = None, *, dict_cursor: bool = False
+    ) -> List[Union[Tuple[Any], Dict[str, Any]]]:
         """
         Fetch all rows from the database.
         
         Args:
             sql: The SQL statement
             params: The parameters for the SQL statement
+            dict_cursor: Whether to return the rows as dictionaries
             
         Returns:
-            List[Dict[str, Any]]: The rows as dictionaries
+            List[Union[Tuple[Any], Dict[str, Any]]]: The rows as tuples, or as
+            dictionaries if dict_cursor is set
         """
-        with self.cursor() as cur:
+        with self.cursor(dict_cursor=dict_cursor) as cur:
             cur.execute(sql, params)
             return cur.fetchall()
     
+    @with_retry()
+    def fetchone_prepared(
+        self,
+        name: str,
+        sql: str,
+        params: Sequence[Any] = (),
+        *,
+        dict_cursor: bool = False,
+    ) -> Optional[Union[Tuple[Any], Dict[str, Any]]]:
+        """
+        Fetch a single row through a named server-side prepared statement.
+        
+        The statement is PREPAREd the first time it runs on a pooled
+        connection and EXECUTEd from then on, so repeated point lookups skip
+        parsing and planning. Falls back to a plain query when
+        statement_cache_size is 0.
+        
+        If the server's statement is missing, already exists, or was planned
+        for an older table definition, it is re-prepared and run again. Inside
+        a session the error is raised instead, after fixing the registry, as
+        recovering needs a rollback.
+        
+        Args:
+            name: The statement name, unique per SQL text
+            sql: The SQL statement, with %s placeholders
+            params: The parameters for the SQL statement
+            dict_cursor: Whether to return the row as a dictionary
+            
+        Returns:
+            Optional[Union[Tuple[Any], Dict[str, Any]]]: The row, or None if no row was found
+        """
+        if not self._cfg.statement_cache_size:
+            return self.fetchone(sql, params, dict_cursor=dict_cursor)
+        
+        in_session = getattr(self._session, "cur", None) is not None
+        with self.cursor(dict_cursor=dict_cursor) as cur:
+            conn = cur.connection
+            with _prepared_lock:
+                prepared = _prepared_statements.setdefault(conn, set())
+            try:
+                return _execute_prepared(cur, prepared, name, sql, params)
+            except (InvalidSqlStatementName, DuplicatePreparedStatement, FeatureNotSupported) as e:
+                # The server's statements no longer match the registry, e.g.
+                # after DISCARD ALL, or the table changed under the cached plan
+                exists = not isinstance(e, InvalidSqlStatementName)
+                if in_session:
+                    # Rolling back would discard the session's other work
+                    if exists:
+                        prepared.add(name)
+                    else:
+                        prepared.discard(name)
+                    raise
+                logger.warning(f"Re-preparing statement {name}: {str(e)}")
+                if not conn.autocommit:
+                    conn.rollback()
+                prepared.discard(name)
+                if exists:
+                    cur.execute(f"DEALLOCATE {name}")
+                return _execute_prepared(cur, prepared, name, sql, params)
+    
+    @with_retry()
+    def fetch_numpy(
+        self,
+        sql: str,
+        params: Optional[Sequence[Any]] = None,
+        columns: Sequence[Tuple[str, Any]] = (),
+        batch_size: int = 10000,
+    ) -> Dict[str, np.ndarray]:
+        """
+        Fetch all rows into one typed NumPy array per column.
+        
+        Rows are pulled in batches and copied into preallocated arrays, so only
+        one batch of Python row tuples is alive at a time.
+        
+        Args:
+            sql: The SQL statement
+            params: The parameters for the SQL statement
+            columns: (name, dtype) pairs, in the order the query returns them
+            batch_size: Number of rows fetched per batch
+            
+        Returns:
+            Dict[str, np.ndarray]: Column name to array of values
+        """
+        with self.cursor() as cur:
+            cur.execute(sql, params)
+            if len(cur.description) != len(columns):
+                raise DatabaseError(
+                    message="Column spec does not match query result",
+                    details={"expected": len(columns), "returned": len(cur.description)}
+                )
+            
+            row_count = max(cur.rowcount, 0)
+            arrays = {name: np.empty(row_count, dtype=dtype) for name, dtype in columns}
+            targets = [arrays[name] for name, _ in columns]
+            
+            offset = 0
+            while True:
+                rows = cur.fetchmany(batch_size)
+                if not rows:
+                    break
+                end = offset + len(rows)
+                for target, values in zip(targets, zip(*rows)):
+                    target[offset:end] = values
+                offset = end
+            return arrays
+    
+    @with_retry()
+    def fetch_df(self, sql: str, params: Optional[Sequence[Any]] = None) -> pd.DataFrame:
+        """
+        Fetch all rows into a pandas DataFrame.
+        
+        Builds the frame straight from tuple rows and the cursor description,
+        without a dict or model object per row.
+        
+        Args:
+            sql: The SQL statement
+            params: The parameters for the SQL statement
+            
+        Returns:
+            pd.DataFrame: The rows, with the query's column names
+        """
+        with self.cursor() as cur:
+            cur.execute(sql, params)
+            columns = [desc[0] for desc in cur.description]
+            return pd.DataFrame.from_records(cur.fetchall(), columns=columns)
+    
+    def stream(
+        self,
+        sql: str,
+        params: Optional[Sequence[Any]] = None,
+        *,
+        batch_size: int = 10000,
+        dict_cursor: bool = False,
+    ) -> Iterator[Union[Tuple[Any], Dict[str, Any]]]:
+        """
+        Iterate over the rows of a query through a server-side cursor.
+        
+        Rows are pulled batch_size at a time, so memory use does not grow with
+        the size of the result as it does with `fetchall`. The connection is
+        held until the iterator is exhausted or closed.
+        
+        Args:
+            sql: The SQL statement
+            params: The parameters for the SQL statement
+            batch_size: Number of rows fetched per network roundtrip
+            dict_cursor: Whether to return the rows as dictionaries
+            
+        Yields:
+            Union[Tuple[Any], Dict[str, Any]]: The rows
+        """
+        conn = self._acquire()
+        try:
+            # A named cursor only lives inside a transaction unless it is WITH HOLD
+            with conn.cursor(
+                name=f"stream_{next(_cursor_ids)}",
+                cursor_factory=RealDictCursor if dict_cursor else None,
+                withhold=conn.autocommit,
+            ) as cur:
+                cur.itersize = batch_size
+                cur.execute(sql, params)
+                yield from cur
+            if not conn.autocommit:
+                conn.commit()
+        except Exception:
+            if not conn.autocommit:
+                conn.rollback()
+            raise
+        finally:
+            self._release(conn)
+    
+    def copy_records(
+        self,
+        table: str,
+        columns: Sequence[str],
+        rows: Sequence[Sequence[Any]],
+        chunk_size: int = 10000,
+    ) -> int:
+        """
+        Bulk load rows into a table with COPY ... FROM STDIN.
+        
+        Rows are streamed as CSV in chunks of chunk_size, all within one
+        transaction, instead of one INSERT round-trip per row. None values are
+        loaded as NULL.
+        
+        Not retried: the event tables have no unique key, so a retry after a
+        commit whose acknowledgement was lost would load the rows twice.
+        
+        Args:
+            table: The target table
+            columns: The target columns, in the order of the row values
+            rows: The rows to load
+            chunk_size: Number of rows sent per COPY
+            
+        Returns:
+            int: Number of rows loaded
+        """
+        sql = f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv, NULL '\\N')"
+        with self.transaction() as cur:
+            _copy_rows(cur, sql, rows, chunk_size)
+        return len(rows)
+    
+    def copy_upsert(
+        self,
+        table: str,
+        columns: Sequence[str],
+        rows: Sequence[Sequence[Any]],
+        conflict_columns: Sequence[str],
+        update_columns: Sequence[str],
+        chunk_size: int = 10000,
+    ) -> int:
+        """
+        Bulk upsert rows into a table through a staging table loaded with COPY.
+        
+        COPY has no ON CONFLICT clause, so the rows are copied into a
+        temporary staging table holding just the target columns and then
+        merged with one INSERT ... SELECT ... ON CONFLICT DO UPDATE. Rows must
+        not repeat a conflict key.
+        
+        Not retried, like every write: the caller decides whether to run the
+        load again. The staging table is dropped on commit, so the connection
+        must not be in autocommit mode.
+        
+        Args:
+            table: The target table
+            columns: The target columns, in the order of the row values
+            rows: The rows to load
+            conflict_columns: The columns of the unique constraint to upsert on
+            update_columns: The columns overwritten when a row already exists
+            chunk_size: Number of rows sent per COPY
+            
+        Returns:
+            int: Number of rows inserted or updated
+        """
+        # pg_temp keeps the name from ever resolving to a permanent table
+        staging = f"pg_temp.{table}_staging"
+        column_str = ', '.join(columns)
+        set_clause = ', '.join(f"{col} = EXCLUDED.{col}" for col in update_columns)
+        with self.transaction() as cur:
+            # Created per load since the column list varies between callers, and
+            # gone at commit or rollback even if the load fails part way
+            cur.execute(
+                f"CREATE TEMP TABLE {staging} ON COMMIT DROP AS SELECT {column_str} FROM {table} WITH NO DATA"
+            )
+            _copy_rows(
+                cur,
+                f"COPY {staging} ({column_str}) FROM STDIN WITH (FORMAT csv, NULL '\\N')",
+                rows,
+                chunk_size,
+            )
+            cur.execute(f"""
+            INSERT INTO {table} ({column_str})
+            SELECT {column_str} FROM {staging}
+            ON CONFLICT ({', '.join(conflict_columns)})
+            DO UPDATE SET {set_clause}
+            """)
+            # Rows inserted or updated, counted by the server without RETURNING
+            upserted = cur.rowcount
+            # Inside a session the transaction goes on, and a later load may
+            # create the same staging table
+            cur.execute(f"DROP TABLE {staging}")
+        return upserted
+    
     @contextmanager
     def transaction(self):
         """
         Context manager for transactions.
         
+        Inside a `session()` the statements become part of the session's
+        transaction, which commits at the end of the session.
+        
         Yields:
             Cursor: A database cursor
         """
+        session_cur = getattr(self._session, "cur", None)
+        if session_cur is not None:
+            yield session_cur
+            return
+        
         conn = self._acquire()
         try:
             with conn.cursor() as cur:
@@ -265,24 +967,141 @@ class Database:
             self._release(conn)
     
     def close(self):
-        """Close all connections in the pool."""
-        if hasattr(self, '_pool'):
-            self._pool.closeall()
+        """
+        Release this instance's use of the shared pool.
+        
+        The pool, and its connections, are closed once no other Database with
+        the same configuration uses it.
+        """
+        with self._health_lock:
+            self._reset_health_conn()
+        if hasattr(self, '_pool') and not self._closed:
+            self._closed = True
+            _detach_pool(self._cfg)
+    
+    def _reset_health_conn(self) -> None:
+        """Close the health check connection so the next check reconnects."""
+        conn, self._health_conn, self._health_cur = self._health_conn, None, None
+        if conn is not None:
+            try:
+                conn.close()
+            except psycopg2.Error:
+                pass
     
     def health_check(self) -> bool:
         """
         Check if the database is healthy.
         
+        Reuses one long-lived autocommit connection and cursor, so a probe is a
+        single round-trip without a pool checkout, cursor allocation, retry
+        wrapping or BEGIN/COMMIT. The connection is reopened after a failure,
+        e.g. when the server restarted.
+        
         Returns:
             bool: True if the database is healthy, False otherwise
         """
-        try:
-            result = self.fetchone("SELECT current_user, current_role")
-            logger.info(f'db health result: {str(result)}')
-            return result is not None
-        except Exception as e:
-            logger.error(f"Database health check failed: {str(e)}")
-            return False
+        with self._health_lock:
+            try:
+                if self._health_cur is None:
+                    conn = psycopg2.connect(**self._cfg.connect_kwargs())
+                    conn.autocommit = True
+                    self._health_conn, self._health_cur = conn, conn.cursor()
+                self._health_cur.execute(self._health_stmt)
+                result = self._health_cur.fetchone()
+                return result is not None and result[0] == 1
+            except Exception as e:
+                logger.error(f"Database health check failed: {str(e)}")
+                self._reset_health_conn()
+                return False
+
+
+def _copy_rows(cur, sql: str, rows: Sequence[Sequence[Any]], chunk_size: int) -> None:
+    """
+    Stream rows through a COPY ... FROM STDIN statement as CSV, in chunks.
+    
+    Args:
+        cur: The cursor to copy with
+        sql: The COPY statement, expecting CSV with \\N as NULL
+        rows: The rows to send
+        chunk_size: Number of rows sent per COPY
+    """
+    for start in range(0, len(rows), chunk_size):
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for row in rows[start:start + chunk_size]:
+            writer.writerow([_COPY_NULL if value is None else value for value in row])
+        buffer.seek(0)
+        cur.copy_expert(sql, buffer)
+
+
+def _execute_prepared(cur, prepared: set, name: str, sql: str, params: Sequence[Any]) -> Any:
+    """
+    Run a named prepared statement, PREPAREing it first if needed.
+    
+    Args:
+        cur: The cursor to run it on
+        prepared: Names already prepared on the cursor's connection
+        name: The statement name
+        sql: The SQL statement, with %s placeholders
+        params: The parameters for the SQL statement
+        
+    Returns:
+        The first row, or None
+    """
+    if name not in prepared:
+        if params:
+            # %s become $1, $2, ...; %% is a literal %, as in cursor.execute
+            positions = itertools.count(1)
+            sql = _PLACEHOLDER.sub(lambda m: "%" if m.group() == "%%" else f"${next(positions)}", sql)
+        cur.execute(f"PREPARE {name} AS {sql}")
+        prepared.add(name)
+    if params:
+        cur.execute(f"EXECUTE {name} ({', '.join(['%s'] * len(params))})", params)
+    else:
+        cur.execute(f"EXECUTE {name}")
+    return cur.fetchone()
+
+
+def _forget_prepared(conn) -> None:
+    """Drop the prepared statement names recorded for a discarded connection."""
+    with _prepared_lock:
+        _prepared_statements.pop(conn, None)
+
+
+def _ping(conn) -> bool:
+    """
+    Check that an idle pooled connection still reaches the server.
+    
+    Args:
+        conn: The connection to check
+        
+    Returns:
+        bool: True if the connection answered, False otherwise
+    """
+    try:
+        conn.autocommit = True
+        with conn.cursor() as cur:
+            cur.execute("SELECT 1")
+        return True
+    except psycopg2.Error:
+        return False
+
+
+def _percentile(samples, q: float) -> float:
+    """
+    Get the q-th quantile of a sequence of samples (0.0 if empty).
+    
+    Args:
+        samples: The samples
+        q: The quantile, between 0 and 1
+        
+    Returns:
+        float: The sample at that quantile
+    """
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    return ordered[int(q * (len(ordered) - 1))]
 
 
 # Global database instance
@@ -310,6 +1129,14 @@ def init_db(cfg: DBConfig) -> Database:
     return _db
 
 
+def close_db() -> None:
+    """Close the global database instance, if any."""
+    global _db
+    if _db is not None:
+        _db.close()
+        _db = None
+
+
 def get_db() -> Database:
     """
     Get the global database instance.
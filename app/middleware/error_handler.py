@@ -3,73 +3,90 @@ Error handling middleware for the FastAPI application.
 """
 import logging
 import traceback
-from typing import Callable
 
-from fastapi import FastAPI, Request, Response
-from fastapi.responses import JSONResponse
-from starlette.middleware.base import BaseHTTPMiddleware
+import orjson
+from fastapi import FastAPI, Response
+from fastapi.responses import ORJSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from app.core.exceptions import BaseAppException
 
 logger = logging.getLogger(__name__)
 
+# Encoded once; only the message is encoded per unhandled exception
+_INTERNAL_ERROR_PREFIX = b'{"error":"Internal server error","status_code":500,"details":{"message":'
 
-class ErrorHandlerMiddleware(BaseHTTPMiddleware):
+
+class ErrorHandlerMiddleware:
     """
     Middleware for handling exceptions and returning standardized error responses.
+    
+    Implemented as a plain ASGI middleware rather than on BaseHTTPMiddleware,
+    which runs every request through an extra task group and response stream.
     """
     
-    def __init__(self, app: FastAPI):
-        super().__init__(app)
+    def __init__(self, app: ASGIApp):
+        self.app = app
     
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """
         Process the request and handle any exceptions.
         
         Args:
-            request: The incoming request
-            call_next: The next middleware or route handler
-            
-        Returns:
-            Response: The API response
+            scope: The ASGI connection scope
+            receive: The ASGI receive channel
+            send: The ASGI send channel
         """
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        response_started = False
+        
+        async def send_wrapper(message: Message) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+        
         try:
-            return await call_next(request)
+            await self.app(scope, receive, send_wrapper)
         
         except BaseAppException as exc:
+            if response_started:
+                raise
             # Handle our custom exceptions
             logger.error(
                 f"Application error: {exc.message}",
                 extra={
                     "status_code": exc.status_code,
                     "details": exc.details,
-                    "path": request.url.path
+                    "path": scope["path"]
                 }
             )
-            return JSONResponse(
+            response = ORJSONResponse(
                 status_code=exc.status_code,
                 content=exc.to_dict()
             )
+            await response(scope, receive, send)
         
         except Exception as exc:
-            # Handle unexpected exceptions
-            logger.error(
-                f"Unhandled exception: {str(exc)}",
-                extra={
-                    "path": request.url.path,
-                    "traceback": traceback.format_exc()
-                }
-            )
+            if response_started:
+                raise
+            # Handle unexpected exceptions; formatting the traceback is only
+            # worth its cost when debug logging is on
+            extra = {"path": scope["path"]}
+            if logger.isEnabledFor(logging.DEBUG):
+                extra["traceback"] = traceback.format_exc()
+            logger.error(f"Unhandled exception: {str(exc)}", extra=extra)
             
             # Return a generic error response
-            return JSONResponse(
+            response = Response(
+                content=_INTERNAL_ERROR_PREFIX + orjson.dumps(str(exc)) + b"}}",
                 status_code=500,
-                content={
-                    "error": "Internal server error",
-                    "status_code": 500,
-                    "details": {"message": str(exc)}
-                }
+                media_type="application/json"
             )
+            await response(scope, receive, send)
 
 
 def add_error_handler(app: FastAPI) -> None:
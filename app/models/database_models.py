@@ -2,13 +2,32 @@
 Database model definitions for all tables used in the application.
 """
 from datetime import date, datetime
-from decimal import Decimal
-from typing import Optional
-
-from pydantic import BaseModel, Field
-
-
-class UserClaimLocked(BaseModel):
+from typing import Any, ClassVar, Optional, Tuple
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class DatabaseModel(BaseModel):
+    """Base model for table rows; also accepts objects with matching attributes."""
+    model_config = ConfigDict(from_attributes=True)
+    # Integer fields stored in NUMERIC columns, read back as numeric(78,0)
+    numeric_int_fields: ClassVar[Tuple[str, ...]] = ()
+    
+    @classmethod
+    def from_row(cls, row: Any) -> "DatabaseModel":
+        """
+        Build a model from a lightweight row object, e.g. one from `db_rows`.
+        
+        Args:
+            row: An object with attributes named after the model's fields
+        
+        Returns:
+            The validated model
+        """
+        return cls.model_validate(row)
+
+
+class UserClaimLocked(DatabaseModel):
     """Model for user_claim_locked table."""
     id: Optional[int] = Field(None, description="Primary key")
     timestamp: datetime = Field(..., description="Event timestamp")
@@ -19,7 +38,7 @@ class UserClaimLocked(BaseModel):
     claim_lock_start: int = Field(..., description="ClaimLockStart")
     claim_lock_end: int = Field(..., description="ClaimLockEnd")
 
-class UserMultiplier(BaseModel):
+class UserMultiplier(DatabaseModel):
     """Model for user_multiplier table."""
     id: Optional[int] = Field(None, description="Primary key")
     user_claim_locked_start: int = Field(..., description="Reference to user_claim_locked table")
@@ -29,33 +48,34 @@ class UserMultiplier(BaseModel):
     block_number: int = Field(..., description="Block number")
     pool_id: int = Field(..., description="Pool ID")
     user_address: str = Field(..., description="User address")
-    multiplier: Optional[Decimal] = Field(None, description="User multiplier")
+    multiplier: Optional[int] = Field(None, description="User multiplier (scaled by 1e18)")
+    numeric_int_fields: ClassVar[Tuple[str, ...]] = ("multiplier",)
 
 
-class RewardSummary(BaseModel):
+class RewardSummary(DatabaseModel):
     """Model for reward_summary table."""
     id: Optional[int] = Field(None, description="Primary key")
     timestamp: datetime = Field(..., description="Event timestamp")
     calculation_block_current: int = Field(..., description="Current block used for calculation")
     calculation_block_past: int = Field(..., description="Past block used for calculation")
-    daily_pool_reward_0: Decimal = Field(..., description="Daily reward Pool 0")
-    daily_pool_reward_1: Decimal = Field(..., description="Daily reward Pool 1")
-    daily_reward: Decimal = Field(..., description="Daily reward Total")
-    total_reward_pool_0: Decimal = Field(..., description="Total reward Pool 0")
-    total_reward_pool_1: Decimal = Field(..., description="Total reward Pool 1")
-    total_reward: Decimal = Field(..., description="Total reward")
+    daily_pool_reward_0: float = Field(..., description="Daily reward Pool 0")
+    daily_pool_reward_1: float = Field(..., description="Daily reward Pool 1")
+    daily_reward: float = Field(..., description="Daily reward Total")
+    total_reward_pool_0: float = Field(..., description="Total reward Pool 0")
+    total_reward_pool_1: float = Field(..., description="Total reward Pool 1")
+    total_reward: float = Field(..., description="Total reward")
 
 
-class CirculatingSupply(BaseModel):
+class CirculatingSupply(DatabaseModel):
     """Model for circulating_supply table."""
     id: Optional[int] = Field(None, description="Primary key")
     date: datetime = Field(..., description="Date")
-    circulating_supply_at_that_date: Decimal = Field(..., description="Circulating supply at that date")
+    circulating_supply_at_that_date: float = Field(..., description="Circulating supply at that date")
     block_timestamp_at_that_date: int = Field(..., description="Block timestamp at that date")
-    total_claimed_that_day: Decimal = Field(..., description="Total claimed that day")
+    total_claimed_that_day: float = Field(..., description="Total claimed that day")
 
 
-class UserStakedEvent(BaseModel):
+class UserStakedEvent(DatabaseModel):
     """Model for user_staked_events table."""
     id: Optional[int] = Field(None, description="Primary key")
     timestamp: datetime = Field(..., description="Event timestamp")
@@ -64,9 +84,10 @@ class UserStakedEvent(BaseModel):
     pool_id: int = Field(..., description="Pool ID")
     user_address: str = Field(..., description="User address")
     amount: int = Field(..., description="Amount staked")
+    numeric_int_fields: ClassVar[Tuple[str, ...]] = ("amount",)
 
 
-class UserWithdrawnEvent(BaseModel):
+class UserWithdrawnEvent(DatabaseModel):
     """Model for user_withdrawn_events table."""
     id: Optional[int] = Field(None, description="Primary key")
     timestamp: datetime = Field(..., description="Event timestamp")
@@ -74,28 +95,30 @@ class UserWithdrawnEvent(BaseModel):
     block_number: int = Field(..., description="Block number")
     pool_id: int = Field(..., description="Pool ID")
     user_address: str = Field(..., description="User address")
-    amount: Decimal = Field(..., description="Amount withdrawn")
+    amount: int = Field(..., description="Amount withdrawn (wei)")
+    numeric_int_fields: ClassVar[Tuple[str, ...]] = ("amount",)
 
 
-class OverplusBridgedEvent(BaseModel):
+class OverplusBridgedEvent(DatabaseModel):
     """Model for overplus_bridged_events table."""
     id: Optional[int] = Field(None, description="Primary key")
     timestamp: datetime = Field(..., description="Event timestamp")
     transaction_hash: str = Field(..., description="Transaction hash")
     block_number: int = Field(..., description="Block number")
-    amount: Decimal = Field(..., description="Amount bridged")
+    amount: int = Field(..., description="Amount bridged (wei)")
     unique_id: str = Field(..., description="Unique ID")
+    numeric_int_fields: ClassVar[Tuple[str, ...]] = ("amount",)
 
 
-class Emission(BaseModel):
+class Emission(DatabaseModel):
     """Model for emissions table."""
     id: Optional[int] = Field(None, description="Primary key")
     day: int = Field(..., description="Day number")
     date: datetime = Field(..., description="Date of emission")
-    capital_emission: Decimal = Field(..., description="Capital emission amount")
-    code_emission: Decimal = Field(..., description="Code emission amount")
-    compute_emission: Decimal = Field(..., description="Compute emission amount")
-    community_emission: Decimal = Field(..., description="Community emission amount")
-    protection_emission: Decimal = Field(..., description="Protection emission amount")
-    total_emission: Decimal = Field(..., description="Total emission amount")
-    total_supply: Decimal = Field(..., description="Total supply at this date")
\ No newline at end of file
+    capital_emission: float = Field(..., description="Capital emission amount")
+    code_emission: float = Field(..., description="Code emission amount")
+    compute_emission: float = Field(..., description="Compute emission amount")
+    community_emission: float = Field(..., description="Community emission amount")
+    protection_emission: float = Field(..., description="Protection emission amount")
+    total_emission: float = Field(..., description="Total emission amount")
+    total_supply: float = Field(..., description="Total supply at this date")
\ No newline at end of file
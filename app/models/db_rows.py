@@ -0,0 +1,50 @@
+"""
+Lightweight row types for internal bulk work.
+
+These are slotted, frozen dataclasses: much smaller and faster to build than
+the Pydantic models in `database_models`, which are kept for the API and for
+validating data on its way into the database. orjson serializes them natively,
+so read-only rows can go to a JSON response without a model in between. Field order matches the column
+order used by `row_columns`, so a row can be built straight from a tuple.
+"""
+from dataclasses import dataclass, fields
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Tuple, Type
+
+
+@lru_cache(maxsize=None)
+def row_columns(row_class: Type) -> Tuple[str, ...]:
+    """
+    Get the column names of a row type, in field order.
+    
+    Args:
+        row_class: The row dataclass
+    
+    Returns:
+        Tuple[str, ...]: The column names
+    """
+    return tuple(field.name for field in fields(row_class))
+
+
+@dataclass(slots=True, frozen=True)
+class UserClaimLockedRow:
+    """Row of the user_claim_locked table."""
+    id: int
+    timestamp: datetime
+    transaction_hash: str
+    block_number: int
+    pool_id: int
+    user_address: str
+    claim_lock_start: int
+    claim_lock_end: int
+
+
+@dataclass(slots=True, frozen=True)
+class CirculatingSupplyRow:
+    """Row of the circulating_supply table."""
+    id: int
+    date: date
+    circulating_supply_at_that_date: float
+    block_timestamp_at_that_date: int
+    total_claimed_that_day: float
@@ -4,14 +4,18 @@ Standardized API response models.
 from datetime import datetime
 from typing import Any, Dict, Generic, List, Optional, TypeVar, Union
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 # Type variable for the data field in responses
 T = TypeVar('T')
 
+# Schemas are built on first use rather than at import time
+RESPONSE_MODEL_CONFIG = ConfigDict(defer_build=True)
+
 
 class ErrorDetail(BaseModel):
     """Model for error details."""
+    model_config = RESPONSE_MODEL_CONFIG
     message: str = Field(..., description="Error message")
     code: Optional[str] = Field(None, description="Error code")
     field: Optional[str] = Field(None, description="Field with error")
@@ -19,6 +23,7 @@ class ErrorDetail(BaseModel):
 
 class ErrorResponse(BaseModel):
     """Standard error response model."""
+    model_config = RESPONSE_MODEL_CONFIG
     error: str = Field(..., description="Error message")
     status_code: int = Field(..., description="HTTP status code")
     details: Optional[Dict[str, Any]] = Field(None, description="Additional error details")
@@ -28,13 +33,15 @@ class ErrorResponse(BaseModel):
 
 class MetaData(BaseModel):
     """Metadata for paginated responses."""
+    model_config = RESPONSE_MODEL_CONFIG
     page: int = Field(..., description="Current page number")
     page_size: int = Field(..., description="Number of items per page")
     total_items: int = Field(..., description="Total number of items")
     total_pages: int = Field(..., description="Total number of pages")
 
-class BaseResponse(BaseModel, Generic[T]):
+class BaseResponse(BaseModel):
     """Base response model for all API responses."""
+    model_config = RESPONSE_MODEL_CONFIG
     success: bool = Field(True, description="Whether the request was successful")
     timestamp: datetime = Field(default_factory=datetime.now, description="Response timestamp")
 
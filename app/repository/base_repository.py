@@ -1,18 +1,105 @@
 """
 Base repository class with common CRUD operations.
 """
-from typing import Any, Dict, Generic, List, Optional, Type, TypeVar
+from operator import attrgetter
+from typing import Any, Callable, Dict, Generic, List, Optional, Sequence, Tuple, Type, TypeVar
 
+import pandas as pd
 from pydantic import BaseModel
 
+from app.cache.cache_manager import get_query_result, invalidate_table, query_cache_key, set_query_result
+from app.db.async_database import AsyncDatabase, get_async_db
 from app.db.database import get_db
 
 # Type variable for the model
 T = TypeVar('T', bound=BaseModel)
 
+# Postgres accepts at most this many bind parameters in one statement
+MAX_STATEMENT_PARAMS = 65535
+
+# Upserts of more rows than this go through COPY and a staging table
+COPY_UPSERT_THRESHOLD = 500
+
+# Sentinel for results missing from the query cache
+_MISSING = object()
+
+
+def select_list(model_class: Type[BaseModel], alias: str = "") -> str:
+    """
+    Build the SELECT list of a model's columns, each read back as one type.
+    
+    NUMERIC columns are cast so the driver returns the model's type for every
+    row: float fields as float8, integer fields listed in the model's
+    `numeric_int_fields` as numeric(78,0).
+    
+    Args:
+        model_class: The Pydantic model class
+        alias: Optional table alias to qualify the columns with
+        
+    Returns:
+        str: The comma-separated SELECT list
+    """
+    prefix = f"{alias}." if alias else ""
+    int_fields = getattr(model_class, "numeric_int_fields", ())
+    columns = []
+    for name, field in model_class.model_fields.items():
+        if field.annotation in (float, Optional[float]):
+            columns.append(f"{prefix}{name}::float8 AS {name}")
+        elif name in int_fields:
+            columns.append(f"{prefix}{name}::numeric(78, 0) AS {name}")
+        else:
+            columns.append(f"{prefix}{name}")
+    return ', '.join(columns)
+
+
+def row_getter(columns: Sequence[str]) -> Callable[[Any], Tuple[Any, ...]]:
+    """
+    Build a function returning the given attributes of a record as a tuple.
+    
+    Uses `operator.attrgetter`, which reads all the attributes in C, instead
+    of a Python-level generator per record.
+    
+    Args:
+        columns: The attribute names
+        
+    Returns:
+        Callable[[Any], Tuple[Any, ...]]: The getter
+    """
+    getter = attrgetter(*columns)
+    if len(columns) == 1:
+        # attrgetter returns a bare value rather than a tuple for one name
+        return lambda record: (getter(record),)
+    return getter
+
+
+def _copy_result(value: Any) -> Any:
+    """
+    Copy a query result down to its scalar values.
+    
+    Dict rows (and jsonb values decoded into dicts or lists) become new plain
+    dicts and lists; tuple rows and scalars are immutable and kept as they are.
+    
+    Args:
+        value: The query result
+        
+    Returns:
+        A copy sharing no mutable objects with value
+    """
+    if isinstance(value, dict):
+        return {k: _copy_result(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_copy_result(v) for v in value]
+    return value
+
 
 class BaseRepository(Generic[T]):
-    """Base repository with common CRUD operations."""
+    """
+    Base repository with common CRUD operations.
+    
+    Rows read back from Postgres are already typed by the driver, so models
+    are built from them with `model_construct`, skipping validation. Data on
+    its way into the database is still validated by the models.
+    """
 
     def __init__(self, model_class: Type[T], table_name: str):
         """
@@ -25,6 +112,58 @@ class BaseRepository(Generic[T]):
         self.model_class = model_class
         self.table_name = table_name
         self.db = get_db()
+        # Model columns, cast to the model's types; used instead of SELECT *
+        self._select_list = select_list(model_class)
+        # Insertable columns, in model field order; built once per repository
+        self._columns = tuple(name for name in model_class.model_fields if name != 'id')
+        self._row_template = f"({', '.join(['%s'] * len(self._columns))})"
+        self._row_values = row_getter(self._columns)
+        # UPDATE statements built by update(), keyed by their column list
+        self._update_sql: Dict[Tuple[str, ...], str] = {}
+        # Statements of the generic methods below, built once
+        self._by_id_query = (f"{table_name}_by_id", f"SELECT {self._select_list} FROM {table_name} WHERE id = %s")
+        self._by_ids_sql = f"SELECT {self._select_list} FROM {table_name} WHERE id = ANY(%s)"
+        self._all_sql = f"SELECT {self._select_list} FROM {table_name} ORDER BY id LIMIT %s OFFSET %s"
+        self._all_df_sql = f"SELECT {self._select_list} FROM {table_name} ORDER BY id LIMIT %s OFFSET %s"
+        self._delete_sql = f"DELETE FROM {table_name} WHERE id = %s"
+        self._count_sql = f"SELECT COUNT(*) FROM {table_name}"
+
+    @property
+    def adb(self) -> AsyncDatabase:
+        """
+        Get the native async database, for reads made from the event loop.
+        
+        Returns:
+            AsyncDatabase: The async database instance
+        """
+        return get_async_db()
+
+    def _cached_read(self, fetch: Callable[..., Any], sql: str, params: Sequence[Any] = (), **kwargs: Any) -> Any:
+        """
+        Run a read through the query result cache.
+        
+        Results are cached per query and parameters for the query cache TTL,
+        and dropped early when this process writes to the table through the
+        repository. Writes from other processes, such as the update scripts,
+        only show up once the TTL has expired. Every caller gets its own copy
+        of the rows, so modifying a result does not change the cached one.
+        
+        Args:
+            fetch: The Database method running the query, e.g. `self.db.fetchall`
+            sql: The SQL statement
+            params: The parameters for the SQL statement
+            **kwargs: Keyword arguments for fetch
+            
+        Returns:
+            The result of fetch, possibly from the cache
+        """
+        key = query_cache_key(self.table_name, (fetch.__name__, sql, tuple(params), tuple(kwargs.items())))
+        result = get_query_result(key, _MISSING)
+        if result is _MISSING:
+            result = fetch(sql, params, **kwargs)
+            set_query_result(key, _copy_result(result))
+            return result
+        return _copy_result(result)
 
     def create(self, data: T) -> T:
         """
@@ -36,38 +175,24 @@ class BaseRepository(Generic[T]):
         Returns:
             The created record
         """
-        # Convert model to dict, excluding None values and id if it's None
-        data_dict = data.model_dump(exclude_none=True)
-        if 'id' in data_dict and data_dict['id'] is None:
-            del data_dict['id']
-
-        # Build the SQL query
-        columns = ', '.join(data_dict.keys())
-        placeholders = ', '.join(['%s'] * len(data_dict))
-        values = list(data_dict.values())
+        # Read the set columns straight off the model, skipping None values
+        columns = [col for col in self.model_class.model_fields if getattr(data, col) is not None]
+        values = [getattr(data, col) for col in columns]
+        placeholders = ', '.join(['%s'] * len(columns))
+        columns = ', '.join(columns)
 
         sql = f"""
         INSERT INTO {self.table_name} ({columns})
         VALUES ({placeholders})
-        RETURNING *
+        RETURNING {self._select_list}
         """
 
-        # Execute the query directly with a cursor to get column names
-        with self.db.cursor() as cur:
+        # Not retried, so a lost connection cannot apply the write twice
+        with self.db.cursor(dict_cursor=True) as cur:
             cur.execute(sql, values)
-            
-            # Get column names from cursor description
-            columns = [desc[0] for desc in cur.description]
-            
-            # Fetch the result
             result = cur.fetchone()
-            
-            if result:
-                # Convert tuple to dictionary using column names
-                dict_result = dict(zip(columns, result))
-                return self.model_class(**dict_result)
-            else:
-                return None
+        invalidate_table(self.table_name)
+        return self.model_class.model_construct(**result) if result else None
 
     def get_by_id(self, id: int) -> Optional[T]:
         """
@@ -79,24 +204,29 @@ class BaseRepository(Generic[T]):
         Returns:
             The record, or None if not found
         """
-        sql = f"SELECT * FROM {self.table_name} WHERE id = %s"
+        result = self.db.fetchone_prepared(*self._by_id_query, [id], dict_cursor=True)
+        return self.model_class.model_construct(**result) if result else None
+
+    def get_by_ids(self, ids: Sequence[int]) -> List[T]:
+        """
+        Get several records by ID in one query.
         
-        # Execute the query directly with a cursor to get column names
-        with self.db.cursor() as cur:
-            cur.execute(sql, [id])
-            
-            # Get column names from cursor description
-            columns = [desc[0] for desc in cur.description]
-            
-            # Fetch the result
-            result = cur.fetchone()
+        The batched counterpart of `get_by_id`, for callers that would
+        otherwise look records up one at a time. The IDs are bound as a single
+        array parameter, so the statement text does not depend on their number.
+        
+        Args:
+            ids: The record IDs
             
-            if result:
-                # Convert tuple to dictionary using column names
-                dict_result = dict(zip(columns, result))
-                return self.model_class(**dict_result)
-            else:
-                return None
+        Returns:
+            The records found, in the order of ids
+        """
+        if not ids:
+            return []
+        
+        results = self.db.fetchall(self._by_ids_sql, [list(ids)], dict_cursor=True)
+        by_id = {result['id']: self.model_class.model_construct(**result) for result in results}
+        return [by_id[id] for id in ids if id in by_id]
 
     def get_all(self, limit: int = 100, offset: int = 0) -> List[T]:
         """
@@ -109,26 +239,98 @@ class BaseRepository(Generic[T]):
         Returns:
             List of records
         """
-        sql = f"SELECT * FROM {self.table_name} ORDER BY id LIMIT %s OFFSET %s"
+        results = self.db.fetchall(self._all_sql, [limit, offset], dict_cursor=True)
+        return [self.model_class.model_construct(**result) for result in results]
+
+    def get_all_df(self, limit: int = 100, offset: int = 0) -> pd.DataFrame:
+        """
+        Get all records with pagination as a DataFrame.
         
-        # Execute the query directly with a cursor to get column names
-        with self.db.cursor() as cur:
-            cur.execute(sql, [limit, offset])
+        Rows go straight from the cursor into columns without a model object
+        or dict per row. Only the model's fields are selected, so the frame has
+        the same columns as one built from `model_dump()` of each record.
+        
+        Args:
+            limit: Maximum number of records to return
+            offset: Number of records to skip
             
-            # Get column names from cursor description
-            columns = [desc[0] for desc in cur.description]
+        Returns:
+            DataFrame of records
+        """
+        return self.db.fetch_df(self._all_df_sql, [limit, offset])
+
+    def get_daily_totals_df(self, value_column: str = "amount", timestamp_column: str = "timestamp") -> pd.DataFrame:
+        """
+        Get the per-day sum of a column as a DataFrame.
+        
+        The aggregation runs in the database, so only one row per day is
+        transferred instead of every record.
+        
+        Args:
+            value_column: The column to sum
+            timestamp_column: The column whose date the rows are grouped by
             
-            # Fetch all results
-            results = cur.fetchall()
+        Returns:
+            DataFrame with `date` and `value_column` columns, ordered by date
+        """
+        sql = f"""
+        SELECT {timestamp_column}::date AS date, SUM({value_column})::float8 AS {value_column}
+        FROM {self.table_name}
+        GROUP BY 1
+        ORDER BY 1
+        """
+        return self.db.fetch_df(sql)
+
+    async def get_by_id_async(self, id: int) -> Optional[T]:
+        """
+        Get a record by ID without blocking the event loop.
+        
+        Args:
+            id: The record ID
             
-            # Convert tuples to dictionaries using column names
-            dict_results = []
-            for result in results:
-                dict_result = dict(zip(columns, result))
-                dict_results.append(dict_result)
+        Returns:
+            The record, or None if not found
+        """
+        result = await self.adb.fetchone(self._by_id_query[1], [id], dict_cursor=True, prepare=True)
+        return self.model_class.model_construct(**result) if result else None
+
+    async def get_all_async(self, limit: int = 100, offset: int = 0) -> List[T]:
+        """
+        Get all records with pagination without blocking the event loop.
+        
+        Args:
+            limit: Maximum number of records to return
+            offset: Number of records to skip
+            
+        Returns:
+            List of records
+        """
+        results = await self.adb.fetchall(self._all_sql, [limit, offset], dict_cursor=True)
+        return [self.model_class.model_construct(**result) for result in results]
+
+    def bulk_insert(self, records: List[T]) -> int:
+        """
+        Insert multiple records at once using COPY.
+        
+        Columns are taken from the first record, excluding None values and id.
+        
+        Args:
+            records: List of records to insert
             
-            # Create model instances from dictionaries
-            return [self.model_class(**dict_result) for dict_result in dict_results]
+        Returns:
+            Number of records inserted
+        """
+        if not records:
+            return 0
+
+        # Columns the first record sets, so unset ones keep their defaults
+        sample = records[0]
+        columns = [col for col in self._columns if getattr(sample, col) is not None]
+
+        rows = list(map(row_getter(columns), records))
+        inserted = self.db.copy_records(self.table_name, columns, rows)
+        invalidate_table(self.table_name)
+        return inserted
 
     def update(self, id: int, data: Dict[str, Any]) -> Optional[T]:
         """
@@ -140,39 +342,37 @@ class BaseRepository(Generic[T]):
             
         Returns:
             The updated record, or None if not found
+            
+        Raises:
+            ValueError: If data names a column the model does not have
         """
         # Remove None values and id from the data
         update_data = {k: v for k, v in data.items() if v is not None and k != 'id'}
         if not update_data:
             return self.get_by_id(id)
 
-        # Build the SQL query
-        set_clause = ', '.join([f"{k} = %s" for k in update_data.keys()])
-        values = list(update_data.values()) + [id]
+        # Statements are cached per column list; keys must be model columns,
+        # as they are interpolated into the SQL
+        columns = tuple(update_data)
+        sql = self._update_sql.get(columns)
+        if sql is None:
+            unknown = set(columns).difference(self._columns)
+            if unknown:
+                raise ValueError(f"Unknown columns for {self.table_name}: {', '.join(sorted(unknown))}")
+            set_clause = ', '.join(f"{col} = %s" for col in columns)
+            sql = self._update_sql[columns] = f"""
+            UPDATE {self.table_name}
+            SET {set_clause}
+            WHERE id = %s
+            RETURNING {self._select_list}
+            """
 
-        sql = f"""
-        UPDATE {self.table_name}
-        SET {set_clause}
-        WHERE id = %s
-        RETURNING *
-        """
-
-        # Execute the query directly with a cursor to get column names
-        with self.db.cursor() as cur:
-            cur.execute(sql, values)
-            
-            # Get column names from cursor description
-            columns = [desc[0] for desc in cur.description]
-            
-            # Fetch the result
+        # Not retried, so a lost connection cannot apply the write twice
+        with self.db.cursor(dict_cursor=True) as cur:
+            cur.execute(sql, (*update_data.values(), id))
             result = cur.fetchone()
-            
-            if result:
-                # Convert tuple to dictionary using column names
-                dict_result = dict(zip(columns, result))
-                return self.model_class(**dict_result)
-            else:
-                return None
+        invalidate_table(self.table_name)
+        return self.model_class.model_construct(**result) if result else None
 
     def delete(self, id: int) -> bool:
         """
@@ -184,13 +384,13 @@ class BaseRepository(Generic[T]):
         Returns:
             True if the record was deleted, False otherwise
         """
-        sql = f"DELETE FROM {self.table_name} WHERE id = %s RETURNING id"
-        
-        # Execute the query directly with a cursor
+        # The affected row count says whether the row existed; nothing needs
+        # to come back from the server
         with self.db.cursor() as cur:
-            cur.execute(sql, [id])
-            result = cur.fetchone()
-            return result is not None
+            cur.execute(self._delete_sql, [id])
+            deleted = cur.rowcount > 0
+        invalidate_table(self.table_name)
+        return deleted
 
     def count(self) -> int:
         """
@@ -199,15 +399,5 @@ class BaseRepository(Generic[T]):
         Returns:
             The number of records
         """
-        sql = f"SELECT COUNT(*) as count FROM {self.table_name}"
-        
-        # Execute the query directly with a cursor
-        with self.db.cursor() as cur:
-            cur.execute(sql)
-            result = cur.fetchone()
-            
-            if result:
-                # Since we're using a tuple, get the first element
-                return result[0]
-            else:
-                return 0
\ No newline at end of file
+        result = self.db.fetchone(self._count_sql)
+        return result[0] if result else 0
\ No newline at end of file
@@ -1,12 +1,41 @@
 """
 Repository for circulating_supply table.
 """
+import re
 from datetime import date, datetime, timedelta
-from decimal import Decimal
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from psycopg2.extras import execute_values
 
 from app.models.database_models import CirculatingSupply
-from app.repository.base_repository import BaseRepository
+from app.models.db_rows import CirculatingSupplyRow, row_columns
+from app.repository.base_repository import COPY_UPSERT_THRESHOLD, MAX_STATEMENT_PARAMS, BaseRepository
+
+# Day/month/year dates as written by the supply scripts, e.g. 31/01/2024
+_DMY_DATE = re.compile(r"(\d{1,2})/(\d{1,2})/(\d{4})")
+
+
+def parse_dmy_date(value: str) -> date:
+    """
+    Parse a DD/MM/YYYY date string.
+    
+    Equivalent to `datetime.strptime(value, '%d/%m/%Y').date()` without
+    strptime's per-call format parsing and locale handling.
+    
+    Args:
+        value: The date string
+        
+    Returns:
+        date: The parsed date
+        
+    Raises:
+        ValueError: If the string is not a valid DD/MM/YYYY date
+    """
+    match = _DMY_DATE.fullmatch(value)
+    if match is None:
+        raise ValueError(f"time data {value!r} does not match format '%d/%m/%Y'")
+    day, month, year = match.groups()
+    return date(int(year), int(month), int(day))
 
 
 class CirculatingSupplyRepository(BaseRepository[CirculatingSupply]):
@@ -15,6 +44,23 @@ class CirculatingSupplyRepository(BaseRepository[CirculatingSupply]):
     def __init__(self):
         """Initialize the repository."""
         super().__init__(CirculatingSupply, "circulating_supply")
+        # Statement for bulk_insert, built once
+        self._update_columns = [col for col in self._columns if col != 'date']
+        self._upsert_sql = f"""
+        INSERT INTO {self.table_name} ({', '.join(self._columns)})
+        VALUES %s
+        ON CONFLICT (date)
+        DO UPDATE SET
+            circulating_supply_at_that_date = EXCLUDED.circulating_supply_at_that_date,
+            block_timestamp_at_that_date = EXCLUDED.block_timestamp_at_that_date,
+            total_claimed_that_day = EXCLUDED.total_claimed_that_day
+        """
+        self._page_size = min(1000, MAX_STATEMENT_PARAMS // len(self._columns))
+        # Prepared per connection by fetchone_prepared
+        self._latest_query = (
+            f"{self.table_name}_latest",
+            f"SELECT {self._select_list} FROM {self.table_name} ORDER BY date DESC LIMIT 1",
+        )
 
     def get_latest(self) -> CirculatingSupply:
         """
@@ -23,23 +69,28 @@ class CirculatingSupplyRepository(BaseRepository[CirculatingSupply]):
         Returns:
             The latest record, or None if no records exist
         """
-        # Use cursor directly to get column names
-        with self.db.cursor() as cur:
-            sql = f"SELECT * FROM {self.table_name} ORDER BY date DESC LIMIT 1"
-            cur.execute(sql)
-            
-            # Get column names from cursor description
-            columns = [desc[0] for desc in cur.description]
-            
-            # Fetch the result
-            result = cur.fetchone()
-            
-            if not result:
-                raise
+        result = self.db.fetchone_prepared(*self._latest_query, dict_cursor=True)
+        if not result:
+            raise
+        return CirculatingSupply.model_construct(**result)
+
+    def get_by_dates(self, dates: Sequence[date]) -> List[CirculatingSupply]:
+        """
+        Get the records for several dates in one query.
+        
+        Args:
+            dates: The dates to query
             
-            # Convert tuple to dictionary using column names
-            dict_result = dict(zip(columns, result))
-            return CirculatingSupply(**dict_result)
+        Returns:
+            The records found, in the order of dates
+        """
+        if not dates:
+            return []
+        
+        sql = f"SELECT {self._select_list} FROM {self.table_name} WHERE date = ANY(%s)"
+        results = self.db.fetchall(sql, [list(dates)], dict_cursor=True)
+        by_date = {result['date']: CirculatingSupply.model_construct(**result) for result in results}
+        return [by_date[date_value] for date_value in dates if date_value in by_date]
 
     def get_by_date_range(self, start_date: date, end_date: date) -> List[CirculatingSupply]:
         """
@@ -52,24 +103,106 @@ class CirculatingSupplyRepository(BaseRepository[CirculatingSupply]):
         Returns:
             List of records
         """
-        # Use cursor directly to get column names
-        with self.db.cursor() as cur:
-            sql = f"""
-            SELECT * FROM {self.table_name}
-            WHERE date BETWEEN %s AND %s
-            ORDER BY date
-            """
-            cur.execute(sql, [start_date, end_date])
+        sql = f"""
+        SELECT {self._select_list} FROM {self.table_name}
+        WHERE date BETWEEN %s AND %s
+        ORDER BY date
+        """
+        results = self.db.fetchall(sql, [start_date, end_date], dict_cursor=True)
+        return [CirculatingSupply.model_construct(**result) for result in results]
+
+    def get_rows_by_date_range(self, start_date: date, end_date: date) -> List[CirculatingSupplyRow]:
+        """
+        Get records by date range as lightweight, read-only rows.
+        
+        Like `get_by_date_range`, but builds a slotted dataclass per row
+        straight from the result tuple instead of a Pydantic model.
+        
+        Args:
+            start_date: The start date
+            end_date: The end date
             
-            # Get column names from cursor description
-            columns = [desc[0] for desc in cur.description]
+        Returns:
+            List of CirculatingSupplyRow objects
+        """
+        sql = f"""
+        SELECT {', '.join(row_columns(CirculatingSupplyRow))} FROM {self.table_name}
+        WHERE date BETWEEN %s AND %s
+        ORDER BY date
+        """
+        # Rows come back in field order, so no dict or model is built per row
+        return [CirculatingSupplyRow(*result) for result in self.db.fetchall(sql, [start_date, end_date])]
+
+    def iter_by_date_range(
+        self, start_date: date, end_date: date, batch_size: int = 1000
+    ) -> Iterator[CirculatingSupply]:
+        """
+        Iterate over the records of a date range through a server-side cursor.
+        
+        The streaming counterpart of `get_by_date_range`: rows are fetched
+        batch_size at a time and turned into models as they are consumed, so
+        memory use does not grow with the length of the range.
+        
+        Args:
+            start_date: The start date
+            end_date: The end date
+            batch_size: Number of rows fetched per network roundtrip
             
-            # Fetch all results
-            results = cur.fetchall()
+        Returns:
+            Iterator of records
+        """
+        sql = f"""
+        SELECT {self._select_list} FROM {self.table_name}
+        WHERE date BETWEEN %s AND %s
+        ORDER BY date
+        """
+        rows = self.db.stream(sql, [start_date, end_date], batch_size=batch_size, dict_cursor=True)
+        return (CirculatingSupply.model_construct(**row) for row in rows)
+
+    async def get_by_date_range_async(self, start_date: date, end_date: date) -> List[CirculatingSupply]:
+        """
+        Get records by date range without blocking the event loop.
+        
+        Args:
+            start_date: The start date
+            end_date: The end date
             
-            # Convert tuples to dictionaries using column names
-            return [CirculatingSupply(**dict(zip(columns, result))) for result in results]
+        Returns:
+            List of records
+        """
+        sql = f"""
+        SELECT {self._select_list} FROM {self.table_name}
+        WHERE date BETWEEN %s AND %s
+        ORDER BY date
+        """
+        results = await self.adb.fetchall(sql, [start_date, end_date], dict_cursor=True)
+        return [CirculatingSupply.model_construct(**result) for result in results]
 
+    async def get_supply_history_async(
+        self, start_date: date, end_date: date
+    ) -> List[Tuple[date, float, float]]:
+        """
+        Get the daily supply figures for a date range as plain tuples.
+        
+        Only the three columns the supply endpoints read are selected, and rows
+        are returned as tuples rather than dicts or models. The amounts are cast
+        to float8 in the query, so they arrive as floats instead of going
+        through NUMERIC decoding and a float() per row.
+        
+        Args:
+            start_date: The start date
+            end_date: The end date
+            
+        Returns:
+            List of (date, circulating_supply_at_that_date, total_claimed_that_day) tuples
+        """
+        sql = f"""
+        SELECT date, circulating_supply_at_that_date::float8, total_claimed_that_day::float8
+        FROM {self.table_name}
+        WHERE date BETWEEN %s AND %s
+        ORDER BY date
+        """
+        return await self.adb.fetchall(sql, [start_date, end_date])
 
     def save_new_supply_data(self, new_data: List[Dict]) -> int:
         """
@@ -89,7 +222,7 @@ class CirculatingSupplyRepository(BaseRepository[CirculatingSupply]):
             # Convert date string to date object if needed
             date_obj = record['date']
             if isinstance(date_obj, str):
-                date_obj = datetime.strptime(date_obj, '%d/%m/%Y').date()
+                date_obj = parse_dmy_date(date_obj)
             
             records.append(CirculatingSupply(
                 date=date_obj,
@@ -114,34 +247,22 @@ class CirculatingSupplyRepository(BaseRepository[CirculatingSupply]):
         if not records:
             return 0
 
-        # Extract fields from the first record to determine columns
-        sample = records[0].model_dump(exclude_none=True)
-        if 'id' in sample:
-            del sample['id']  # Remove id field for insertion
+        # Prepare values for all records, keeping the last one per date: a
+        # single INSERT cannot update the same conflicting row twice
+        rows_by_date = {record.date: row for record, row in zip(records, map(self._row_values, records))}
+        values_list = list(rows_by_date.values())
 
-        columns = list(sample.keys())
-        placeholders = ', '.join(['%s'] * len(columns))
-        column_str = ', '.join(columns)
-
-        # Prepare values for all records
-        values_list = []
-        for record in records:
-            record_dict = record.model_dump(exclude_none=True)
-            if 'id' in record_dict:
-                del record_dict['id']
-            values_list.append(tuple(record_dict[col] for col in columns))
-
-        # Build and execute the query with ON CONFLICT handling
-        sql = f"""
-        INSERT INTO {self.table_name} ({column_str})
-        VALUES ({placeholders})
-        ON CONFLICT (date)
-        DO UPDATE SET
-            circulating_supply_at_that_date = EXCLUDED.circulating_supply_at_that_date,
-            block_timestamp_at_that_date = EXCLUDED.block_timestamp_at_that_date,
-            total_claimed_that_day = EXCLUDED.total_claimed_that_day
-        """
+        # Large loads (backfills) skip the per-statement parsing entirely
+        if len(values_list) > COPY_UPSERT_THRESHOLD:
+            return self.db.copy_upsert(
+                self.table_name, self._columns, values_list, ['date'], self._update_columns
+            )
 
+        # One multi-row INSERT per page instead of a round-trip per row; there
+        # is no RETURNING clause, so no rows are sent back
         with self.db.transaction() as cursor:
-            cursor.executemany(sql, values_list)
+            execute_values(
+                cursor, self._upsert_sql, values_list,
+                template=self._row_template, page_size=self._page_size
+            )
             return len(values_list)
\ No newline at end of file
@@ -2,11 +2,23 @@
 Repository for emissions table.
 """
 from datetime import date, datetime, timedelta
-from decimal import Decimal
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
 
+from psycopg2.extras import execute_values
+
+from app.cache.cache_manager import invalidate_table
 from app.models.database_models import Emission
-from app.repository.base_repository import BaseRepository
+from app.repository.base_repository import COPY_UPSERT_THRESHOLD, MAX_STATEMENT_PARAMS, BaseRepository
+
+# Per-category emission columns, with their total
+EMISSION_COLUMNS = (
+    'capital_emission',
+    'code_emission',
+    'compute_emission',
+    'community_emission',
+    'protection_emission',
+    'total_emission',
+)
 
 
 class EmissionRepository(BaseRepository[Emission]):
@@ -15,6 +27,32 @@ class EmissionRepository(BaseRepository[Emission]):
     def __init__(self):
         """Initialize the repository."""
         super().__init__(Emission, "emissions")
+        # Statement for bulk_insert, built once
+        self._update_columns = [col for col in self._columns if col != 'date']
+        self._upsert_sql = f"""
+        INSERT INTO {self.table_name} ({', '.join(self._columns)})
+        VALUES %s
+        ON CONFLICT (date)
+        DO UPDATE SET
+            day = EXCLUDED.day,
+            capital_emission = EXCLUDED.capital_emission,
+            code_emission = EXCLUDED.code_emission,
+            compute_emission = EXCLUDED.compute_emission,
+            community_emission = EXCLUDED.community_emission,
+            protection_emission = EXCLUDED.protection_emission,
+            total_emission = EXCLUDED.total_emission,
+            total_supply = EXCLUDED.total_supply
+        """
+        self._page_size = min(1000, MAX_STATEMENT_PARAMS // len(self._columns))
+        # Point lookups, prepared per connection by fetchone_prepared
+        self._by_date_query = (
+            f"{self.table_name}_by_date",
+            f"SELECT {self._select_list} FROM {self.table_name} WHERE date = %s",
+        )
+        self._latest_query = (
+            f"{self.table_name}_latest",
+            f"SELECT {self._select_list} FROM {self.table_name} ORDER BY date DESC LIMIT 1",
+        )
 
     def get_by_date(self, date_value: date) -> Optional[Emission]:
         """
@@ -26,23 +64,8 @@ class EmissionRepository(BaseRepository[Emission]):
         Returns:
             The record, or None if not found
         """
-        # Use cursor directly to get column names
-        with self.db.cursor() as cur:
-            sql = f"SELECT * FROM {self.table_name} WHERE date = %s"
-            cur.execute(sql, [date_value])
-            
-            # Get column names from cursor description
-            columns = [desc[0] for desc in cur.description]
-            
-            # Fetch the result
-            result = cur.fetchone()
-            
-            if not result:
-                return None
-            
-            # Convert tuple to dictionary using column names
-            dict_result = dict(zip(columns, result))
-            return Emission(**dict_result)
+        result = self.db.fetchone_prepared(*self._by_date_query, [date_value], dict_cursor=True)
+        return Emission.model_construct(**result) if result else None
 
     def get_latest(self) -> Optional[Emission]:
         """
@@ -51,23 +74,81 @@ class EmissionRepository(BaseRepository[Emission]):
         Returns:
             The latest record, or None if no records exist
         """
-        # Use cursor directly to get column names
-        with self.db.cursor() as cur:
-            sql = f"SELECT * FROM {self.table_name} ORDER BY date DESC LIMIT 1"
-            cur.execute(sql)
-            
-            # Get column names from cursor description
-            columns = [desc[0] for desc in cur.description]
-            
-            # Fetch the result
-            result = cur.fetchone()
+        result = self.db.fetchone_prepared(*self._latest_query, dict_cursor=True)
+        return Emission.model_construct(**result) if result else None
+
+    def iter_total_emissions(self) -> Iterator[Tuple[date, float]]:
+        """
+        Iterate over (date, total_emission) pairs, latest date first.
+        
+        Rows are streamed from a server-side cursor instead of being loaded
+        into a list of models first.
+        
+        Returns:
+            Iterator of (date, total_emission) tuples
+        """
+        sql = f"SELECT date, total_emission FROM {self.table_name} ORDER BY date DESC"
+        return self.db.stream(sql)
+
+    async def get_total_emissions_async(self) -> List[Tuple[date, float]]:
+        """
+        Get (date, total_emission) pairs, latest date first, without blocking
+        the event loop.
+        
+        Returns:
+            List of (date, total_emission) tuples
+        """
+        sql = f"SELECT date, total_emission::float8 FROM {self.table_name} ORDER BY date DESC"
+        return await self.adb.fetchall(sql)
+
+    def get_by_dates(self, dates: Sequence[date]) -> List[Emission]:
+        """
+        Get the records for several dates in one query.
+        
+        Args:
+            dates: The dates to query
             
-            if not result:
-                return None
+        Returns:
+            The records found, in the order of dates
+        """
+        if not dates:
+            return []
+        
+        sql = f"SELECT {self._select_list} FROM {self.table_name} WHERE date = ANY(%s)"
+        results = self.db.fetchall(sql, [list(dates)], dict_cursor=True)
+        by_date = {result['date']: Emission.model_construct(**result) for result in results}
+        return [by_date[date_value] for date_value in dates if date_value in by_date]
+
+    def get_emission_changes(self, start_date: date, end_date: date) -> Optional[Dict[str, float]]:
+        """
+        Get the change in each emission column between two dates.
+        
+        Both rows are read and the differences computed in a single query.
+        
+        Args:
+            start_date: The date to compare from
+            end_date: The date to compare to
             
-            # Convert tuple to dictionary using column names
-            dict_result = dict(zip(columns, result))
-            return Emission(**dict_result)
+        Returns:
+            Mapping of emission column to its end minus start value, or None
+            if either date has no record
+        """
+        deltas = ',\n            '.join(
+            f"(MAX(e.{col}) FILTER (WHERE e.date = b.end_date)"
+            f" - MAX(e.{col}) FILTER (WHERE e.date = b.start_date))::float8 AS {col}"
+            for col in EMISSION_COLUMNS
+        )
+        sql = f"""
+        WITH b AS (SELECT %s::date AS start_date, %s::date AS end_date)
+        SELECT
+            {deltas}
+        FROM {self.table_name} e CROSS JOIN b
+        WHERE e.date IN (b.start_date, b.end_date)
+        HAVING COUNT(*) = %s
+        """
+        # One row per distinct date must exist for the deltas to be meaningful
+        params = [start_date, end_date, len({start_date, end_date})]
+        return self.db.fetchone(sql, params, dict_cursor=True)
 
     def get_by_date_range(self, start_date: date, end_date: date) -> List[Emission]:
         """
@@ -80,23 +161,39 @@ class EmissionRepository(BaseRepository[Emission]):
         Returns:
             List of records
         """
-        # Use cursor directly to get column names
-        with self.db.cursor() as cur:
-            sql = f"""
-            SELECT * FROM {self.table_name}
-            WHERE date BETWEEN %s AND %s
-            ORDER BY date
-            """
-            cur.execute(sql, [start_date, end_date])
-            
-            # Get column names from cursor description
-            columns = [desc[0] for desc in cur.description]
-            
-            # Fetch all results
-            results = cur.fetchall()
+        sql = f"""
+        SELECT {self._select_list} FROM {self.table_name}
+        WHERE date BETWEEN %s AND %s
+        ORDER BY date
+        """
+        results = self.db.fetchall(sql, [start_date, end_date], dict_cursor=True)
+        return [Emission.model_construct(**result) for result in results]
+
+    def iter_by_date_range(
+        self, start_date: date, end_date: date, batch_size: int = 1000
+    ) -> Iterator[Emission]:
+        """
+        Iterate over the records of a date range through a server-side cursor.
+        
+        The streaming counterpart of `get_by_date_range`: rows are fetched
+        batch_size at a time and turned into models as they are consumed, so
+        memory use does not grow with the length of the range.
+        
+        Args:
+            start_date: The start date
+            end_date: The end date
+            batch_size: Number of rows fetched per network roundtrip
             
-            # Convert tuples to dictionaries using column names
-            return [Emission(**dict(zip(columns, result))) for result in results]
+        Returns:
+            Iterator of records
+        """
+        sql = f"""
+        SELECT {self._select_list} FROM {self.table_name}
+        WHERE date BETWEEN %s AND %s
+        ORDER BY date
+        """
+        rows = self.db.stream(sql, [start_date, end_date], batch_size=batch_size, dict_cursor=True)
+        return (Emission.model_construct(**row) for row in rows)
 
     def bulk_insert(self, records: List[Emission]) -> int:
         """
@@ -111,39 +208,25 @@ class EmissionRepository(BaseRepository[Emission]):
         if not records:
             return 0
 
-        # Extract fields from the first record to determine columns
-        sample = records[0].model_dump(exclude_none=True)
-        if 'id' in sample:
-            del sample['id']  # Remove id field for insertion
-
-        columns = list(sample.keys())
-        placeholders = ', '.join(['%s'] * len(columns))
-        column_str = ', '.join(columns)
+        # Prepare values for all records, keeping the last one per date: a
+        # single INSERT cannot update the same conflicting row twice
+        rows_by_date = {record.date: row for record, row in zip(records, map(self._row_values, records))}
+        values_list = list(rows_by_date.values())
 
-        # Prepare values for all records
-        values_list = []
-        for record in records:
-            record_dict = record.model_dump(exclude_none=True)
-            if 'id' in record_dict:
-                del record_dict['id']
-            values_list.append(tuple(record_dict[col] for col in columns))
-
-        # Build and execute the query with ON CONFLICT handling
-        sql = f"""
-        INSERT INTO {self.table_name} ({column_str})
-        VALUES ({placeholders})
-        ON CONFLICT (date)
-        DO UPDATE SET
-            day = EXCLUDED.day,
-            capital_emission = EXCLUDED.capital_emission,
-            code_emission = EXCLUDED.code_emission,
-            compute_emission = EXCLUDED.compute_emission,
-            community_emission = EXCLUDED.community_emission,
-            protection_emission = EXCLUDED.protection_emission,
-            total_emission = EXCLUDED.total_emission,
-            total_supply = EXCLUDED.total_supply
-        """
+        # Large loads (backfills) skip the per-statement parsing entirely
+        if len(values_list) > COPY_UPSERT_THRESHOLD:
+            upserted = self.db.copy_upsert(
+                self.table_name, self._columns, values_list, ['date'], self._update_columns
+            )
+            invalidate_table(self.table_name)
+            return upserted
 
+        # One multi-row INSERT per page instead of a round-trip per row; there
+        # is no RETURNING clause, so no rows are sent back
         with self.db.transaction() as cursor:
-            cursor.executemany(sql, values_list)
-            return len(values_list)
\ No newline at end of file
+            execute_values(
+                cursor, self._upsert_sql, values_list,
+                template=self._row_template, page_size=self._page_size
+            )
+        invalidate_table(self.table_name)
+        return len(values_list)
\ No newline at end of file
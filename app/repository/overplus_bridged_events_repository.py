@@ -1,19 +1,96 @@
 """
 Repository for overplus_bridged_events table.
 """
+import logging
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional
 
+import pandas as pd
+
+from app.cache.cache_manager import invalidate_table
 from app.models.database_models import OverplusBridgedEvent
 from app.repository.base_repository import BaseRepository
 
+logger = logging.getLogger(__name__)
+
+# The daily totals view and the unique index REFRESH ... CONCURRENTLY needs;
+# idempotent, so it is also run against databases that predate the view
+DAILY_TOTALS_VIEW_DDL = """
+        CREATE MATERIALIZED VIEW IF NOT EXISTS mv_overplus_bridged_daily AS
+            SELECT timestamp::date AS date, SUM(amount) AS amount, COUNT(*) AS events
+            FROM overplus_bridged_events
+            GROUP BY 1
+            WITH DATA;
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_mv_overplus_bridged_daily_date ON mv_overplus_bridged_daily (date);
+"""
+
 
 class OverplusBridgedEventsRepository(BaseRepository[OverplusBridgedEvent]):
-    """Repository for overplus_bridged_events table."""
+    """
+    Repository for overplus_bridged_events table.
+    
+    Daily and monthly totals are read from the mv_overplus_bridged_daily
+    materialized view, which bulk_insert refreshes, instead of aggregating
+    the whole table on every request.
+    """
+
+    # Materialized view of per-day totals, see DAILY_TOTALS_VIEW_DDL
+    daily_view = "mv_overplus_bridged_daily"
+    # Whether this process has made sure the view exists
+    _daily_view_ready = False
 
     def __init__(self):
         """Initialize the repository."""
         super().__init__(OverplusBridgedEvent, "overplus_bridged_events")
+        # Point lookups, prepared per connection by fetchone_prepared
+        self._by_transaction_hash_query = (
+            f"{self.table_name}_by_transaction_hash",
+            f"SELECT {self._select_list} FROM {self.table_name} WHERE transaction_hash = %s",
+        )
+        self._last_block_query = (
+            f"{self.table_name}_last_block",
+            f"SELECT block_number FROM {self.table_name} ORDER BY block_number DESC LIMIT 1",
+        )
+        self._by_unique_id_query = (
+            f"{self.table_name}_by_unique_id",
+            f"SELECT {self._select_list} FROM {self.table_name} WHERE unique_id = %s",
+        )
+
+    def bulk_insert(self, records: List[OverplusBridgedEvent]) -> int:
+        """
+        Insert multiple records at once and refresh the daily totals.
+        
+        Args:
+            records: List of records to insert
+            
+        Returns:
+            Number of records inserted
+        """
+        inserted = super().bulk_insert(records)
+        if inserted:
+            # The rows are committed; a failed refresh only leaves the totals stale
+            try:
+                self.refresh_daily_totals()
+            except Exception as e:
+                logger.warning(f"Failed to refresh {self.daily_view}: {str(e)}")
+        return inserted
+
+    def _ensure_daily_view(self) -> None:
+        """Create the daily totals view, once per process, if it does not exist."""
+        if not OverplusBridgedEventsRepository._daily_view_ready:
+            self.db.execute(DAILY_TOTALS_VIEW_DDL)
+            OverplusBridgedEventsRepository._daily_view_ready = True
+
+    def refresh_daily_totals(self) -> None:
+        """
+        Recompute the daily totals view.
+        
+        The refresh runs concurrently, so readers keep seeing the previous
+        totals instead of waiting on it.
+        """
+        self._ensure_daily_view()
+        self.db.execute(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {self.daily_view}")
+        invalidate_table(self.table_name)
 
     def get_by_transaction_hash(self, transaction_hash: str) -> Optional[OverplusBridgedEvent]:
         """
@@ -25,9 +102,10 @@ class OverplusBridgedEventsRepository(BaseRepository[OverplusBridgedEvent]):
         Returns:
             The record, or None if not found
         """
-        sql = f"SELECT * FROM {self.table_name} WHERE transaction_hash = %s"
-        result = self.db.fetchone(sql, [transaction_hash])
-        return OverplusBridgedEvent(**result) if result else None
+        result = self.db.fetchone_prepared(
+            *self._by_transaction_hash_query, [transaction_hash], dict_cursor=True
+        )
+        return OverplusBridgedEvent.model_construct(**result) if result else None
 
     def get_by_unique_id(self, unique_id: str) -> Optional[OverplusBridgedEvent]:
         """
@@ -39,9 +117,8 @@ class OverplusBridgedEventsRepository(BaseRepository[OverplusBridgedEvent]):
         Returns:
             The record, or None if not found
         """
-        sql = f"SELECT * FROM {self.table_name} WHERE unique_id = %s"
-        result = self.db.fetchone(sql, [unique_id])
-        return OverplusBridgedEvent(**result) if result else None
+        result = self.db.fetchone_prepared(*self._by_unique_id_query, [unique_id], dict_cursor=True)
+        return OverplusBridgedEvent.model_construct(**result) if result else None
 
     def get_by_block_range(self, start_block: int, end_block: int) -> List[OverplusBridgedEvent]:
         """
@@ -55,12 +132,12 @@ class OverplusBridgedEventsRepository(BaseRepository[OverplusBridgedEvent]):
             List of records
         """
         sql = f"""
-        SELECT * FROM {self.table_name} 
+        SELECT {self._select_list} FROM {self.table_name} 
         WHERE block_number BETWEEN %s AND %s 
         ORDER BY block_number
         """
-        results = self.db.fetchall(sql, [start_block, end_block])
-        return [OverplusBridgedEvent(**result) for result in results]
+        results = self.db.fetchall(sql, [start_block, end_block], dict_cursor=True)
+        return [OverplusBridgedEvent.model_construct(**result) for result in results]
 
     def get_by_date_range(self, start_date: datetime, end_date: datetime) -> List[OverplusBridgedEvent]:
         """
@@ -74,12 +151,62 @@ class OverplusBridgedEventsRepository(BaseRepository[OverplusBridgedEvent]):
             List of records
         """
         sql = f"""
-        SELECT * FROM {self.table_name} 
+        SELECT {self._select_list} FROM {self.table_name} 
         WHERE timestamp BETWEEN %s AND %s 
         ORDER BY timestamp
         """
-        results = self.db.fetchall(sql, [start_date, end_date])
-        return [OverplusBridgedEvent(**result) for result in results]
+        results = self.db.fetchall(sql, [start_date, end_date], dict_cursor=True)
+        return [OverplusBridgedEvent.model_construct(**result) for result in results]
+
+    def iter_by_block_range(
+        self, start_block: int, end_block: int, batch_size: int = 1000
+    ) -> Iterator[OverplusBridgedEvent]:
+        """
+        Iterate over the records of a block range through a server-side cursor.
+        
+        The streaming counterpart of `get_by_block_range`, for ranges too
+        large to hold as one list.
+        
+        Args:
+            start_block: The start block number
+            end_block: The end block number
+            batch_size: Number of rows fetched per network roundtrip
+            
+        Returns:
+            Iterator of records
+        """
+        sql = f"""
+        SELECT {self._select_list} FROM {self.table_name}
+        WHERE block_number BETWEEN %s AND %s
+        ORDER BY block_number
+        """
+        rows = self.db.stream(sql, [start_block, end_block], batch_size=batch_size, dict_cursor=True)
+        return (OverplusBridgedEvent.model_construct(**row) for row in rows)
+
+    def iter_by_date_range(
+        self, start_date: datetime, end_date: datetime, batch_size: int = 1000
+    ) -> Iterator[OverplusBridgedEvent]:
+        """
+        Iterate over the records of a date range through a server-side cursor.
+        
+        The streaming counterpart of `get_by_date_range`, for ranges too
+        large to hold as one list.
+        
+        Args:
+            start_date: The start date
+            end_date: The end date
+            batch_size: Number of rows fetched per network roundtrip
+            
+        Returns:
+            Iterator of records
+        """
+        sql = f"""
+        SELECT {self._select_list} FROM {self.table_name}
+        WHERE timestamp BETWEEN %s AND %s
+        ORDER BY timestamp
+        """
+        rows = self.db.stream(sql, [start_date, end_date], batch_size=batch_size, dict_cursor=True)
+        return (OverplusBridgedEvent.model_construct(**row) for row in rows)
 
     def get_last_processed_block(self) -> Optional[int]:
         """
@@ -88,9 +215,9 @@ class OverplusBridgedEventsRepository(BaseRepository[OverplusBridgedEvent]):
         Returns:
             The last processed block number, or None if no records exist
         """
-        sql = f"SELECT MAX(block_number) as last_block FROM {self.table_name}"
-        result = self.db.fetchone(sql)
-        return int(result[0]) if result and result[0] is not None else None
+        # Reads the last entry of the block_number index
+        result = self.db.fetchone_prepared(*self._last_block_query)
+        return int(result[0]) if result else None
 
     def get_total_bridged(self) -> float:
         """
@@ -99,9 +226,31 @@ class OverplusBridgedEventsRepository(BaseRepository[OverplusBridgedEvent]):
         Returns:
             Total amount bridged
         """
-        sql = f"SELECT SUM(amount) as total_bridged FROM {self.table_name}"
-        result = self.db.fetchone(sql)
-        return float(result['total_bridged']) if result and result['total_bridged'] is not None else 0
+        self._ensure_daily_view()
+        # Summing the daily totals reads one row per day, not one per event
+        sql = f"SELECT COALESCE(SUM(amount), 0)::float8 FROM {self.daily_view}"
+        return self._cached_read(self.db.fetchone, sql)[0]
+
+    def get_daily_totals_df(self, value_column: str = "amount", timestamp_column: str = "timestamp") -> pd.DataFrame:
+        """
+        Get the per-day sum of a column as a DataFrame.
+        
+        The daily amount totals come from the materialized view; other
+        columns are aggregated from the table.
+        
+        Args:
+            value_column: The column to sum
+            timestamp_column: The column whose date the rows are grouped by
+            
+        Returns:
+            DataFrame with `date` and `value_column` columns, ordered by date
+        """
+        if (value_column, timestamp_column) != ("amount", "timestamp"):
+            return super().get_daily_totals_df(value_column, timestamp_column)
+        
+        self._ensure_daily_view()
+        sql = f"SELECT date, amount::float8 AS amount FROM {self.daily_view} ORDER BY date"
+        return self.db.fetch_df(sql)
 
     def get_bridged_by_day(self, days: int = 30) -> List[Dict[str, any]]:
         """
@@ -113,24 +262,15 @@ class OverplusBridgedEventsRepository(BaseRepository[OverplusBridgedEvent]):
         Returns:
             List of daily bridged amounts
         """
+        self._ensure_daily_view()
+        # Rows are shaped in SQL, so the driver's dict rows are the result
         sql = f"""
-        SELECT 
-            DATE(timestamp) as date,
-            SUM(amount) as daily_bridged
-        FROM {self.table_name} 
-        WHERE timestamp >= CURRENT_DATE - INTERVAL '%s days'
-        GROUP BY date
-        ORDER BY date
-        """
-        results = self.db.fetchall(sql, [days])
-        
-        return [
-            {
-                'date': row['date'].isoformat(),
-                'amount': float(row['daily_bridged'])
-            }
-            for row in results
-        ]
+        SELECT to_char(date, 'YYYY-MM-DD') AS date, amount::float8 AS amount
+        FROM {self.daily_view}
+        WHERE date >= CURRENT_DATE - %s
+        ORDER BY {self.daily_view}.date
+        """
+        return self._cached_read(self.db.fetchall, sql, [days], dict_cursor=True)
 
     def get_bridged_by_month(self) -> List[Dict[str, any]]:
         """
@@ -139,60 +279,14 @@ class OverplusBridgedEventsRepository(BaseRepository[OverplusBridgedEvent]):
         Returns:
             List of monthly bridged amounts
         """
+        self._ensure_daily_view()
+        # Rolled up from the daily view, which has one row per day
         sql = f"""
         SELECT 
-            DATE_TRUNC('month', timestamp) as month,
-            SUM(amount) as monthly_bridged
-        FROM {self.table_name} 
-        GROUP BY month
-        ORDER BY month
-        """
-        results = self.db.fetchall(sql)
-        
-        return [
-            {
-                'month': row['month'].strftime('%Y-%m'),
-                'amount': float(row['monthly_bridged'])
-            }
-            for row in results
-        ]
-
-    def bulk_insert(self, records: List[OverplusBridgedEvent]) -> int:
-        """
-        Insert multiple records at once.
-        
-        Args:
-            records: List of records to insert
-            
-        Returns:
-            Number of records inserted
+            to_char(DATE_TRUNC('month', date), 'YYYY-MM') as month,
+            SUM(amount)::float8 as amount
+        FROM {self.daily_view}
+        GROUP BY 1
+        ORDER BY 1
         """
-        if not records:
-            return 0
-
-        # Extract fields from the first record to determine columns
-        sample = records[0].model_dump(exclude_none=True)
-        if 'id' in sample:
-            del sample['id']  # Remove id field for insertion
-
-        columns = list(sample.keys())
-        placeholders = ', '.join(['%s'] * len(columns))
-        column_str = ', '.join(columns)
-
-        # Prepare values for all records
-        values_list = []
-        for record in records:
-            record_dict = record.model_dump(exclude_none=True)
-            if 'id' in record_dict:
-                del record_dict['id']
-            values_list.append(tuple(record_dict[col] for col in columns))
-
-        # Build and execute the query without ON CONFLICT handling
-        sql = f"""
-        INSERT INTO {self.table_name} ({column_str})
-        VALUES ({placeholders})
-        """
-
-        with self.db.transaction() as cursor:
-            cursor.executemany(sql, values_list)
-            return len(values_list)
\ No newline at end of file
+        return self._cached_read(self.db.fetchall, sql, dict_cursor=True)
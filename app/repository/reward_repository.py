@@ -1,40 +1,102 @@
 """
-Repository for reward_summary and reward_detail tables.
+Repository for reward_summary table.
 """
+import logging
 from datetime import datetime
 from typing import Dict, List, Optional
 
+from app.cache.cache_manager import invalidate_table
 from app.models.database_models import RewardSummary
 from app.repository.base_repository import BaseRepository
 
+logger = logging.getLogger(__name__)
+
+# The daily rewards view and the unique index REFRESH ... CONCURRENTLY needs;
+# idempotent, so it is also run against databases that predate the view
+DAILY_REWARDS_VIEW_DDL = """
+        CREATE MATERIALIZED VIEW IF NOT EXISTS mv_reward_summary_daily AS
+            SELECT DISTINCT ON (timestamp::date)
+                timestamp::date AS date, daily_pool_reward_0, daily_pool_reward_1, daily_reward
+            FROM reward_summary
+            ORDER BY timestamp::date, timestamp DESC
+            WITH DATA;
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_mv_reward_summary_daily_date ON mv_reward_summary_daily (date);
+"""
 
 class RewardSummaryRepository(BaseRepository[RewardSummary]):
-    """Repository for reward_summary table."""
+    """
+    Repository for reward_summary table.
+    
+    Daily rewards are read from the mv_reward_summary_daily materialized
+    view, which create and bulk_insert refresh.
+    """
+
+    # Materialized view of the latest summary per day, see DAILY_REWARDS_VIEW_DDL
+    daily_view = "mv_reward_summary_daily"
+    # Whether this process has made sure the view exists
+    _daily_view_ready = False
 
     def __init__(self):
         """Initialize the repository."""
         super().__init__(RewardSummary, "reward_summary")
+        # Prepared per connection by fetchone_prepared
+        self._latest_query = (
+            f"{self.table_name}_latest",
+            f"SELECT {self._select_list} FROM {self.table_name} ORDER BY timestamp DESC LIMIT 1",
+        )
 
-    def get_by_category(self, category: str, limit: int = 100, offset: int = 0) -> List[RewardSummary]:
+    def create(self, data: RewardSummary) -> RewardSummary:
         """
-        Get records by category.
+        Create a new record and refresh the daily rewards.
         
         Args:
-            category: The reward category
-            limit: Maximum number of records to return
-            offset: Number of records to skip
+            data: The data to insert
             
         Returns:
-            List of records
+            The created record
         """
-        sql = f"""
-        SELECT * FROM {self.table_name} 
-        WHERE category = %s 
-        ORDER BY timestamp DESC 
-        LIMIT %s OFFSET %s
+        created = super().create(data)
+        self._refresh_after_write()
+        return created
+
+    def bulk_insert(self, records: List[RewardSummary]) -> int:
         """
-        results = self.db.fetchall(sql, [category, limit, offset])
-        return [RewardSummary(**result) for result in results]
+        Insert multiple records at once and refresh the daily rewards.
+        
+        Args:
+            records: List of records to insert
+            
+        Returns:
+            Number of records inserted
+        """
+        inserted = super().bulk_insert(records)
+        if inserted:
+            self._refresh_after_write()
+        return inserted
+
+    def _refresh_after_write(self) -> None:
+        """Refresh the daily rewards; the write is committed, so failures only leave them stale."""
+        try:
+            self.refresh_daily_rewards()
+        except Exception as e:
+            logger.warning(f"Failed to refresh {self.daily_view}: {str(e)}")
+
+    def _ensure_daily_view(self) -> None:
+        """Create the daily rewards view, once per process, if it does not exist."""
+        if not RewardSummaryRepository._daily_view_ready:
+            self.db.execute(DAILY_REWARDS_VIEW_DDL)
+            RewardSummaryRepository._daily_view_ready = True
+
+    def refresh_daily_rewards(self) -> None:
+        """
+        Recompute the daily rewards view.
+        
+        The refresh runs concurrently, so readers keep seeing the previous
+        rewards instead of waiting on it.
+        """
+        self._ensure_daily_view()
+        self.db.execute(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {self.daily_view}")
+        invalidate_table(self.table_name)
 
     def get_by_date_range(self, start_date: datetime, end_date: datetime) -> List[RewardSummary]:
         """
@@ -48,90 +110,67 @@ class RewardSummaryRepository(BaseRepository[RewardSummary]):
             List of records
         """
         sql = f"""
-        SELECT * FROM {self.table_name} 
+        SELECT {self._select_list} FROM {self.table_name} 
         WHERE timestamp BETWEEN %s AND %s 
         ORDER BY timestamp
         """
-        results = self.db.fetchall(sql, [start_date, end_date])
-        return [RewardSummary(**result) for result in results]
+        results = self.db.fetchall(sql, [start_date, end_date], dict_cursor=True)
+        return [RewardSummary.model_construct(**result) for result in results]
 
-    def get_latest_by_category(self, category: str) -> Optional[RewardSummary]:
+    def get_latest(self) -> Optional[RewardSummary]:
         """
-        Get the latest record by category.
+        Get the latest reward summary.
         
-        Args:
-            category: The reward category
-            
         Returns:
-            The latest record, or None if not found
-        """
-        sql = f"""
-        SELECT * FROM {self.table_name} 
-        WHERE category = %s 
-        ORDER BY timestamp DESC 
-        LIMIT 1
+            The latest record, or None if no records exist
         """
-        result = self.db.fetchone(sql, [category])
-        return RewardSummary(**result) if result else None
+        result = self.db.fetchone_prepared(*self._latest_query, dict_cursor=True)
+        return RewardSummary.model_construct(**result) if result else None
 
     def get_daily_rewards(self, days: int = 30) -> List[Dict[str, Dict[str, float]]]:
         """
         Get daily rewards for the last N days.
         
+        Uses the latest summary of each day.
+        
         Args:
             days: Number of days to retrieve
             
         Returns:
-            List of daily rewards by category
+            List of daily rewards by pool
         """
+        self._ensure_daily_view()
+        # The response shape is built in SQL; psycopg2 decodes the jsonb
+        # column into a dict, so the driver's rows are returned as they are
         sql = f"""
-        SELECT 
-            DATE(timestamp) as date,
-            category,
-            value
-        FROM {self.table_name} 
-        WHERE 
-            timestamp >= CURRENT_DATE - INTERVAL '%s days' AND
-            category LIKE 'Daily%%'
-        ORDER BY date, category
+        SELECT
+            to_char(date, 'YYYY-MM-DD') as date,
+            jsonb_build_object(
+                'daily_pool_reward_0', daily_pool_reward_0::float8,
+                'daily_pool_reward_1', daily_pool_reward_1::float8,
+                'daily_reward', daily_reward::float8
+            ) as rewards
+        FROM {self.daily_view}
+        WHERE date >= CURRENT_DATE - %s
+        ORDER BY {self.daily_view}.date
         """
-        results = self.db.fetchall(sql, [days])
-        
-        # Group by date
-        daily_rewards = {}
-        for row in results:
-            date_str = row['date'].isoformat()
-            if date_str not in daily_rewards:
-                daily_rewards[date_str] = {}
-            
-            daily_rewards[date_str][row['category']] = float(row['value'])
-        
-        # Convert to list sorted by date
-        return [
-            {'date': date, 'rewards': rewards}
-            for date, rewards in sorted(daily_rewards.items())
-        ]
+        return self._cached_read(self.db.fetchall, sql, [days], dict_cursor=True)
 
     def get_total_rewards_by_pool(self) -> Dict[str, float]:
         """
         Get the latest total rewards by pool.
         
         Returns:
-            Dictionary of pool categories and their total rewards
+            Dictionary of total reward columns and their values
         """
         sql = f"""
-        SELECT 
-            category,
-            value
+        SELECT
+            total_reward_pool_0::float8 AS total_reward_pool_0,
+            total_reward_pool_1::float8 AS total_reward_pool_1,
+            total_reward::float8 AS total_reward
         FROM {self.table_name} 
-        WHERE 
-            category LIKE 'Total%%' AND
-            timestamp = (
-                SELECT MAX(timestamp) 
-                FROM {self.table_name} 
-                WHERE category LIKE 'Total%%'
-            )
-        """
-        results = self.db.fetchall(sql)
-        
-        return {row['category']: float(row['value']) for row in results}
+        ORDER BY timestamp DESC 
+        LIMIT 1
+        """
+        result = self._cached_read(self.db.fetchone, sql, dict_cursor=True)
+        return result if result else {}
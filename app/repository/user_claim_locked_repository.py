@@ -5,6 +5,7 @@ from datetime import datetime
 from typing import List, Optional
 
 from app.models.database_models import UserClaimLocked
+from app.models.db_rows import UserClaimLockedRow, row_columns
 from app.repository.base_repository import BaseRepository
 
 
@@ -14,6 +15,15 @@ class UserClaimLockedRepository(BaseRepository[UserClaimLocked]):
     def __init__(self):
         """Initialize the repository."""
         super().__init__(UserClaimLocked, "user_claim_locked")
+        # Point lookups, prepared per connection by fetchone_prepared
+        self._by_transaction_hash_query = (
+            f"{self.table_name}_by_transaction_hash",
+            f"SELECT {self._select_list} FROM {self.table_name} WHERE transaction_hash = %s",
+        )
+        self._last_block_query = (
+            f"{self.table_name}_last_block",
+            f"SELECT block_number FROM {self.table_name} ORDER BY block_number DESC LIMIT 1",
+        )
 
     def get_by_transaction_hash(self, transaction_hash: str) -> Optional[UserClaimLocked]:
         """
@@ -25,42 +35,29 @@ class UserClaimLockedRepository(BaseRepository[UserClaimLocked]):
         Returns:
             The record, or None if not found
         """
-        sql = f"SELECT * FROM {self.table_name} WHERE transaction_hash = %s"
-        result = self.db.fetchone(sql, [transaction_hash])
-        return UserClaimLocked(**result) if result else None
+        result = self.db.fetchone_prepared(
+            *self._by_transaction_hash_query, [transaction_hash], dict_cursor=True
+        )
+        return UserClaimLocked.model_construct(**result) if result else None
     
-    def get_unique_user_pool_combinations(self) -> List[UserClaimLocked]:
+    def get_unique_user_pool_combinations(self) -> List[UserClaimLockedRow]:
         """
-        Get all unique combinations of pool ID and user address as UserClaimLocked objects.
+        Get all unique combinations of pool ID and user address as UserClaimLockedRow objects.
         If a user is in multiple pools, they will appear once for each pool they're in.
+        Each combination is represented by its latest claim lock.
         
         Returns:
-            List of UserClaimLocked objects representing unique user-pool combinations
+            List of UserClaimLockedRow objects representing unique user-pool combinations
         """
+        columns = row_columns(UserClaimLockedRow)
         sql = f"""
-        SELECT DISTINCT pool_id, *
+        SELECT DISTINCT ON (pool_id, user_address) {', '.join(columns)}
         FROM {self.table_name}
-        ORDER BY pool_id, user_address
+        ORDER BY pool_id, user_address, block_number DESC
         """
-    
-        # Execute the query directly with a cursor to get column names
-        with self.db.cursor() as cur:
-            cur.execute(sql)
-            
-            # Get column names from cursor description
-            columns = [desc[0] for desc in cur.description]
-            
-            # Fetch all results
-            results = cur.fetchall()
-            
-            # Convert tuples to dictionaries using column names
-            dict_results = []
-            for result in results:
-                dict_result = dict(zip(columns, result))
-                dict_results.append(dict_result)
         
-        # Create model instances from dictionaries
-        return [UserClaimLocked(**dict_result) for dict_result in dict_results]
+        # Rows come back in field order, so no dict or model is built per row
+        return [UserClaimLockedRow(*result) for result in self.db.fetchall(sql)]
 
     def get_by_user(self, user_address: str, limit: int = 100, offset: int = 0) -> List[UserClaimLocked]:
         """
@@ -75,13 +72,13 @@ class UserClaimLockedRepository(BaseRepository[UserClaimLocked]):
             List of records
         """
         sql = f"""
-        SELECT * FROM {self.table_name} 
+        SELECT {self._select_list} FROM {self.table_name} 
         WHERE user = %s 
         ORDER BY block_number DESC 
         LIMIT %s OFFSET %s
         """
-        results = self.db.fetchall(sql, [user_address, limit, offset])
-        return [UserClaimLocked(**result) for result in results]
+        results = self.db.fetchall(sql, [user_address, limit, offset], dict_cursor=True)
+        return [UserClaimLocked.model_construct(**result) for result in results]
 
     def get_by_pool_id(self, pool_id: int, limit: int = 100, offset: int = 0) -> List[UserClaimLocked]:
         """
@@ -96,13 +93,13 @@ class UserClaimLockedRepository(BaseRepository[UserClaimLocked]):
             List of records
         """
         sql = f"""
-        SELECT * FROM {self.table_name} 
+        SELECT {self._select_list} FROM {self.table_name} 
         WHERE poolid = %s 
         ORDER BY block_number DESC 
         LIMIT %s OFFSET %s
         """
-        results = self.db.fetchall(sql, [pool_id, limit, offset])
-        return [UserClaimLocked(**result) for result in results]
+        results = self.db.fetchall(sql, [pool_id, limit, offset], dict_cursor=True)
+        return [UserClaimLocked.model_construct(**result) for result in results]
 
     def get_by_block_range(self, start_block: int, end_block: int) -> List[UserClaimLocked]:
         """
@@ -116,12 +113,12 @@ class UserClaimLockedRepository(BaseRepository[UserClaimLocked]):
             List of records
         """
         sql = f"""
-        SELECT * FROM {self.table_name} 
+        SELECT {self._select_list} FROM {self.table_name} 
         WHERE block_number BETWEEN %s AND %s 
         ORDER BY block_number
         """
-        results = self.db.fetchall(sql, [start_block, end_block])
-        return [UserClaimLocked(**result) for result in results]
+        results = self.db.fetchall(sql, [start_block, end_block], dict_cursor=True)
+        return [UserClaimLocked.model_construct(**result) for result in results]
 
     def get_by_date_range(self, start_date: datetime, end_date: datetime) -> List[UserClaimLocked]:
         """
@@ -135,12 +132,12 @@ class UserClaimLockedRepository(BaseRepository[UserClaimLocked]):
             List of records
         """
         sql = f"""
-        SELECT * FROM {self.table_name} 
+        SELECT {self._select_list} FROM {self.table_name} 
         WHERE timestamp BETWEEN %s AND %s 
         ORDER BY timestamp
         """
-        results = self.db.fetchall(sql, [start_date, end_date])
-        return [UserClaimLocked(**result) for result in results]
+        results = self.db.fetchall(sql, [start_date, end_date], dict_cursor=True)
+        return [UserClaimLocked.model_construct(**result) for result in results]
 
     def get_last_processed_block(self) -> Optional[int]:
         """
@@ -149,46 +146,6 @@ class UserClaimLockedRepository(BaseRepository[UserClaimLocked]):
         Returns:
             The last processed block number, or None if no records exist
         """
-        sql = f"SELECT MAX(block_number) as last_block FROM {self.table_name}"
-        result = self.db.fetchone(sql)
-        return int(result[0]) if result and result[0] is not None else None
-
-    def bulk_insert(self, records: List[UserClaimLocked]) -> int:
-        """
-        Insert multiple records at once.
-        
-        Args:
-            records: List of records to insert
-            
-        Returns:
-            Number of records inserted
-        """
-        if not records:
-            return 0
-
-        # Extract fields from the first record to determine columns
-        sample = records[0].model_dump(exclude_none=True)
-        if 'id' in sample:
-            del sample['id']  # Remove id field for insertion
-
-        columns = list(sample.keys())
-        placeholders = ', '.join(['%s'] * len(columns))
-        column_str = ', '.join(columns)
-
-        # Prepare values for all records
-        values_list = []
-        for record in records:
-            record_dict = record.model_dump(exclude_none=True)
-            if 'id' in record_dict:
-                del record_dict['id']
-            values_list.append(tuple(record_dict[col] for col in columns))
-
-        # Build and execute the query
-        sql = f"""
-        INSERT INTO {self.table_name} ({column_str})
-        VALUES ({placeholders})
-        """
-
-        with self.db.transaction() as cursor:
-            cursor.executemany(sql, values_list)
-            return len(values_list)
\ No newline at end of file
+        # Reads the last entry of the block_number index
+        result = self.db.fetchone_prepared(*self._last_block_query)
+        return int(result[0]) if result else None
\ No newline at end of file
@@ -5,7 +5,7 @@ from datetime import datetime
 from typing import List, Optional
 
 from app.models.database_models import UserMultiplier
-from app.repository.base_repository import BaseRepository
+from app.repository.base_repository import BaseRepository, select_list
 
 
 class UserMultiplierRepository(BaseRepository[UserMultiplier]):
@@ -14,35 +14,17 @@ class UserMultiplierRepository(BaseRepository[UserMultiplier]):
     def __init__(self):
         """Initialize the repository."""
         super().__init__(UserMultiplier, "user_multiplier")
-
-    def get_by_user_claim_locked_id(self, user_claim_locked_id: int) -> Optional[UserMultiplier]:
-        """
-        Get a record by user_claim_locked_id.
-        
-        Args:
-            user_claim_locked_id: The user_claim_locked_id
-            
-        Returns:
-            The record, or None if not found
-        """
-        sql = f"SELECT * FROM {self.table_name} WHERE user_claim_locked_id = %s"
-        
-        # Execute the query directly with a cursor to get column names
-        with self.db.cursor() as cur:
-            cur.execute(sql, [user_claim_locked_id])
-            
-            # Get column names from cursor description
-            columns = [desc[0] for desc in cur.description]
-            
-            # Fetch the result
-            result = cur.fetchone()
-            
-            if result:
-                # Convert tuple to dictionary using column names
-                dict_result = dict(zip(columns, result))
-                return UserMultiplier(**dict_result)
-            else:
-                return None
+        self._um_select_list = select_list(UserMultiplier, "um")
+        # Prepared per connection by fetchone_prepared
+        self._latest_by_user_and_pool_query = (
+            f"{self.table_name}_latest_by_user_and_pool",
+            f"""
+            SELECT {self._select_list} FROM {self.table_name}
+            WHERE user_address = %s AND pool_id = %s
+            ORDER BY block_number DESC
+            LIMIT 1
+            """,
+        )
 
     def get_by_user_address(self, user_address: str, limit: int = 100, offset: int = 0) -> List[UserMultiplier]:
         """
@@ -57,29 +39,13 @@ class UserMultiplierRepository(BaseRepository[UserMultiplier]):
             List of records
         """
         sql = f"""
-        SELECT * FROM {self.table_name} 
+        SELECT {self._select_list} FROM {self.table_name} 
         WHERE user_address = %s 
         ORDER BY block_number DESC 
         LIMIT %s OFFSET %s
         """
-        # Execute the query directly with a cursor to get column names
-        with self.db.cursor() as cur:
-            cur.execute(sql, [user_address, limit, offset])
-            
-            # Get column names from cursor description
-            columns = [desc[0] for desc in cur.description]
-            
-            # Fetch all results
-            results = cur.fetchall()
-            
-            # Convert tuples to dictionaries using column names
-            dict_results = []
-            for result in results:
-                dict_result = dict(zip(columns, result))
-                dict_results.append(dict_result)
-            
-            # Create model instances from dictionaries
-            return [UserMultiplier(**dict_result) for dict_result in dict_results]
+        results = self.db.fetchall(sql, [user_address, limit, offset], dict_cursor=True)
+        return [UserMultiplier.model_construct(**result) for result in results]
 
     def get_by_pool_id(self, pool_id: int, limit: int = 100, offset: int = 0) -> List[UserMultiplier]:
         """
@@ -94,29 +60,13 @@ class UserMultiplierRepository(BaseRepository[UserMultiplier]):
             List of records
         """
         sql = f"""
-        SELECT * FROM {self.table_name} 
+        SELECT {self._select_list} FROM {self.table_name} 
         WHERE pool_id = %s 
         ORDER BY block_number DESC 
         LIMIT %s OFFSET %s
         """
-        # Execute the query directly with a cursor to get column names
-        with self.db.cursor() as cur:
-            cur.execute(sql, [pool_id, limit, offset])
-            
-            # Get column names from cursor description
-            columns = [desc[0] for desc in cur.description]
-            
-            # Fetch all results
-            results = cur.fetchall()
-            
-            # Convert tuples to dictionaries using column names
-            dict_results = []
-            for result in results:
-                dict_result = dict(zip(columns, result))
-                dict_results.append(dict_result)
-            
-            # Create model instances from dictionaries
-            return [UserMultiplier(**dict_result) for dict_result in dict_results]
+        results = self.db.fetchall(sql, [pool_id, limit, offset], dict_cursor=True)
+        return [UserMultiplier.model_construct(**result) for result in results]
 
     def get_by_user_and_pool(self, user_address: str, pool_id: int) -> List[UserMultiplier]:
         """
@@ -130,28 +80,12 @@ class UserMultiplierRepository(BaseRepository[UserMultiplier]):
             List of records
         """
         sql = f"""
-        SELECT * FROM {self.table_name} 
+        SELECT {self._select_list} FROM {self.table_name} 
         WHERE user_address = %s AND pool_id = %s 
         ORDER BY block_number DESC
         """
-        # Execute the query directly with a cursor to get column names
-        with self.db.cursor() as cur:
-            cur.execute(sql, [user_address, pool_id])
-            
-            # Get column names from cursor description
-            columns = [desc[0] for desc in cur.description]
-            
-            # Fetch all results
-            results = cur.fetchall()
-            
-            # Convert tuples to dictionaries using column names
-            dict_results = []
-            for result in results:
-                dict_result = dict(zip(columns, result))
-                dict_results.append(dict_result)
-            
-            # Create model instances from dictionaries
-            return [UserMultiplier(**dict_result) for dict_result in dict_results]
+        results = self.db.fetchall(sql, [user_address, pool_id], dict_cursor=True)
+        return [UserMultiplier.model_construct(**result) for result in results]
 
     def get_latest_by_user_and_pool(self, user_address: str, pool_id: int) -> Optional[UserMultiplier]:
         """
@@ -164,28 +98,10 @@ class UserMultiplierRepository(BaseRepository[UserMultiplier]):
         Returns:
             The latest record, or None if not found
         """
-        sql = f"""
-        SELECT * FROM {self.table_name} 
-        WHERE user_address = %s AND pool_id = %s 
-        ORDER BY block_number DESC 
-        LIMIT 1
-        """
-        # Execute the query directly with a cursor to get column names
-        with self.db.cursor() as cur:
-            cur.execute(sql, [user_address, pool_id])
-            
-            # Get column names from cursor description
-            columns = [desc[0] for desc in cur.description]
-            
-            # Fetch the result
-            result = cur.fetchone()
-            
-            if result:
-                # Convert tuple to dictionary using column names
-                dict_result = dict(zip(columns, result))
-                return UserMultiplier(**dict_result)
-            else:
-                return None
+        result = self.db.fetchone_prepared(
+            *self._latest_by_user_and_pool_query, [user_address, pool_id], dict_cursor=True
+        )
+        return UserMultiplier.model_construct(**result) if result else None
 
     def get_by_date_range(self, start_date: datetime, end_date: datetime) -> List[UserMultiplier]:
         """
@@ -199,97 +115,71 @@ class UserMultiplierRepository(BaseRepository[UserMultiplier]):
             List of records
         """
         sql = f"""
-        SELECT * FROM {self.table_name} 
+        SELECT {self._select_list} FROM {self.table_name} 
         WHERE timestamp BETWEEN %s AND %s 
         ORDER BY timestamp
         """
-        # Execute the query directly with a cursor to get column names
-        with self.db.cursor() as cur:
-            cur.execute(sql, [start_date, end_date])
-            
-            # Get column names from cursor description
-            columns = [desc[0] for desc in cur.description]
-            
-            # Fetch all results
-            results = cur.fetchall()
-            
-            # Convert tuples to dictionaries using column names
-            dict_results = []
-            for result in results:
-                dict_result = dict(zip(columns, result))
-                dict_results.append(dict_result)
-            
-            # Create model instances from dictionaries
-            return [UserMultiplier(**dict_result) for dict_result in dict_results]
+        results = self.db.fetchall(sql, [start_date, end_date], dict_cursor=True)
+        return [UserMultiplier.model_construct(**result) for result in results]
 
-    def get_unprocessed_records(self) -> List[dict]:
+    def get_latest_by_users_and_pools(self, user_addresses: List[str], pool_ids: List[int]) -> List[UserMultiplier]:
         """
-        Get records from user_claim_locked that haven't been processed yet.
+        Get the latest record for each (user address, pool ID) pair in one query.
         
+        The batched counterpart of `get_latest_by_user_and_pool`: both lists are
+        bound as single array parameters, so the statement text does not depend
+        on the number of pairs.
+        
+        Args:
+            user_addresses: The user addresses
+            pool_ids: The pool IDs, aligned with user_addresses
+            
         Returns:
-            List of unprocessed records
-        """
-        sql = """
-        SELECT ucl.id, ucl.timestamp, ucl.transaction_hash, ucl.block_number, ucl.pool_id as pool_id, ucl.user_address as user_address
-        FROM user_claim_locked ucl
-        LEFT JOIN user_multiplier um
-        ON ucl.id = um.user_claim_locked_id
-        WHERE um.id IS NULL
+            List of records, at most one per pair
         """
+        if not user_addresses:
+            return []
         
-        # Execute the query directly with a cursor to get column names
-        with self.db.cursor() as cur:
-            cur.execute(sql)
-            
-            # Get column names from cursor description
-            columns = [desc[0] for desc in cur.description]
-            
-            # Fetch all results
-            results = cur.fetchall()
-            
-            # Convert tuples to dictionaries using column names
-            dict_results = []
-            for result in results:
-                dict_result = dict(zip(columns, result))
-                dict_results.append(dict_result)
-            
-            return dict_results
+        sql = f"""
+        SELECT DISTINCT ON (um.user_address, um.pool_id) {self._um_select_list}
+        FROM {self.table_name} um
+        JOIN unnest(%s::varchar[], %s::integer[]) AS pairs(user_address, pool_id)
+        ON um.user_address = pairs.user_address AND um.pool_id = pairs.pool_id
+        ORDER BY um.user_address, um.pool_id, um.block_number DESC
+        """
+        results = self.db.fetchall(sql, [list(user_addresses), list(pool_ids)], dict_cursor=True)
+        return [UserMultiplier.model_construct(**result) for result in results]
 
-    def bulk_insert(self, records: List[UserMultiplier]) -> int:
+    def get_unprocessed_records(
+        self, start_block: Optional[int] = None, end_block: Optional[int] = None
+    ) -> List[dict]:
         """
-        Insert multiple records at once.
+        Get records from user_claim_locked that haven't been processed yet.
+        
+        A claim lock counts as processed once a multiplier row with the same
+        transaction, user and pool exists; the anti-join is done in a single
+        query rather than looking up each claim lock separately.
         
         Args:
-            records: List of records to insert
+            start_block: Optional first block number to consider
+            end_block: Optional last block number to consider
             
         Returns:
-            Number of records inserted
+            List of unprocessed records
         """
-        if not records:
-            return 0
-
-        # Extract fields from the first record to determine columns
-        sample = records[0].model_dump(exclude_none=True)
-
-        columns = list(sample.keys())
-        placeholders = ', '.join(['%s'] * len(columns))
-        column_str = ', '.join(columns)
-
-        # Prepare values for all records
-        values_list = []
-        for record in records:
-            record_dict = record.model_dump(exclude_none=True)
-            values_list.append(tuple(record_dict[col] for col in columns))
-
-        # Build and execute the query without ON CONFLICT handling
-        sql = f"""
-        INSERT INTO {self.table_name} ({column_str})
-        VALUES ({placeholders})
+        sql = """
+        SELECT ucl.id, ucl.timestamp, ucl.transaction_hash, ucl.block_number, ucl.pool_id as pool_id,
+               ucl.user_address as user_address, ucl.claim_lock_start, ucl.claim_lock_end
+        FROM user_claim_locked ucl
+        LEFT JOIN user_multiplier um
+        ON um.transaction_hash = ucl.transaction_hash
+        AND um.user_address = ucl.user_address
+        AND um.pool_id = ucl.pool_id
+        WHERE um.id IS NULL
+        AND ucl.block_number BETWEEN COALESCE(%s, ucl.block_number) AND COALESCE(%s, ucl.block_number)
         """
-
-        with self.db.transaction() as cursor:
-            cursor.executemany(sql, values_list)
-            return len(values_list)
+        
+        return self.db.fetchall(sql, [start_block, end_block], dict_cursor=True)
     
     def clean_table(self) -> bool:
         sql = f"""
@@ -310,16 +200,4 @@ class UserMultiplierRepository(BaseRepository[UserMultiplier]):
         GROUP BY user_address, pool_id
         """
 
-        with self.db.cursor() as cur:
-            cur.execute(sql)
-
-            columns = [desc[0] for desc in cur.description]
-
-            results = cur.fetchall()
-
-            dict_results = []
-            for result in results:
-                dict_result = dict(zip(columns, result))
-                dict_results.append(dict_result)
-
-            return dict_results
+        return self.db.fetchall(sql, dict_cursor=True)
@@ -4,6 +4,8 @@ Repository for user_staked_events table.
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple
 
+import pandas as pd
+
 from app.models.database_models import UserStakedEvent
 from app.repository.base_repository import BaseRepository
 
@@ -14,6 +16,15 @@ class UserStakedEventsRepository(BaseRepository[UserStakedEvent]):
     def __init__(self):
         """Initialize the repository."""
         super().__init__(UserStakedEvent, "user_staked_events")
+        # Point lookups, prepared per connection by fetchone_prepared
+        self._by_transaction_hash_query = (
+            f"{self.table_name}_by_transaction_hash",
+            f"SELECT {self._select_list} FROM {self.table_name} WHERE transaction_hash = %s",
+        )
+        self._last_block_query = (
+            f"{self.table_name}_last_block",
+            f"SELECT block_number FROM {self.table_name} ORDER BY block_number DESC LIMIT 1",
+        )
 
     def get_by_transaction_hash(self, transaction_hash: str) -> Optional[UserStakedEvent]:
         """
@@ -25,9 +36,10 @@ class UserStakedEventsRepository(BaseRepository[UserStakedEvent]):
         Returns:
             The record, or None if not found
         """
-        sql = f"SELECT * FROM {self.table_name} WHERE transaction_hash = %s"
-        result = self.db.fetchone(sql, [transaction_hash])
-        return UserStakedEvent(**result) if result else None
+        result = self.db.fetchone_prepared(
+            *self._by_transaction_hash_query, [transaction_hash], dict_cursor=True
+        )
+        return UserStakedEvent.model_construct(**result) if result else None
 
     def get_by_user_address(self, user_address: str, limit: int = 100, offset: int = 0) -> List[UserStakedEvent]:
         """
@@ -42,13 +54,13 @@ class UserStakedEventsRepository(BaseRepository[UserStakedEvent]):
             List of records
         """
         sql = f"""
-        SELECT * FROM {self.table_name} 
+        SELECT {self._select_list} FROM {self.table_name} 
         WHERE user_address = %s 
         ORDER BY block_number DESC 
         LIMIT %s OFFSET %s
         """
-        results = self.db.fetchall(sql, [user_address, limit, offset])
-        return [UserStakedEvent(**result) for result in results]
+        results = self.db.fetchall(sql, [user_address, limit, offset], dict_cursor=True)
+        return [UserStakedEvent.model_construct(**result) for result in results]
 
     def get_by_pool_id(self, pool_id: int, limit: int = 100, offset: int = 0) -> List[UserStakedEvent]:
         """
@@ -63,13 +75,13 @@ class UserStakedEventsRepository(BaseRepository[UserStakedEvent]):
             List of records
         """
         sql = f"""
-        SELECT * FROM {self.table_name} 
+        SELECT {self._select_list} FROM {self.table_name} 
         WHERE pool_id = %s 
         ORDER BY block_number DESC 
         LIMIT %s OFFSET %s
         """
-        results = self.db.fetchall(sql, [pool_id, limit, offset])
-        return [UserStakedEvent(**result) for result in results]
+        results = self.db.fetchall(sql, [pool_id, limit, offset], dict_cursor=True)
+        return [UserStakedEvent.model_construct(**result) for result in results]
 
     def get_by_user_and_pool(self, user_address: str, pool_id: int, limit: int = 100, offset: int = 0) -> List[UserStakedEvent]:
         """
@@ -85,13 +97,13 @@ class UserStakedEventsRepository(BaseRepository[UserStakedEvent]):
             List of records
         """
         sql = f"""
-        SELECT * FROM {self.table_name} 
+        SELECT {self._select_list} FROM {self.table_name} 
         WHERE user_address = %s AND pool_id = %s 
         ORDER BY block_number DESC 
         LIMIT %s OFFSET %s
         """
-        results = self.db.fetchall(sql, [user_address, pool_id, limit, offset])
-        return [UserStakedEvent(**result) for result in results]
+        results = self.db.fetchall(sql, [user_address, pool_id, limit, offset], dict_cursor=True)
+        return [UserStakedEvent.model_construct(**result) for result in results]
 
     def get_by_block_range(self, start_block: int, end_block: int) -> List[UserStakedEvent]:
         """
@@ -105,12 +117,12 @@ class UserStakedEventsRepository(BaseRepository[UserStakedEvent]):
             List of records
         """
         sql = f"""
-        SELECT * FROM {self.table_name} 
+        SELECT {self._select_list} FROM {self.table_name} 
         WHERE block_number BETWEEN %s AND %s 
         ORDER BY block_number
         """
-        results = self.db.fetchall(sql, [start_block, end_block])
-        return [UserStakedEvent(**result) for result in results]
+        results = self.db.fetchall(sql, [start_block, end_block], dict_cursor=True)
+        return [UserStakedEvent.model_construct(**result) for result in results]
 
     def get_by_date_range(self, start_date: datetime, end_date: datetime) -> List[UserStakedEvent]:
         """
@@ -124,12 +136,12 @@ class UserStakedEventsRepository(BaseRepository[UserStakedEvent]):
             List of records
         """
         sql = f"""
-        SELECT * FROM {self.table_name} 
+        SELECT {self._select_list} FROM {self.table_name} 
         WHERE timestamp BETWEEN %s AND %s 
         ORDER BY timestamp
         """
-        results = self.db.fetchall(sql, [start_date, end_date])
-        return [UserStakedEvent(**result) for result in results]
+        results = self.db.fetchall(sql, [start_date, end_date], dict_cursor=True)
+        return [UserStakedEvent.model_construct(**result) for result in results]
 
     def get_last_processed_block(self) -> Optional[int]:
         """
@@ -138,9 +150,9 @@ class UserStakedEventsRepository(BaseRepository[UserStakedEvent]):
         Returns:
             The last processed block number, or None if no records exist
         """
-        sql = f"SELECT MAX(block_number) as last_block FROM {self.table_name}"
-        result = self.db.fetchone(sql)
-        return int(result[0]) if result and result[0] is not None else None
+        # Reads the last entry of the block_number index
+        result = self.db.fetchone_prepared(*self._last_block_query)
+        return int(result[0]) if result else None
 
     def get_total_staked_by_user(self, user_address: str) -> Dict[int, int]:
         """
@@ -160,7 +172,7 @@ class UserStakedEventsRepository(BaseRepository[UserStakedEvent]):
         WHERE user_address = %s 
         GROUP BY pool_id
         """
-        results = self.db.fetchall(sql, [user_address])
+        results = self.db.fetchall(sql, [user_address], dict_cursor=True)
         return {row['pool_id']: row['total_staked'] for row in results}
 
     def get_total_staked_by_pool(self) -> Dict[int, int]:
@@ -177,9 +189,44 @@ class UserStakedEventsRepository(BaseRepository[UserStakedEvent]):
         FROM {self.table_name} 
         GROUP BY pool_id
         """
-        results = self.db.fetchall(sql)
+        results = self.db.fetchall(sql, dict_cursor=True)
         return {row['pool_id']: row['total_staked'] for row in results}
 
+    def get_staker_balances_df(self) -> pd.DataFrame:
+        """
+        Get every staker's first staking date and net staked amount.
+        
+        The net amount is the user's total staked minus their total withdrawn
+        across all pools, computed in a single aggregate query.
+        
+        Returns:
+            DataFrame with `user_address`, `first_staked_date` and `net_amount` columns
+        """
+        sql = f"""
+        WITH staked AS (
+            SELECT
+                user_address,
+                MIN(timestamp)::date AS first_staked_date,
+                SUM(amount) AS total_staked
+            FROM {self.table_name}
+            GROUP BY user_address
+        ),
+        withdrawn AS (
+            SELECT
+                user_address,
+                SUM(amount) AS total_withdrawn
+            FROM user_withdrawn_events
+            GROUP BY user_address
+        )
+        SELECT
+            s.user_address,
+            s.first_staked_date,
+            (s.total_staked - COALESCE(w.total_withdrawn, 0))::float8 AS net_amount
+        FROM staked s
+        LEFT JOIN withdrawn w ON w.user_address = s.user_address
+        """
+        return self.db.fetch_df(sql)
+
     def get_staking_history(self, user_address: str, days: int = 30) -> List[Dict[str, any]]:
         """
         Get staking history for a user over time.
@@ -206,7 +253,7 @@ class UserStakedEventsRepository(BaseRepository[UserStakedEvent]):
         GROUP BY date, pool_id
         ORDER BY date, pool_id
         """
-        results = self.db.fetchall(sql, [user_address, start_date, end_date])
+        results = self.db.fetchall(sql, [user_address, start_date, end_date], dict_cursor=True)
         
         # Group by date
         staking_history = []
@@ -217,44 +264,4 @@ class UserStakedEventsRepository(BaseRepository[UserStakedEvent]):
                 'amount': row['daily_staked']
             })
         
-        return staking_history
-
-    def bulk_insert(self, records: List[UserStakedEvent]) -> int:
-        """
-        Insert multiple records at once.
-        
-        Args:
-            records: List of records to insert
-            
-        Returns:
-            Number of records inserted
-        """
-        if not records:
-            return 0
-
-        # Extract fields from the first record to determine columns
-        sample = records[0].model_dump(exclude_none=True)
-        if 'id' in sample:
-            del sample['id']  # Remove id field for insertion
-
-        columns = list(sample.keys())
-        placeholders = ', '.join(['%s'] * len(columns))
-        column_str = ', '.join(columns)
-
-        # Prepare values for all records
-        values_list = []
-        for record in records:
-            record_dict = record.model_dump(exclude_none=True)
-            if 'id' in record_dict:
-                del record_dict['id']
-            values_list.append(tuple(record_dict[col] for col in columns))
-
-        # Build and execute the query without ON CONFLICT handling
-        sql = f"""
-        INSERT INTO {self.table_name} ({column_str})
-        VALUES ({placeholders})
-        """
-
-        with self.db.transaction() as cursor:
-            cursor.executemany(sql, values_list)
-            return len(values_list)
\ No newline at end of file
+        return staking_history
\ No newline at end of file
@@ -14,6 +14,15 @@ class UserWithdrawnEventsRepository(BaseRepository[UserWithdrawnEvent]):
     def __init__(self):
         """Initialize the repository."""
         super().__init__(UserWithdrawnEvent, "user_withdrawn_events")
+        # Point lookups, prepared per connection by fetchone_prepared
+        self._by_transaction_hash_query = (
+            f"{self.table_name}_by_transaction_hash",
+            f"SELECT {self._select_list} FROM {self.table_name} WHERE transaction_hash = %s",
+        )
+        self._last_block_query = (
+            f"{self.table_name}_last_block",
+            f"SELECT block_number FROM {self.table_name} ORDER BY block_number DESC LIMIT 1",
+        )
 
     def get_by_transaction_hash(self, transaction_hash: str) -> Optional[UserWithdrawnEvent]:
         """
@@ -25,9 +34,10 @@ class UserWithdrawnEventsRepository(BaseRepository[UserWithdrawnEvent]):
         Returns:
             The record, or None if not found
         """
-        sql = f"SELECT * FROM {self.table_name} WHERE transaction_hash = %s"
-        result = self.db.fetchone(sql, [transaction_hash])
-        return UserWithdrawnEvent(**result) if result else None
+        result = self.db.fetchone_prepared(
+            *self._by_transaction_hash_query, [transaction_hash], dict_cursor=True
+        )
+        return UserWithdrawnEvent.model_construct(**result) if result else None
 
     def get_by_user_address(self, user_address: str, limit: int = 100, offset: int = 0) -> List[UserWithdrawnEvent]:
         """
@@ -42,13 +52,13 @@ class UserWithdrawnEventsRepository(BaseRepository[UserWithdrawnEvent]):
             List of records
         """
         sql = f"""
-        SELECT * FROM {self.table_name} 
+        SELECT {self._select_list} FROM {self.table_name} 
         WHERE user_address = %s 
         ORDER BY block_number DESC 
         LIMIT %s OFFSET %s
         """
-        results = self.db.fetchall(sql, [user_address, limit, offset])
-        return [UserWithdrawnEvent(**result) for result in results]
+        results = self.db.fetchall(sql, [user_address, limit, offset], dict_cursor=True)
+        return [UserWithdrawnEvent.model_construct(**result) for result in results]
 
     def get_by_pool_id(self, pool_id: int, limit: int = 100, offset: int = 0) -> List[UserWithdrawnEvent]:
         """
@@ -63,13 +73,13 @@ class UserWithdrawnEventsRepository(BaseRepository[UserWithdrawnEvent]):
             List of records
         """
         sql = f"""
-        SELECT * FROM {self.table_name} 
+        SELECT {self._select_list} FROM {self.table_name} 
         WHERE pool_id = %s 
         ORDER BY block_number DESC 
         LIMIT %s OFFSET %s
         """
-        results = self.db.fetchall(sql, [pool_id, limit, offset])
-        return [UserWithdrawnEvent(**result) for result in results]
+        results = self.db.fetchall(sql, [pool_id, limit, offset], dict_cursor=True)
+        return [UserWithdrawnEvent.model_construct(**result) for result in results]
 
     def get_by_user_and_pool(self, user_address: str, pool_id: int, limit: int = 100, offset: int = 0) -> List[UserWithdrawnEvent]:
         """
@@ -85,13 +95,13 @@ class UserWithdrawnEventsRepository(BaseRepository[UserWithdrawnEvent]):
             List of records
         """
         sql = f"""
-        SELECT * FROM {self.table_name} 
+        SELECT {self._select_list} FROM {self.table_name} 
         WHERE user_address = %s AND pool_id = %s 
         ORDER BY block_number DESC 
         LIMIT %s OFFSET %s
         """
-        results = self.db.fetchall(sql, [user_address, pool_id, limit, offset])
-        return [UserWithdrawnEvent(**result) for result in results]
+        results = self.db.fetchall(sql, [user_address, pool_id, limit, offset], dict_cursor=True)
+        return [UserWithdrawnEvent.model_construct(**result) for result in results]
 
     def get_by_block_range(self, start_block: int, end_block: int) -> List[UserWithdrawnEvent]:
         """
@@ -105,12 +115,12 @@ class UserWithdrawnEventsRepository(BaseRepository[UserWithdrawnEvent]):
             List of records
         """
         sql = f"""
-        SELECT * FROM {self.table_name} 
+        SELECT {self._select_list} FROM {self.table_name} 
         WHERE block_number BETWEEN %s AND %s 
         ORDER BY block_number
         """
-        results = self.db.fetchall(sql, [start_block, end_block])
-        return [UserWithdrawnEvent(**result) for result in results]
+        results = self.db.fetchall(sql, [start_block, end_block], dict_cursor=True)
+        return [UserWithdrawnEvent.model_construct(**result) for result in results]
 
     def get_by_date_range(self, start_date: datetime, end_date: datetime) -> List[UserWithdrawnEvent]:
         """
@@ -124,12 +134,12 @@ class UserWithdrawnEventsRepository(BaseRepository[UserWithdrawnEvent]):
             List of records
         """
         sql = f"""
-        SELECT * FROM {self.table_name} 
+        SELECT {self._select_list} FROM {self.table_name} 
         WHERE timestamp BETWEEN %s AND %s 
         ORDER BY timestamp
         """
-        results = self.db.fetchall(sql, [start_date, end_date])
-        return [UserWithdrawnEvent(**result) for result in results]
+        results = self.db.fetchall(sql, [start_date, end_date], dict_cursor=True)
+        return [UserWithdrawnEvent.model_construct(**result) for result in results]
 
     def get_last_processed_block(self) -> Optional[int]:
         """
@@ -138,9 +148,9 @@ class UserWithdrawnEventsRepository(BaseRepository[UserWithdrawnEvent]):
         Returns:
             The last processed block number, or None if no records exist
         """
-        sql = f"SELECT MAX(block_number) as last_block FROM {self.table_name}"
-        result = self.db.fetchone(sql)
-        return int(result[0]) if result and result[0] is not None else None
+        # Reads the last entry of the block_number index
+        result = self.db.fetchone_prepared(*self._last_block_query)
+        return int(result[0]) if result else None
 
     def get_total_withdrawn_by_user(self, user_address: str) -> Dict[int, float]:
         """
@@ -160,7 +170,7 @@ class UserWithdrawnEventsRepository(BaseRepository[UserWithdrawnEvent]):
         WHERE user_address = %s 
         GROUP BY pool_id
         """
-        results = self.db.fetchall(sql, [user_address])
+        results = self.db.fetchall(sql, [user_address], dict_cursor=True)
         return {row['pool_id']: float(row['total_withdrawn']) for row in results}
 
     def get_total_withdrawn_by_pool(self) -> Dict[int, float]:
@@ -177,7 +187,7 @@ class UserWithdrawnEventsRepository(BaseRepository[UserWithdrawnEvent]):
         FROM {self.table_name} 
         GROUP BY pool_id
         """
-        results = self.db.fetchall(sql)
+        results = self.db.fetchall(sql, dict_cursor=True)
         return {row['pool_id']: float(row['total_withdrawn']) for row in results}
 
     def get_withdrawal_history(self, user_address: str, days: int = 30) -> List[Dict[str, any]]:
@@ -206,7 +216,7 @@ class UserWithdrawnEventsRepository(BaseRepository[UserWithdrawnEvent]):
         GROUP BY date, pool_id
         ORDER BY date, pool_id
         """
-        results = self.db.fetchall(sql, [user_address, start_date, end_date])
+        results = self.db.fetchall(sql, [user_address, start_date, end_date], dict_cursor=True)
         
         # Group by date
         withdrawal_history = []
@@ -253,45 +263,5 @@ class UserWithdrawnEventsRepository(BaseRepository[UserWithdrawnEvent]):
         FROM staked s
         FULL OUTER JOIN withdrawn w ON s.pool_id = w.pool_id
         """
-        results = self.db.fetchall(sql, [user_address, user_address])
-        return {row['pool_id']: float(row['net_position']) for row in results}
-
-    def bulk_insert(self, records: List[UserWithdrawnEvent]) -> int:
-        """
-        Insert multiple records at once.
-        
-        Args:
-            records: List of records to insert
-            
-        Returns:
-            Number of records inserted
-        """
-        if not records:
-            return 0
-
-        # Extract fields from the first record to determine columns
-        sample = records[0].model_dump(exclude_none=True)
-        if 'id' in sample:
-            del sample['id']  # Remove id field for insertion
-
-        columns = list(sample.keys())
-        placeholders = ', '.join(['%s'] * len(columns))
-        column_str = ', '.join(columns)
-
-        # Prepare values for all records
-        values_list = []
-        for record in records:
-            record_dict = record.model_dump(exclude_none=True)
-            if 'id' in record_dict:
-                del record_dict['id']
-            values_list.append(tuple(record_dict[col] for col in columns))
-
-        # Build and execute the query without ON CONFLICT handling
-        sql = f"""
-        INSERT INTO {self.table_name} ({column_str})
-        VALUES ({placeholders})
-        """
-
-        with self.db.transaction() as cursor:
-            cursor.executemany(sql, values_list)
-            return len(values_list)
\ No newline at end of file
+        results = self.db.fetchall(sql, [user_address, user_address], dict_cursor=True)
+        return {row['pool_id']: float(row['net_position']) for row in results}
\ No newline at end of file
@@ -2,6 +2,7 @@
 Enhanced Web3 wrapper with retry logic and better error handling.
 """
 import logging
+import random
 import time
 from functools import wraps
 from typing import Any, Callable, Dict, Optional, TypeVar
@@ -17,6 +18,9 @@ logger = logging.getLogger(__name__)
 # Type variable for function return type
 T = TypeVar('T')
 
+# Bound once so the retry loop avoids the module attribute lookup
+_jitter = random.uniform
+
 
 def with_retry(
     max_retries: int = 3,
@@ -57,8 +61,7 @@ def with_retry(
                         )
                     
                     # Calculate backoff time with jitter
-                    import random
-                    jitter = random.uniform(0.8, 1.2)
+                    jitter = _jitter(0.8, 1.2)
                     sleep_time = min(backoff * jitter, max_backoff)
                     
                     logger.warning(
@@ -5,7 +5,6 @@ import traceback
 import time
 
 from app.cache.cache_manager import clear_cache
-from app.db.database import get_db
 from scripts.i_update_user_claim_locked_events import process_user_claim_locked_events
 from scripts.ii_update_user_multipliers import process_user_multiplier_events
 from scripts.iii_update_total_daily_rewards import process_reward_events
@@ -91,13 +90,6 @@ async def process_blockchain_updates():
         error_message = f"Error in update process: {str(e)}\n{traceback.format_exc()}"
         logger.error(error_message)
         raise
-    finally:
-        try:
-            db = get_db()
-            db.close()
-            logger.info("Database connections closed")
-        except Exception as e:
-            logger.warning(f"Error closing database connections: {str(e)}")
 
 
 if __name__ == "__main__":
@@ -27,14 +27,11 @@ def get_repository_data_as_dataframe(repository_class, table_name):
         # Create repository instance
         repo = repository_class()
         
-        # Get all records (with a high limit to ensure we get everything)
-        records = repo.get_all(limit=100000)
+        # Get all records (with a high limit to ensure we get everything),
+        # straight into a DataFrame without building a model per row
+        df = repo.get_all_df(limit=100000)
         
-        # Convert to DataFrame
-        if records:
-            # Convert Pydantic models to dictionaries
-            data = [record.model_dump() for record in records]
-            df = pd.DataFrame(data)
+        if not df.empty:
             logger.info(f"Successfully loaded {len(df)} records from {table_name}")
             return df
         else:
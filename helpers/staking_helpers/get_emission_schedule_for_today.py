@@ -1,13 +1,32 @@
 import pandas as pd
 from pandas import DataFrame
-from typing import Dict
-from datetime import datetime
+from typing import Dict, Hashable, Optional, Tuple
+from datetime import date, datetime, timezone
 import logging
+from app.cache.cache_manager import query_cache_key
 from app.repository import EmissionRepository
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Historical emissions and the key they were read under, see _historical_emissions_key();
+# the schedule only changes between days, so one read serves every caller
+# within the day until the emissions table is written to
+_historical_emissions: Tuple[Optional[Hashable], Dict[str, float]] = (None, {})
+
+# Emission columns and the names the schedule DataFrame uses for them
+EMISSION_DF_COLUMNS = {
+    'day': 'Day',
+    'date': 'Date',
+    'capital_emission': 'Capital Emission',
+    'code_emission': 'Code Emission',
+    'compute_emission': 'Compute Emission',
+    'community_emission': 'Community Emission',
+    'protection_emission': 'Protection Emission',
+    'total_emission': 'Total Emission',
+    'total_supply': 'Total Supply',
+}
+
 def get_emissions_data() -> DataFrame:
     """
     Get emissions data from the repository.
@@ -16,26 +35,16 @@ def get_emissions_data() -> DataFrame:
         DataFrame with the emissions data
     """
     try:
-        # First try to get data from the repository
+        # Read straight into a DataFrame, without a model or dict per row
         emission_repo = EmissionRepository()
-        emissions = emission_repo.get_all(limit=10000)  # Get all emission records
+        emissions_df = emission_repo.get_all_df(limit=10000)  # Get all emission records
         
-        if emissions:
-            # Convert to DataFrame
-            emissions_data = [{
-                'Day': emission.day,
-                'Date': emission.date,
-                'Capital Emission': float(emission.capital_emission),
-                'Code Emission': float(emission.code_emission),
-                'Compute Emission': float(emission.compute_emission),
-                'Community Emission': float(emission.community_emission),
-                'Protection Emission': float(emission.protection_emission),
-                'Total Emission': float(emission.total_emission),
-                'Total Supply': float(emission.total_supply)
-            } for emission in emissions]
-            
-            emissions_df = pd.DataFrame(emissions_data)
-            logger.info(f"Retrieved {len(emissions)} emission records from repository")
+        if not emissions_df.empty:
+            emissions_df = emissions_df[list(EMISSION_DF_COLUMNS)].rename(columns=EMISSION_DF_COLUMNS)
+            # NUMERIC values load as int or float, so make the columns uniformly float
+            value_columns = [column for column in emissions_df.columns if column not in ('Day', 'Date')]
+            emissions_df[value_columns] = emissions_df[value_columns].astype(float)
+            logger.info(f"Retrieved {len(emissions_df)} emission records from repository")
             return emissions_df
         else:
             logger.warning("No emission records found in repository, returning empty DataFrame")
@@ -116,29 +125,83 @@ def read_emission_schedule(today_date: datetime) -> Dict:
         raise
 
 
+def _utc_today() -> date:
+    """Get the current UTC date, which keys the historical emissions memo."""
+    return datetime.now(timezone.utc).date()
+
+
+def _historical_emissions_key() -> Hashable:
+    """
+    Get the key the historical emissions are memoized under.
+    
+    Combines the UTC day with the emissions table's query cache generation,
+    so a write through EmissionRepository invalidates the memo as well.
+    
+    Returns:
+        Hashable: The memo key
+    """
+    return query_cache_key("emissions", ("historical_emissions", _utc_today()))
+
+
 def get_historical_emissions():
     """
     Get historical emissions data from the repository.
     
+    The result is read once per UTC day, or again after the emissions table
+    is written to, and shared between callers, so it must not be modified.
+    
     Returns:
         Dictionary with dates as keys and Total Emission values
     """
+    global _historical_emissions
+    # Built before the read, so rows read during a write are stored under the old generation
+    key = _historical_emissions_key()
+    if _historical_emissions[0] == key:
+        return _historical_emissions[1]
+    
     try:
-        # Try to get data from the repository
+        # Stream the rows from the repository, latest date first
         emission_repo = EmissionRepository()
-        emissions = emission_repo.get_all(limit=10000)
         
-        if emissions:
-            # Sort by date in descending order
-            emissions.sort(key=lambda x: x.date, reverse=True)
-            
-            # Create the dictionary with dates as keys and Total Emission values
-            historical_emissions_dict = {
-                emission.date.strftime('%d/%m/%Y'): float(emission.total_emission)
-                for emission in emissions
-            }
-            
-            return historical_emissions_dict
+        # Create the dictionary with dates as keys and Total Emission values
+        historical_emissions_dict = {
+            emission_date.strftime('%d/%m/%Y'): float(total_emission)
+            for emission_date, total_emission in emission_repo.iter_total_emissions()
+        }
+        
+        _historical_emissions = (key, historical_emissions_dict)
+        return historical_emissions_dict
+    except Exception as e:
+        logger.error(f"Error getting historical emissions from repository: {str(e)}")
+        raise
+
+
+async def get_historical_emissions_async():
+    """
+    Get historical emissions data from the repository without blocking the
+    event loop.
+    
+    Shares the per-day result of `get_historical_emissions`, which must not
+    be modified.
+    
+    Returns:
+        Dictionary with dates as keys and Total Emission values
+    """
+    global _historical_emissions
+    # Built before the read, so rows read during a write are stored under the old generation
+    key = _historical_emissions_key()
+    if _historical_emissions[0] == key:
+        return _historical_emissions[1]
+    
+    try:
+        emission_repo = EmissionRepository()
+        rows = await emission_repo.get_total_emissions_async()
+        historical_emissions_dict = {
+            emission_date.strftime('%d/%m/%Y'): total_emission for emission_date, total_emission in rows
+        }
+        
+        _historical_emissions = (key, historical_emissions_dict)
+        return historical_emissions_dict
     except Exception as e:
         logger.error(f"Error getting historical emissions from repository: {str(e)}")
         raise
@@ -1,7 +1,6 @@
 import logging
 from collections import defaultdict
 from datetime import datetime, date, timedelta
-from decimal import Decimal
 import numpy as np
 import pandas as pd
 import requests
@@ -28,14 +27,11 @@ def get_repository_data_as_dataframe(repository_class, table_name):
         # Create repository instance
         repo = repository_class()
         
-        # Get all records (with a high limit to ensure we get everything)
-        records = repo.get_all(limit=100000)
+        # Get all records (with a high limit to ensure we get everything),
+        # loaded column-wise instead of as one model per row
+        df = repo.get_all_df(limit=100000)
         
-        # Convert to DataFrame
-        if records:
-            # Convert Pydantic models to dictionaries
-            data = [record.model_dump() for record in records]
-            df = pd.DataFrame(data)
+        if not df.empty:
             logger.info(f"Successfully loaded {len(df)} records from {table_name}")
             return df
         else:
@@ -264,9 +260,9 @@ def calculate_average_multipliers():
         logger.warning("Empty user multiplier DataFrame, cannot calculate average multipliers")
         # Return default values
         return {
-            'overall_average': Decimal('0'),
-            'capital_average': Decimal('0'),
-            'code_average': Decimal('0')
+            'overall_average': 0.0,
+            'capital_average': 0.0,
+            'code_average': 0.0
         }
 
     try:
@@ -277,46 +273,37 @@ def calculate_average_multipliers():
         if valid_df.empty:
             logger.warning("No valid stakes found in user multiplier DataFrame")
             return {
-                'overall_average': Decimal('0'),
-                'capital_average': Decimal('0'),
-                'code_average': Decimal('0')
+                'overall_average': 0.0,
+                'capital_average': 0.0,
+                'code_average': 0.0
             }
 
-        # Convert multiplier from wei to whole units
-        valid_df['multiplier'] = valid_df['multiplier'].apply(lambda x: Decimal(x) / Decimal('1e18'))
+        # Convert multiplier from wei to whole units, as floats for the whole
+        # column at once rather than a Decimal per row
+        multipliers = valid_df['multiplier'].astype(float) / 1e18
+        pool_ids = valid_df['poolId']
 
-        # Calculate overall average
-        total_multiplier = valid_df['multiplier'].sum()
-        total_count = len(valid_df)
-        average_multiplier = total_multiplier / total_count if total_count > 0 else Decimal('0')
-
-        # Calculate average for capital pool (poolId = 0)
-        capital_df = valid_df[valid_df['poolId'] == 0]
-        capital_multiplier = capital_df['multiplier'].sum()
-        capital_count = len(capital_df)
-        average_capital_multiplier = capital_multiplier / capital_count if capital_count > 0 else Decimal('0')
-
-        # Calculate average for code pool (poolId = 1)
-        code_df = valid_df[valid_df['poolId'] == 1]
-        code_multiplier = code_df['multiplier'].sum()
-        code_count = len(code_df)
-        average_code_multiplier = code_multiplier / code_count if code_count > 0 else Decimal('0')
+        # Overall and per-pool (capital = poolId 0, code = poolId 1) averages;
+        # the mean of an empty selection is NaN, reported as 0
+        average_multiplier = multipliers.mean()
+        average_capital_multiplier = multipliers[pool_ids == 0].mean()
+        average_code_multiplier = multipliers[pool_ids == 1].mean()
 
         logger.info("Successfully calculated average multipliers from DataFrame")
 
         return {
-            'overall_average': average_multiplier,
-            'capital_average': average_capital_multiplier,
-            'code_average': average_code_multiplier
+            'overall_average': 0.0 if pd.isna(average_multiplier) else float(average_multiplier),
+            'capital_average': 0.0 if pd.isna(average_capital_multiplier) else float(average_capital_multiplier),
+            'code_average': 0.0 if pd.isna(average_code_multiplier) else float(average_code_multiplier)
         }
 
     except Exception as e:
         logger.error(f"Unexpected error when calculating average multipliers: {str(e)}")
         # Return default values instead of raising exception
         return {
-            'overall_average': Decimal('0'),
-            'capital_average': Decimal('0'),
-            'code_average': Decimal('0')
+            'overall_average': 0.0,
+            'capital_average': 0.0,
+            'code_average': 0.0
         }
 
 
@@ -14,10 +14,10 @@ from app.core.config import logger
 from app.core.config import (supply_contract, distribution_contract,
                              MAINNET_BLOCK_1ST_JAN_2024, DEXSCREENER_URL, COINGECKO_HISTORICAL_PRICES,
                              DUNE_API_KEY, DUNE_QUERY_ID, IMPLIED_PRICES_JSON)
-from app.repository.circulating_supply_repository import CirculatingSupplyRepository
+from app.repository.circulating_supply_repository import CirculatingSupplyRepository, parse_dmy_date
 from helpers.supply_helpers.get_burnt_and_locked_arbitrum import get_locked_amounts, get_burned_amounts
 from helpers.supply_helpers.get_historical_total_supply import get_total_supply_from_emissions_df
-from helpers.staking_helpers.get_emission_schedule_for_today import get_historical_emissions
+from helpers.staking_helpers.get_emission_schedule_for_today import get_historical_emissions_async
 
 async def get_combined_supply_data():
     try:
@@ -26,12 +26,15 @@ async def get_combined_supply_data():
 
         # Step 2: Get the earliest date from the total supply data
         earliest_total_supply_date = min(
-            total_supply_data.keys(), key=lambda x: datetime.strptime(x, '%d/%m/%Y')
+            total_supply_data.keys(), key=parse_dmy_date
         )
 
-        # Step 3: Read circulating supply data from the CSV file
-        circulating_supply_data = get_historical_circulating_supply(earliest_total_supply_date)
-        total_emissions_data = get_historical_emissions()
+        # Step 3: Read circulating supply and emissions data; both queries are
+        # awaited on the async driver and run concurrently
+        circulating_supply_data, total_emissions_data = await asyncio.gather(
+            get_historical_circulating_supply(earliest_total_supply_date),
+            get_historical_emissions_async(),
+        )
 
         # Step 4: Combine total supply, circulating supply, and emissions data into the desired format
         combined_data = []
@@ -39,7 +42,7 @@ async def get_combined_supply_data():
 
         # Sort dates to ensure we process them in chronological order
         sorted_dates = sorted(total_supply_data.keys(),
-                              key=lambda x: datetime.strptime(x, '%d/%m/%Y'))
+                              key=parse_dmy_date)
 
         for date in sorted_dates:
             total_supply = total_supply_data[date]
@@ -64,7 +67,7 @@ async def get_combined_supply_data():
             combined_data.append(data_point)
 
         # Sort the combined data by date in descending order for display
-        combined_data.sort(key=lambda x: datetime.strptime(x['date'], '%d/%m/%Y'), reverse=True)
+        combined_data.sort(key=lambda x: parse_dmy_date(x['date']), reverse=True)
 
         return combined_data
 
@@ -73,22 +76,22 @@ async def get_combined_supply_data():
         return [{}]
 
 
-def get_historical_circulating_supply(earliest_date: str) -> dict:
+async def get_historical_circulating_supply(earliest_date: str) -> dict:
     try:
         # Convert earliest_date string to datetime object
-        earliest_date_obj = datetime.strptime(earliest_date, '%d/%m/%Y').date()
+        earliest_date_obj = parse_dmy_date(earliest_date)
         
         # Use the repository to get data from the database
         repo = CirculatingSupplyRepository()
-        records = repo.get_by_date_range(earliest_date_obj, datetime.now().date())
+        rows = await repo.get_supply_history_async(earliest_date_obj, datetime.now().date())
         
         # Convert to the required format
         circulating_supply_data = {}
-        for record in records:
-            date_str = record.date.strftime('%d/%m/%Y')
+        for record_date, circulating_supply, total_claimed in rows:
+            date_str = record_date.strftime('%d/%m/%Y')
             circulating_supply_data[date_str] = {
-                "circulating_supply": float(record.circulating_supply_at_that_date),
-                "total_claimed_that_day": float(record.total_claimed_that_day)
+                "circulating_supply": circulating_supply,
+                "total_claimed_that_day": total_claimed
             }
         
         return circulating_supply_data
@@ -130,7 +133,7 @@ async def get_historical_prices_and_trading_volume():
             averaged_data.append([date.strftime('%d/%m/%Y'), averaged_value])
 
         # Sort the data with the latest date at the top
-        averaged_data.sort(key=lambda x: datetime.strptime(x[0], '%d/%m/%Y'), reverse=True)
+        averaged_data.sort(key=lambda x: parse_dmy_date(x[0]), reverse=True)
 
         return averaged_data
 
@@ -6,14 +6,17 @@ from datetime import datetime
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
 from cron_master_processor import process_blockchain_updates
-from fastapi import FastAPI, HTTPException, Security, Depends
+from fastapi import FastAPI, HTTPException, Security, Depends, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from fastapi.security import APIKeyHeader
 
-from app.cache.cache_manager import get_cache_item, get_last_cache_update_time, set_cache_item
+from app.cache.cache_manager import (get_cache_item, get_cache_stats, get_last_cache_update_time,
+                                     encode_json, set_cache_json)
 from app.core.exceptions import DatabaseError
 from app.core.settings import settings
-from app.db.database import DBConfig, init_db
+from app.db.async_database import close_async_db, init_async_db
+from app.db.database import DBConfig, close_db, get_db, init_db
 from app.middleware.error_handler import add_error_handler
 from app.models.responses import DataResponse, HealthCheckResponse, MessageResponse
 from helpers.capital_helpers.capital_main import get_capital_metrics
@@ -55,6 +58,12 @@ async def lifespan(app: FastAPI):
             minconn=settings.database.minconn,
             maxconn=settings.database.maxconn,
             autocommit=settings.database.autocommit,
+            warm_pool=settings.database.warm_pool,
+            statement_cache_size=settings.database.statement_cache_size,
+            prepare_threshold=settings.database.prepare_threshold,
+            plan_cache_mode=settings.database.plan_cache_mode,
+            pre_ping_idle_seconds=settings.database.pre_ping_idle_seconds,
+            max_idle_seconds=settings.database.max_idle_seconds,
         )
 
         db = init_db(config)
@@ -65,6 +74,13 @@ async def lifespan(app: FastAPI):
         except Exception as e:
             raise DatabaseError("Database connection error", details={"error": str(e)})
 
+        # Native async pool for endpoints ported off the sync Database; the
+        # app and the scheduler still run on the sync pool if it fails
+        try:
+            await init_async_db(config)
+        except Exception as async_db_error:
+            logger.error(f"Async database pool error: {str(async_db_error)}")
+
         # Set up scheduler
         try:
             logger.info("Setting up scheduler")
@@ -86,19 +102,30 @@ async def lifespan(app: FastAPI):
             scheduler.shutdown()
         except Exception as shutdown_error:
             logger.error(f"Error during shutdown: {str(shutdown_error)}")
+        try:
+            await close_async_db()
+        except Exception as shutdown_error:
+            logger.error(f"Error closing async database pool: {str(shutdown_error)}")
+        try:
+            close_db()
+        except Exception as shutdown_error:
+            logger.error(f"Error closing database pool: {str(shutdown_error)}")
 
 
 app = FastAPI(
     title="MOR Stats Backend",
     description="Backend API for MOR statistics",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # Add CORS Middleware
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
+    # Every origin is allowed unless CORS_ORIGINS or CORS_ORIGIN_REGEX is set
+    allow_origins=["*"] if settings.api.cors_origin_regex is None else [],
+    allow_origin_regex=settings.api.cors_origin_regex,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
@@ -115,24 +142,41 @@ logging.getLogger("dune_client.models").disabled = True
 logging.getLogger("dune_client").disabled = True
 
 
+def cached_data_response(data: bytes) -> Response:
+    """
+    Build a DataResponse from JSON data that was encoded when it was cached.
+    
+    Only the small envelope is encoded per request; the cached payload bytes
+    are spliced in as-is.
+    
+    Args:
+        data: The JSON encoded response data
+        
+    Returns:
+        Response: The JSON response
+    """
+    envelope = encode_json({"success": True, "timestamp": datetime.now()})
+    return Response(content=envelope[:-1] + b',"data":' + data + b'}', media_type="application/json")
+
+
 async def update_read_cache_task() -> None:
     """Update all read cache data."""
     try:
         logger.info("Updating read cache")
-        set_cache_item('staking_metrics', await get_analyze_mor_master_dict())
-        set_cache_item('total_and_circ_supply', await get_combined_supply_data())
-        set_cache_item('prices_and_volume', await get_historical_prices_and_trading_volume())
-        set_cache_item('market_cap', await get_market_cap())
-        set_cache_item('give_mor_reward', give_more_reward_response())
-        set_cache_item('stake_info', get_wallet_stake_info())
-        set_cache_item('mor_holders_by_range', await get_mor_holders())
-        set_cache_item('locked_and_burnt_mor', await get_historical_locked_and_burnt_mor())
-        set_cache_item('protocol_liquidity', get_combined_uniswap_position())
-        set_cache_item('capital_metrics', get_capital_metrics())
-        set_cache_item('github_commits', get_commits_data())
-        set_cache_item('historical_mor_rewards_locked', await get_mor_staked_over_time())
-        set_cache_item('code_metrics', await get_total_weights_and_contributors())
-        set_cache_item('chain_wise_supplies', get_chain_wise_circ_supply())
+        set_cache_json('staking_metrics', await get_analyze_mor_master_dict())
+        set_cache_json('total_and_circ_supply', await get_combined_supply_data())
+        set_cache_json('prices_and_volume', await get_historical_prices_and_trading_volume())
+        set_cache_json('market_cap', await get_market_cap())
+        set_cache_json('give_mor_reward', give_more_reward_response())
+        set_cache_json('stake_info', get_wallet_stake_info())
+        set_cache_json('mor_holders_by_range', await get_mor_holders())
+        set_cache_json('locked_and_burnt_mor', await get_historical_locked_and_burnt_mor())
+        set_cache_json('protocol_liquidity', get_combined_uniswap_position())
+        set_cache_json('capital_metrics', get_capital_metrics())
+        set_cache_json('github_commits', get_commits_data())
+        set_cache_json('historical_mor_rewards_locked', await get_mor_staked_over_time())
+        set_cache_json('code_metrics', await get_total_weights_and_contributors())
+        set_cache_json('chain_wise_supplies', get_chain_wise_circ_supply())
 
         logger.info("Finished updating read cache")
     except Exception as e:
@@ -149,15 +193,14 @@ async def root():
 async def get_mor_staker_analysis():
     """Get MOR staker analysis."""
     cached_data = get_cache_item('staking_metrics')
-    logger.debug(f"Cache access for 'staking_metrics': {'hit' if cached_data else 'miss'}, data: {cached_data}")
+    logger.debug("Cache access for 'staking_metrics': %s", 'hit' if cached_data else 'miss')
     if cached_data:
-        return DataResponse(data=cached_data)
+        return cached_data_response(cached_data)
 
     # If cache not available, load the data and cache it
     try:
         result = await get_analyze_mor_master_dict()
-        set_cache_item('staking_metrics', result)
-        return DataResponse(data=result)
+        return cached_data_response(set_cache_json('staking_metrics', result))
     except Exception as e:
         logger.error(f"Error fetching stakers: {str(e)}")
         raise HTTPException(status_code=500, detail="An error occurred fetching stakers")
@@ -167,15 +210,14 @@ async def get_mor_staker_analysis():
 async def give_more_reward():
     """Get MOR reward information."""
     cached_data = get_cache_item('give_mor_reward')
-    logger.debug(f"Cache access for 'give_mor_reward': {'hit' if cached_data else 'miss'}, data: {cached_data}")
+    logger.debug("Cache access for 'give_mor_reward': %s", 'hit' if cached_data else 'miss')
     if cached_data:
-        return DataResponse(data=cached_data)
+        return cached_data_response(cached_data)
 
     try:
         # Call the function to generate the response
         res = give_more_reward_response()
-        set_cache_item('give_mor_reward', res)
-        return DataResponse(data=res)
+        return cached_data_response(set_cache_json('give_mor_reward', res))
     except Exception as e:
         logger.error(f"Error getting MOR reward: {str(e)}")
         raise HTTPException(status_code=500, detail="An error occurred")
@@ -185,15 +227,14 @@ async def give_more_reward():
 async def get_stake_info():
     """Get stake information."""
     cached_data = get_cache_item('stake_info')
-    logger.debug(f"Cache access for 'stake_info': {'hit' if cached_data else 'miss'}, data: {cached_data}")
+    logger.debug("Cache access for 'stake_info': %s", 'hit' if cached_data else 'miss')
     if cached_data:
-        return DataResponse(data=cached_data)
+        return cached_data_response(cached_data)
 
     try:
         # Call the function to get the stake information
         result = get_wallet_stake_info()
-        set_cache_item('stake_info', result)
-        return DataResponse(data=result)
+        return cached_data_response(set_cache_json('stake_info', result))
     except Exception as e:
         logger.error(f"Error getting stake info: {str(e)}")
         raise HTTPException(status_code=500, detail="An error occurred")
@@ -203,17 +244,16 @@ async def get_stake_info():
 async def total_and_circ_supply():
     """Get total and circulating supply data."""
     cached_data = get_cache_item('total_and_circ_supply')
-    logger.debug(f"Cache access for 'total_and_circ_supply': {'hit' if cached_data else 'miss'}, data: {cached_data}")
+    logger.debug("Cache access for 'total_and_circ_supply': %s", 'hit' if cached_data else 'miss')
     if cached_data:
         logger.info("Returning cached total_and_circ_supply data")
-        return DataResponse(data=cached_data)
+        return cached_data_response(cached_data)
 
     # If cache not available, load the data and cache it
     try:
         logger.info("Cache miss for total_and_circ_supply, fetching new data")
         result = await get_combined_supply_data()
-        set_cache_item('total_and_circ_supply', result)
-        return DataResponse(data=result)
+        return cached_data_response(set_cache_json('total_and_circ_supply', result))
     except Exception as e:
         logger.error(f"Error fetching total_and_circ_supply data: {str(e)}")
         raise HTTPException(status_code=500, detail="An error occurred")
@@ -223,15 +263,14 @@ async def total_and_circ_supply():
 async def historical_prices_and_volume():
     """Get historical prices and trading volume data."""
     cached_data = get_cache_item('prices_and_volume')
-    logger.debug(f"Cache access for 'prices_and_volume': {'hit' if cached_data else 'miss'}, data: {cached_data}")
+    logger.debug("Cache access for 'prices_and_volume': %s", 'hit' if cached_data else 'miss')
     if cached_data:
-        return DataResponse(data=cached_data)
+        return cached_data_response(cached_data)
 
     # If cache not available, load the data and cache it
     try:
         result = await get_historical_prices_and_trading_volume()
-        set_cache_item('prices_and_volume', result)
-        return DataResponse(data=result)
+        return cached_data_response(set_cache_json('prices_and_volume', result))
     except Exception as e:
         logger.error(f"Error fetching prices and volume: {str(e)}")
         raise HTTPException(status_code=500, detail="An error occurred")
@@ -241,9 +280,9 @@ async def historical_prices_and_volume():
 async def market_cap():
     """Get market cap data."""
     cached_data = get_cache_item('market_cap')
-    logger.debug(f"Cache access for 'market_cap': {'hit' if cached_data else 'miss'}, data: {cached_data}")
+    logger.debug("Cache access for 'market_cap': %s", 'hit' if cached_data else 'miss')
     if cached_data:
-        return DataResponse(data=cached_data)
+        return cached_data_response(cached_data)
 
     # If cache not available, load the data and cache it
     try:
@@ -251,8 +290,7 @@ async def market_cap():
         if "error" in result:
             raise HTTPException(status_code=500, detail="An error occurred")
 
-        set_cache_item('market_cap', result)
-        return DataResponse(data=result)
+        return cached_data_response(set_cache_json('market_cap', result))
     except Exception as e:
         logger.error(f"Error fetching market cap: {str(e)}")
         raise HTTPException(status_code=500, detail="An error occurred")
@@ -262,18 +300,18 @@ async def market_cap():
 async def mor_holders_by_range():
     """Get MOR holders by range data."""
     cached_data = get_cache_item('mor_holders_by_range')
-    logger.debug(f"Cache access for 'mor_holders_by_range': {'hit' if cached_data else 'miss'}, data: {cached_data}")
+    logger.debug("Cache access for 'mor_holders_by_range': %s", 'hit' if cached_data else 'miss')
     if cached_data:
         logger.info("Returning cached mor_holders_by_range data")
-        return DataResponse(data=cached_data)
+        return cached_data_response(cached_data)
 
     logger.info("Cache miss for mor_holders_by_range, fetching new data")
 
     try:
         result = await get_mor_holders()
-        set_cache_item('mor_holders_by_range', result)
+        encoded = set_cache_json('mor_holders_by_range', result)
         logger.info("New mor_holders_by_range data fetched and cached")
-        return DataResponse(data=result)
+        return cached_data_response(encoded)
     except Exception as e:
         logger.exception(f"An error occurred in mor_holders_by_range: {str(e)}")
         raise HTTPException(status_code=500, detail="An error occurred")
@@ -283,14 +321,13 @@ async def mor_holders_by_range():
 async def locked_and_burnt_mor():
     """Get locked and burnt MOR data."""
     cached_data = get_cache_item('locked_and_burnt_mor')
-    logger.debug(f"Cache access for 'locked_and_burnt_mor': {'hit' if cached_data else 'miss'}, data: {cached_data}")
+    logger.debug("Cache access for 'locked_and_burnt_mor': %s", 'hit' if cached_data else 'miss')
     if cached_data:
-        return DataResponse(data=cached_data)
+        return cached_data_response(cached_data)
 
     try:
         result = await get_historical_locked_and_burnt_mor()
-        set_cache_item('locked_and_burnt_mor', result)
-        return DataResponse(data=result)
+        return cached_data_response(set_cache_json('locked_and_burnt_mor', result))
     except Exception as e:
         logger.error(f"Error fetching locked and burnt MOR: {str(e)}")
         raise HTTPException(status_code=500, detail="An error occurred")
@@ -300,17 +337,16 @@ async def locked_and_burnt_mor():
 async def get_protocol_liquidity():
     """Get protocol liquidity data."""
     cached_data = get_cache_item('protocol_liquidity')
-    logger.debug(f"Cache access for 'protocol_liquidity': {'hit' if cached_data else 'miss'}, data: {cached_data}")
+    logger.debug("Cache access for 'protocol_liquidity': %s", 'hit' if cached_data else 'miss')
     if cached_data:
-        return DataResponse(data=cached_data)
+        return cached_data_response(cached_data)
 
     try:
         result = get_combined_uniswap_position()
         if not result:
             raise HTTPException(status_code=404, detail="Not Found")
 
-        set_cache_item('protocol_liquidity', result)
-        return DataResponse(data=result)
+        return cached_data_response(set_cache_json('protocol_liquidity', result))
     except Exception as e:
         logger.error(f"Error fetching protocol liquidity: {str(e)}")
         raise HTTPException(status_code=500, detail="An error occurred")
@@ -326,14 +362,13 @@ async def get_cache_update_time():
 async def capital_metrics():
     """Get capital metrics data."""
     cached_data = get_cache_item('capital_metrics')
-    logger.debug(f"Cache access for 'capital_metrics': {'hit' if cached_data else 'miss'}, data: {cached_data}")
+    logger.debug("Cache access for 'capital_metrics': %s", 'hit' if cached_data else 'miss')
     if cached_data:
-        return DataResponse(data=cached_data)
+        return cached_data_response(cached_data)
 
     try:
         result = get_capital_metrics()
-        set_cache_item('capital_metrics', result)
-        return DataResponse(data=result)
+        return cached_data_response(set_cache_json('capital_metrics', result))
     except Exception as e:
         logger.error(f"Error fetching capital metrics: {str(e)}")
         raise HTTPException(status_code=500, detail="An error occurred while fetching capital metrics")
@@ -343,14 +378,13 @@ async def capital_metrics():
 async def get_github_commits():
     """Get GitHub commits data."""
     cached_data = get_cache_item('github_commits')
-    logger.debug(f"Cache access for 'github_commits': {'hit' if cached_data else 'miss'}, data: {cached_data}")
+    logger.debug("Cache access for 'github_commits': %s", 'hit' if cached_data else 'miss')
     if cached_data:
-        return DataResponse(data=cached_data)
+        return cached_data_response(cached_data)
 
     try:
         result = get_commits_data()
-        set_cache_item('github_commits', result)
-        return DataResponse(data=result)
+        return cached_data_response(set_cache_json('github_commits', result))
     except Exception as e:
         logger.error(f"Error fetching github commits: {str(e)}")
         raise HTTPException(status_code=500, detail="An error occurred while fetching github commits")
@@ -360,14 +394,13 @@ async def get_github_commits():
 async def get_historical_mor_staked():
     """Get historical MOR rewards locked data."""
     cached_data = get_cache_item('historical_mor_rewards_locked')
-    logger.debug(f"Cache access for 'historical_mor_rewards_locked': {'hit' if cached_data else 'miss'}, data: {cached_data}")
+    logger.debug("Cache access for 'historical_mor_rewards_locked': %s", 'hit' if cached_data else 'miss')
     if cached_data:
-        return DataResponse(data=cached_data)
+        return cached_data_response(cached_data)
 
     try:
         result = await get_mor_staked_over_time()
-        set_cache_item('historical_mor_rewards_locked', result)
-        return DataResponse(data=result)
+        return cached_data_response(set_cache_json('historical_mor_rewards_locked', result))
     except Exception as e:
         logger.error(f"Error fetching mor rewards locked: {str(e)}")
         raise HTTPException(status_code=500, detail="An error occurred")
@@ -377,14 +410,13 @@ async def get_historical_mor_staked():
 async def get_code_metrics():
     """Get code metrics data."""
     cached_data = get_cache_item('code_metrics')
-    logger.debug(f"Cache access for 'code_metrics': {'hit' if cached_data else 'miss'}, data: {cached_data}")
+    logger.debug("Cache access for 'code_metrics': %s", 'hit' if cached_data else 'miss')
     if cached_data:
-        return DataResponse(data=cached_data)
+        return cached_data_response(cached_data)
 
     try:
         result = await get_total_weights_and_contributors()
-        set_cache_item('code_metrics', result)
-        return DataResponse(data=result)
+        return cached_data_response(set_cache_json('code_metrics', result))
     except Exception as e:
         logger.error(f"Error fetching code metrics: {str(e)}")
         raise HTTPException(status_code=500, detail="An error occurred")
@@ -394,14 +426,13 @@ async def get_code_metrics():
 async def get_circ_supply_by_chains():
     """Get chain-wise circulating supply data."""
     cached_data = get_cache_item('chain_wise_supplies')
-    logger.debug(f"Cache access for 'chain_wise_supplies': {'hit' if cached_data else 'miss'}, data: {cached_data}")
+    logger.debug("Cache access for 'chain_wise_supplies': %s", 'hit' if cached_data else 'miss')
     if cached_data:
-        return DataResponse(data=cached_data)
+        return cached_data_response(cached_data)
 
     try:
         result = get_chain_wise_circ_supply()
-        set_cache_item('chain_wise_supplies', result)
-        return DataResponse(data=result)
+        return cached_data_response(set_cache_json('chain_wise_supplies', result))
 
     except Exception as e:
         logger.error(f"Error fetching code in chain-wise supplies: {str(e)}")
@@ -454,7 +485,7 @@ async def health_check():
         timestamp=datetime.now(),
         components={
             "database": {"status": "up", "details": "Connected"},
-            "cache": {"status": "up", "details": "In-memory cache active"},
+            "cache": {"status": "up", "details": get_cache_stats()},
             "env_vars": {
                 "status": "up",
                 "details": {
@@ -469,6 +500,17 @@ async def health_check():
     )
 
 
+@app.get("/metrics", response_model=DataResponse)
+async def metrics():
+    """Get connection pool and cache metrics."""
+    try:
+        database_pool = get_db().pool_stats()
+    except RuntimeError:
+        # Database initialization failed at startup
+        database_pool = {"status": "unavailable"}
+    return DataResponse(data={"database_pool": database_pool, "cache": get_cache_stats()})
+
+
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    uvicorn.run(app, host="0.0.0.0", port=8000, loop="uvloop", http="httptools")
@@ -6,7 +6,8 @@ from decimal import Decimal
 
 from app.core.config import ETH_RPC_URL, distribution_contract
 from app.db.database import get_db
-from app.models.database_models import UserClaimLocked, UserMultiplier
+from app.models.database_models import UserMultiplier
+from app.models.db_rows import UserClaimLockedRow
 from app.repository import UserMultiplierRepository
 from app.web3.web3_wrapper import get_block_number
 
@@ -39,12 +40,11 @@ def get_unprocessed_user_multiplier_records():
         raise
 
 
-async def get_multiplier(record: UserClaimLocked) -> UserMultiplier:
+async def get_multiplier(record: UserClaimLockedRow, block_number: int) -> UserMultiplier:
     for attempt in range(MAX_RETRIES):
         try:
             user = w3.to_checksum_address(record.user_address)
 
-            block_number = await get_block_number()
             multiplier = await contract.functions.getCurrentUserMultiplier(record.pool_id, user).call(
                 block_identifier=block_number)
             logger.info(f"user {str(user)}, pool_id {str(record.pool_id)}, multiplier: {str(multiplier)}")
@@ -70,9 +70,12 @@ async def get_multiplier(record: UserClaimLocked) -> UserMultiplier:
     return None
 
 
-async def process_batch(batch : list[UserClaimLocked]):
-    tasks = [get_multiplier(record) for record in batch]
-    return await asyncio.gather(*tasks)
+async def process_batch(batch : list[UserClaimLockedRow]):
+    # One block number per batch instead of one RPC roundtrip per record
+    block_number = await get_block_number()
+    tasks = [get_multiplier(record, block_number) for record in batch]
+    results = await asyncio.gather(*tasks)
+    return [result for result in results if result is not None]
 
 
 def format_multiplier(value):
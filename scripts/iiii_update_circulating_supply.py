@@ -1,6 +1,5 @@
 import logging
 from datetime import datetime
-from decimal import Decimal
 from web3.exceptions import BlockNotFound
 
 from app.core.config import distribution_contract
@@ -83,7 +82,9 @@ def process_circulating_supply_events():
 
         # Extract latest values
         latest_block_timestamp = int(latest_record['block_timestamp_at_that_date'])
-        latest_circulating_supply = Decimal(latest_record['circulating_supply_at_that_date'])
+        # Plain floats: the model stores these columns as float, so Decimal
+        # arithmetic bought no precision, only cost
+        latest_circulating_supply = float(latest_record['circulating_supply_at_that_date'])
 
         # Find the block number for the latest timestamp
         start_block = get_block_number_by_timestamp(latest_block_timestamp)
@@ -111,7 +112,7 @@ def process_circulating_supply_events():
                 date_str = datetime.utcfromtimestamp(timestamp).strftime('%d/%m/%Y')
 
                 # Convert Wei to Ether (dividing by 10^18)
-                amount = Decimal(event['args']['amount']) / Decimal(10 ** 18)
+                amount = event['args']['amount'] / 1e18
                 latest_circulating_supply += amount
 
                 new_data.append({
@@ -30,10 +30,13 @@ from app.repository.circulating_supply_repository import CirculatingSupplyReposi
 from app.repository.emission_repository import EmissionRepository
 from app.repository.user_claim_locked_repository import UserClaimLockedRepository
 from app.repository.user_multiplier_repository import UserMultiplierRepository
-from app.repository.reward_repository import RewardSummaryRepository
+from app.repository.reward_repository import DAILY_REWARDS_VIEW_DDL, RewardSummaryRepository
 from app.repository.user_staked_events_repository import UserStakedEventsRepository
 from app.repository.user_withdrawn_events_repository import UserWithdrawnEventsRepository
-from app.repository.overplus_bridged_events_repository import OverplusBridgedEventsRepository
+from app.repository.overplus_bridged_events_repository import (
+    DAILY_TOTALS_VIEW_DDL as OVERPLUS_BRIDGED_DAILY_VIEW_DDL,
+    OverplusBridgedEventsRepository,
+)
 
 # Configure logging
 logging.basicConfig(
@@ -61,9 +64,13 @@ TABLE_DEFINITIONS = [
             total_claimed_that_day NUMERIC(36, 18) NOT NULL,
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
         );
-        CREATE INDEX IF NOT EXISTS idx_circulating_supply_date ON circulating_supply (date);
+        -- Date lookups are served by the unique index below, which covers the
+        -- model columns so latest/by-date reads are index-only scans
+        DROP INDEX IF EXISTS idx_circulating_supply_date;
         CREATE INDEX IF NOT EXISTS idx_circulating_supply_timestamp ON circulating_supply (block_timestamp_at_that_date);
-        CREATE UNIQUE INDEX IF NOT EXISTS idx_circulating_supply_date_unique ON circulating_supply (date);
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_circulating_supply_date_covering ON circulating_supply (date)
+            INCLUDE (id, circulating_supply_at_that_date, block_timestamp_at_that_date, total_claimed_that_day);
+        DROP INDEX IF EXISTS idx_circulating_supply_date_unique;
     """),
     ("emissions", """
         CREATE TABLE IF NOT EXISTS emissions (
@@ -79,9 +86,14 @@ TABLE_DEFINITIONS = [
             total_supply NUMERIC(36, 18) NOT NULL,
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
         );
-        CREATE INDEX IF NOT EXISTS idx_emissions_date ON emissions (date);
+        -- Date lookups are served by the unique index below, which covers the
+        -- model columns so latest/by-date reads are index-only scans
+        DROP INDEX IF EXISTS idx_emissions_date;
         CREATE INDEX IF NOT EXISTS idx_emissions_day ON emissions (day);
-        CREATE UNIQUE INDEX IF NOT EXISTS idx_emissions_date_unique ON emissions (date);
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_emissions_date_covering ON emissions (date)
+            INCLUDE (id, day, capital_emission, code_emission, compute_emission,
+                     community_emission, protection_emission, total_emission, total_supply);
+        DROP INDEX IF EXISTS idx_emissions_date_unique;
     """),
     ("user_claim_locked", """
         CREATE TABLE IF NOT EXISTS user_claim_locked (
@@ -96,7 +108,12 @@ TABLE_DEFINITIONS = [
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
         );
         CREATE INDEX IF NOT EXISTS idx_user_claim_locked_block_number ON user_claim_locked (block_number);
-        CREATE INDEX IF NOT EXISTS idx_user_claim_locked_user ON user_claim_locked (user_address);
+        DROP INDEX IF EXISTS idx_user_claim_locked_user;
+        CREATE INDEX IF NOT EXISTS idx_user_claim_locked_user_block
+            ON user_claim_locked (user_address, block_number DESC) INCLUDE (pool_id);
+        -- Lets the latest claim lock per (pool, user) be read in index order
+        CREATE INDEX IF NOT EXISTS idx_user_claim_locked_pool_user_block
+            ON user_claim_locked (pool_id, user_address, block_number DESC);
     """),
     # Tables with dependencies - user_multiplier depends on user_claim_locked
     ("user_multiplier", """
@@ -112,7 +129,10 @@ TABLE_DEFINITIONS = [
             multiplier NUMERIC(78, 38),
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
         );
-        CREATE INDEX IF NOT EXISTS idx_user_multiplier_user ON user_multiplier (user_address);
+        -- Latest multiplier per (user, pool) and the claim-lock anti-join
+        DROP INDEX IF EXISTS idx_user_multiplier_user;
+        CREATE INDEX IF NOT EXISTS idx_user_multiplier_user_pool_block
+            ON user_multiplier (user_address, pool_id, block_number DESC);
     """),
     ("reward_summary", """
         CREATE TABLE IF NOT EXISTS reward_summary (
@@ -128,7 +148,10 @@ TABLE_DEFINITIONS = [
             total_reward NUMERIC(36, 18) NOT NULL,
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
         );
-    """),
+        -- Latest-summary lookups read the first entry instead of sorting the table
+        CREATE INDEX IF NOT EXISTS idx_reward_summary_timestamp ON reward_summary (timestamp DESC);
+        -- Latest summary of each day, refreshed by RewardSummaryRepository after each write
+    """ + DAILY_REWARDS_VIEW_DDL),
     ("user_staked_events", """
         CREATE TABLE IF NOT EXISTS user_staked_events (
             id SERIAL PRIMARY KEY,
@@ -140,8 +163,14 @@ TABLE_DEFINITIONS = [
             amount NUMERIC(78, 38) NOT NULL
         );
         CREATE INDEX IF NOT EXISTS idx_user_staked_events_block_number ON user_staked_events (block_number);
-        CREATE INDEX IF NOT EXISTS idx_user_staked_events_user ON user_staked_events (user_address);
+        -- Covers per-user history and per-user totals without heap visits
+        DROP INDEX IF EXISTS idx_user_staked_events_user;
+        CREATE INDEX IF NOT EXISTS idx_user_staked_events_user_block
+            ON user_staked_events (user_address, block_number DESC) INCLUDE (pool_id, amount);
         CREATE INDEX IF NOT EXISTS idx_user_staked_events_pool ON user_staked_events (pool_id);
+        -- Rows are appended in time order, so a BRIN index stays tiny
+        CREATE INDEX IF NOT EXISTS idx_user_staked_events_timestamp
+            ON user_staked_events USING BRIN (timestamp) WITH (pages_per_range = 32);
     """),
     ("user_withdrawn_events", """
         CREATE TABLE IF NOT EXISTS user_withdrawn_events (
@@ -155,8 +184,14 @@ TABLE_DEFINITIONS = [
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
         );
         CREATE INDEX IF NOT EXISTS idx_user_withdrawn_events_block_number ON user_withdrawn_events (block_number);
-        CREATE INDEX IF NOT EXISTS idx_user_withdrawn_events_user ON user_withdrawn_events (user_address);
+        -- Covers per-user history and per-user totals without heap visits
+        DROP INDEX IF EXISTS idx_user_withdrawn_events_user;
+        CREATE INDEX IF NOT EXISTS idx_user_withdrawn_events_user_block
+            ON user_withdrawn_events (user_address, block_number DESC) INCLUDE (pool_id, amount);
         CREATE INDEX IF NOT EXISTS idx_user_withdrawn_events_pool ON user_withdrawn_events (pool_id);
+        -- Rows are appended in time order, so a BRIN index stays tiny
+        CREATE INDEX IF NOT EXISTS idx_user_withdrawn_events_timestamp
+            ON user_withdrawn_events USING BRIN (timestamp) WITH (pages_per_range = 32);
     """),
     ("overplus_bridged_events", """
         CREATE TABLE IF NOT EXISTS overplus_bridged_events (
@@ -170,7 +205,17 @@ TABLE_DEFINITIONS = [
         );
         CREATE INDEX IF NOT EXISTS idx_overplus_bridged_events_block_number ON overplus_bridged_events (block_number);
         CREATE INDEX IF NOT EXISTS idx_overplus_bridged_events_unique_id ON overplus_bridged_events (unique_id);
-    """)
+        CREATE INDEX IF NOT EXISTS idx_overplus_bridged_events_transaction_hash
+            ON overplus_bridged_events (transaction_hash);
+        -- Rows are appended in time order, so a BRIN index stays tiny
+        CREATE INDEX IF NOT EXISTS idx_overplus_bridged_events_timestamp
+            ON overplus_bridged_events USING BRIN (timestamp) WITH (pages_per_range = 32);
+        -- Lets the daily totals refresh group rows from an index-only scan in day
+        -- order; timestamp is included because the planner needs the raw column
+        CREATE INDEX IF NOT EXISTS idx_overplus_bridged_events_day
+            ON overplus_bridged_events ((timestamp::date)) INCLUDE (timestamp, amount);
+        -- Daily totals, refreshed by OverplusBridgedEventsRepository after each bulk insert
+    """ + OVERPLUS_BRIDGED_DAILY_VIEW_DDL)
 ]
 
 # Define CSV file parsers for each data type
@@ -364,6 +409,7 @@ def ensure_tables_exist():
         minconn=settings.database.minconn,
         maxconn=settings.database.maxconn,
         autocommit=settings.database.autocommit,
+        warm_pool=False,
     )
 
     db = init_db(config)
@@ -0,0 +1,110 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app.cache import cache_manager
+from app.cache.cache_manager import cached, clear_cache
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    clear_cache()
+    yield
+    clear_cache()
+
+
+def test_cached_reuses_result_per_arguments():
+    calls = []
+
+    @cached("square")
+    def square(x):
+        calls.append(x)
+        return x * x
+
+    assert square(3) == 9
+    assert square(3) == 9
+    assert square(4) == 16
+    assert calls == [3, 4]
+
+
+def test_cached_stores_none_results():
+    calls = []
+
+    @cached("nothing")
+    def nothing():
+        calls.append(1)
+        return None
+
+    assert nothing() is None
+    assert nothing() is None
+    assert calls == [1]
+
+
+def test_cached_handles_unhashable_arguments():
+    calls = []
+
+    @cached("total")
+    def total(values):
+        calls.append(values)
+        return sum(values)
+
+    assert total([1, 2]) == 3
+    assert total([1, 2]) == 3
+    assert len(calls) == 1
+
+
+def test_cached_runs_function_once_for_concurrent_misses():
+    calls = []
+    barrier = threading.Barrier(8)
+
+    @cached("slow")
+    def slow():
+        calls.append(1)
+        time.sleep(0.05)
+        return "value"
+
+    results = []
+
+    def worker():
+        barrier.wait()
+        results.append(slow())
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == ["value"] * 8
+    assert calls == [1]
+    assert cache_manager._key_locks == {}
+
+
+def test_cached_async_runs_coroutine_once_for_concurrent_misses():
+    calls = []
+
+    @cached("slow_async")
+    async def slow():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "value"
+
+    async def run():
+        return await asyncio.gather(*(slow() for _ in range(8)))
+
+    assert asyncio.run(run()) == ["value"] * 8
+    assert calls == [1]
+    assert cache_manager._key_alocks == {}
+
+
+def test_cached_releases_lock_when_function_raises():
+    @cached("failing")
+    def failing():
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        failing()
+
+    assert cache_manager._key_locks == {}
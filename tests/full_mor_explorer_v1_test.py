@@ -20,7 +20,8 @@ endpoints = [
     "/github_commits",
     "/historical_mor_rewards_locked",
     "/code_metrics",
-    "/chain_wise_supplies"
+    "/chain_wise_supplies",
+    "/metrics"
 ]
 
 
@@ -0,0 +1,21 @@
+import orjson
+
+from main import cached_data_response
+
+
+def test_cached_data_response_splices_payload():
+    payload = orjson.dumps({"a": [1, 2], "b": "c"})
+
+    response = cached_data_response(payload)
+
+    body = orjson.loads(response.body)
+    assert response.media_type == "application/json"
+    assert body["success"] is True
+    assert "timestamp" in body
+    assert body["data"] == {"a": [1, 2], "b": "c"}
+
+
+def test_cached_data_response_splices_scalar_payload():
+    body = orjson.loads(cached_data_response(b"[]").body)
+
+    assert body["data"] == []
@@ -0,0 +1,55 @@
+from datetime import date
+
+import pytest
+
+from app.db.database import parse_numeric
+from app.repository.circulating_supply_repository import parse_dmy_date
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("0", 0),
+    ("42", 42),
+    ("-7", -7),
+    ("1000000000000000000000000", 10 ** 24),
+    ("5.000", 5),
+    ("-3.00", -3),
+    ("1.5", 1.5),
+    ("-0.25", -0.25),
+])
+def test_parse_numeric(text, expected):
+    result = parse_numeric(text)
+
+    assert result == expected
+    assert type(result) is type(expected)
+
+
+def test_parse_numeric_keeps_large_integers_exact():
+    assert parse_numeric("123456789012345678901234567890.0") == 123456789012345678901234567890
+
+
+def test_parse_numeric_special_values():
+    assert parse_numeric("NaN") != parse_numeric("NaN")
+    assert parse_numeric("Infinity") == float("inf")
+    assert parse_numeric("-Infinity") == float("-inf")
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("31/01/2024", date(2024, 1, 31)),
+    ("1/2/2024", date(2024, 2, 1)),
+    ("29/02/2024", date(2024, 2, 29)),
+])
+def test_parse_dmy_date(text, expected):
+    assert parse_dmy_date(text) == expected
+
+
+@pytest.mark.parametrize("text", [
+    "2024-01-31",
+    "31/01/24",
+    "31/01/2024 ",
+    "32/01/2024",
+    "29/02/2023",
+    "",
+])
+def test_parse_dmy_date_rejects_invalid(text):
+    with pytest.raises(ValueError):
+        parse_dmy_date(text)
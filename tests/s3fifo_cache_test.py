@@ -0,0 +1,147 @@
+import pytest
+
+from app.cache import s3fifo_cache
+from app.cache.s3fifo_cache import S3FIFOCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(s3fifo_cache, "time", fake)
+    return fake
+
+
+def test_rejects_non_positive_maxsize():
+    with pytest.raises(ValueError):
+        S3FIFOCache(maxsize=0, ttl=60)
+
+
+def test_evicts_down_to_maxsize(clock):
+    cache = S3FIFOCache(maxsize=10, ttl=60)
+    for i in range(25):
+        cache.set(i, i)
+
+    assert len(cache) == 10
+    assert cache.evictions == 15
+
+
+def test_one_off_keys_do_not_flush_hot_entry(clock):
+    cache = S3FIFOCache(maxsize=10, ttl=60)
+    cache.set("hot", "value")
+    cache.get("hot")
+    cache.get("hot")
+
+    for i in range(100):
+        cache.set(i, i)
+
+    assert cache.get("hot") == "value"
+
+
+def test_entry_read_on_probation_is_promoted(clock):
+    cache = S3FIFOCache(maxsize=10, ttl=60)
+    cache.set("hot", "value")
+    cache.get("hot")
+    cache.get("hot")
+
+    for i in range(10):
+        cache.set(i, i)
+
+    assert cache._data["hot"].in_main
+
+
+def test_unread_entry_is_evicted_to_ghost_queue(clock):
+    cache = S3FIFOCache(maxsize=10, ttl=60)
+    cache.set("cold", "value")
+
+    for i in range(10):
+        cache.set(i, i)
+
+    assert "cold" not in cache
+    assert "cold" in cache._ghost
+
+
+def test_ghost_key_goes_straight_to_main_queue(clock):
+    cache = S3FIFOCache(maxsize=10, ttl=60)
+    cache.set("cold", "value")
+    for i in range(10):
+        cache.set(i, i)
+
+    cache.set("cold", "again")
+
+    assert cache._data["cold"].in_main
+    assert "cold" not in cache._ghost
+    assert cache.get("cold") == "again"
+
+
+def test_ghost_queue_is_bounded(clock):
+    cache = S3FIFOCache(maxsize=10, ttl=60)
+    for i in range(1000):
+        cache.set(i, i)
+
+    assert len(cache._ghost) <= cache._ghost_capacity
+
+
+def test_expired_entry_is_a_miss_and_removed(clock):
+    cache = S3FIFOCache(maxsize=10, ttl=60)
+    cache.set("key", "value")
+    clock.now += 61
+
+    assert cache.get("key", "default") == "default"
+    assert cache.misses == 1
+    assert len(cache) == 0
+
+
+def test_per_item_ttl_overrides_default(clock):
+    cache = S3FIFOCache(maxsize=10, ttl=60)
+    cache.set("short", 1, ttl=5)
+    cache.set("long", 2)
+    clock.now += 10
+
+    assert "short" not in cache
+    assert cache.get("long") == 2
+
+
+def test_set_existing_key_updates_in_place(clock):
+    cache = S3FIFOCache(maxsize=10, ttl=60)
+    cache.set("key", 1)
+    cache.set("key", 2)
+
+    assert cache.get("key") == 2
+    assert len(cache._small) == 1
+
+
+def test_pop_of_expired_entry_returns_default(clock):
+    cache = S3FIFOCache(maxsize=10, ttl=60)
+    cache.set("key", "value")
+    clock.now += 61
+
+    assert cache.pop("key", "default") == "default"
+    assert len(cache) == 0
+
+
+def test_compaction_drops_stale_queue_slots(clock):
+    cache = S3FIFOCache(maxsize=4, ttl=60)
+    for i in range(100):
+        cache.set(i, i)
+        cache.pop(i)
+
+    assert len(cache) == 0
+    assert len(cache._small) + len(cache._main) <= 2 * cache.maxsize + 1
+
+
+def test_hit_and_miss_counters(clock):
+    cache = S3FIFOCache(maxsize=10, ttl=60)
+    cache.set("key", "value")
+    cache.get("key")
+    cache.get("missing")
+
+    assert cache.hits == 1
+    assert cache.misses == 1
@@ -0,0 +1,31 @@
+import re
+
+import pytest
+
+from app.core.settings import origins_to_regex
+
+
+ORIGINS = ["http://localhost:3000", "https://*.vercel.app"]
+
+
+@pytest.mark.parametrize("origin", [
+    "http://localhost:3000",
+    "https://my-app.vercel.app",
+    "https://App-123.vercel.app",
+])
+def test_origins_to_regex_matches_allowed(origin):
+    assert re.match(origins_to_regex(ORIGINS), origin)
+
+
+@pytest.mark.parametrize("origin", [
+    "http://localhost:30001",
+    "http://localhost:3000.evil.com",
+    "https://localhost:3000",
+    "https://a.b.vercel.app",
+    "https://.vercel.app",
+    "https://my-app.vercel.app.evil.com",
+    "https://evil.com/.vercel.app",
+    "https://myappXvercel.app",
+])
+def test_origins_to_regex_rejects_others(origin):
+    assert not re.match(origins_to_regex(ORIGINS), origin)